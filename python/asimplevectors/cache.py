@@ -0,0 +1,150 @@
+"""
+Client-side caching and coalescing of read requests for the asimpleVectors Python client.
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+import numpy as np
+
+DEFAULT_CACHE_MAX_ENTRIES = 10000
+DEFAULT_CACHE_TTL = 60.0
+
+
+def request_key(operation: str, space_name: str, version_id: Optional[int], request: Optional[Dict[str, Any]] = None) -> Tuple:
+    """
+    Build a hashable key for a read request. Vectors are reduced to a digest of their float32
+    bytes, so keys stay small and identical embeddings match regardless of list or array input.
+
+    :param operation: Name of the client operation, e.g. "search".
+    :param space_name: Name of the target space.
+    :param version_id: Target version ID, or None for the default version.
+    :param request: Request payload.
+    :return: Hashable key.
+    """
+    parts = []
+    for name in sorted(request or {}):
+        value = request[name]
+        if name == "vector" or isinstance(value, np.ndarray):
+            array = np.ascontiguousarray(value, dtype=np.float32)
+            parts.append((name, hashlib.blake2b(array.tobytes(), digest_size=16).digest()))
+        else:
+            parts.append((name, repr(value)))
+    return (operation, space_name, version_id, tuple(parts))
+
+
+class SearchCache:
+    """
+    LRU cache for search and rerank results with a time-to-live, grouped by space so that all
+    entries of a space can be dropped when the client writes to it.
+
+    :param max_entries: Maximum number of cached results.
+    :param ttl: Seconds a cached result stays valid.
+    """
+    def __init__(self, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES, ttl: float = DEFAULT_CACHE_TTL):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive.")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, str, Any]]" = OrderedDict()
+        self._keys_by_space: Dict[str, Set[Hashable]] = {}
+        self._generations: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached result for `key`, or None if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, space_name, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key, space_name)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def generation(self, space_name: str) -> int:
+        """
+        Current invalidation generation of a space. Pass it to `put` to discard results of
+        requests that were in flight while the space was invalidated.
+        """
+        return self._generations.get(space_name, 0)
+
+    def put(self, key: Hashable, space_name: str, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Cache a result, evicting the least recently used entries beyond `max_entries`.
+        """
+        if generation is not None and generation != self.generation(space_name):
+            return
+        if key in self._entries:
+            self._remove(key, self._entries[key][1])
+        self._entries[key] = (time.monotonic() + self.ttl, space_name, value)
+        self._keys_by_space.setdefault(space_name, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest_key, (_, oldest_space, _) = next(iter(self._entries.items()))
+            self._remove(oldest_key, oldest_space)
+
+    def invalidate_space(self, space_name: str) -> None:
+        """
+        Drop all cached results of a space.
+        """
+        self._generations[space_name] = self.generation(space_name) + 1
+        for key in self._keys_by_space.pop(space_name, set()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drop all cached results.
+        """
+        for space_name in list(self._keys_by_space):
+            self.invalidate_space(space_name)
+
+    def _remove(self, key: Hashable, space_name: str) -> None:
+        self._entries.pop(key, None)
+        keys = self._keys_by_space.get(space_name)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_space[space_name]
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical requests: while a call for a key is in flight, later callers
+    with the same key await the same result instead of sending their own request.
+    """
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fetch` for `key` unless an identical call is already in flight, and return its result.
+        Cancelling one caller does not cancel the shared call for the others.
+        """
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fetch())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: "asyncio.Future[Any]") -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved in case every caller was cancelled.
+            future.exception()
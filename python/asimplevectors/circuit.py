@@ -0,0 +1,133 @@
+"""
+Circuit breakers for the endpoints used by the asimpleVectors Python client.
+"""
+import time
+from collections import deque
+from typing import Deque
+
+import httpx
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_ERROR_RATE_THRESHOLD = 0.5
+DEFAULT_ERROR_RATE_WINDOW = 20
+DEFAULT_ERROR_RATE_MIN_REQUESTS = 10
+DEFAULT_RESET_TIMEOUT = 5.0
+DEFAULT_PROBE_TIMEOUT = 2.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without sending a request while the circuit of its endpoint is open."""
+    pass
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one endpoint. The circuit opens after `failure_threshold` consecutive
+    failures, or when at least `error_rate_threshold` of the last `window` requests failed (once
+    `min_requests` outcomes are known). While open, requests fail fast; after `reset_timeout`
+    seconds a single probe is allowed (half-open) and its outcome closes or reopens the circuit.
+
+    :param failure_threshold: Consecutive failures that open the circuit.
+    :param error_rate_threshold: Failure ratio over the window that opens the circuit.
+    :param window: Number of recent outcomes used for the failure ratio.
+    :param min_requests: Outcomes needed before the failure ratio is considered.
+    :param reset_timeout: Seconds the circuit stays open before a probe is allowed.
+    """
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        error_rate_threshold: float = DEFAULT_ERROR_RATE_THRESHOLD,
+        window: int = DEFAULT_ERROR_RATE_WINDOW,
+        min_requests: int = DEFAULT_ERROR_RATE_MIN_REQUESTS,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1.")
+        if not 0 < error_rate_threshold <= 1:
+            raise ValueError("error_rate_threshold must be in (0, 1].")
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._probing = False
+
+    def allow(self) -> bool:
+        """
+        Whether a request may be sent now. Returns False while the circuit is open or a probe is
+        in flight.
+        """
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+        return False
+
+    def try_probe(self) -> bool:
+        """
+        Claim the single probe of a half-open circuit.
+        """
+        if self.state != HALF_OPEN or self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def on_success(self) -> None:
+        """
+        Record a successful request or probe. Only a success while half-open closes the
+        circuit; late successes of requests sent before it opened are ignored while it is open.
+        """
+        if self.state == HALF_OPEN:
+            self._reset()
+            return
+        if self.state == OPEN:
+            return
+        self.consecutive_failures = 0
+        self._outcomes.append(True)
+
+    def on_failure(self) -> None:
+        """
+        Record a failed request or probe. Late failures while open do not restart the reset
+        timeout.
+        """
+        if self.state == HALF_OPEN:
+            self._open()
+            return
+        if self.state == OPEN:
+            return
+        self.consecutive_failures += 1
+        self._outcomes.append(False)
+        if self.consecutive_failures >= self.failure_threshold:
+            self._open()
+        elif len(self._outcomes) >= self.min_requests:
+            failures = self._outcomes.count(False)
+            if failures / len(self._outcomes) >= self.error_rate_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self._probing = False
+
+    def _reset(self) -> None:
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._outcomes.clear()
+        self._probing = False
+
+
+def endpoint_of(url: str) -> str:
+    """
+    The "scheme://host:port" part of an absolute URL.
+    """
+    end = url.find("/", url.find("//") + 2)
+    return url if end < 0 else url[:end]
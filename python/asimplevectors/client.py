@@ -2,29 +2,96 @@
 asimpleVectors Python Client: A Python client for interacting with asimpleVectors API.
 - https://github.com/billionvectors/asimplevectors
 """
+import asyncio
+import hashlib
+import heapq
+import json
 import logging
 import os
+import re
+import shutil
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import Executor, ThreadPoolExecutor
 import httpx
 import numpy as np
+from pydantic import TypeAdapter
 import aiofiles
-from requests_toolbelt import MultipartEncoder
+import uuid
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Type
+from typing import List, Optional, Dict, Any, Type, Sequence, Awaitable, Union, Callable, AsyncIterator, AsyncIterable, Iterable, Tuple
 
 from .models import (
     ClusterVote, MembershipConfig, ClusterMetricsResponse,
     SpaceResponse, ListSpacesResponse, SpaceErrorResponse,
     VersionResponse, ListVersionsResponse, VersionErrorResponse,
-    VectorResponse, GetVectorsResponse, VectorErrorResponse,
-    SearchResponse, SearchErrorResponse,
-    RerankRequest, RerankResponse, RerankErrorResponse,
+    VectorResponse, GetVectorsResponse, VectorErrorResponse, BulkUpsertResult, StreamUpsertResult,
+    PipelineStageStats, EmbedUpsertResult,
+    VectorDataResponse, VectorPage, VersionExportResult,
+    SearchResponse, SearchErrorResponse, SearchBatchResponse,
+    SearchTarget, SearchTargetError, FederatedSearchResult, FederatedSearchResponse, MMRSearchResult,
+    RerankRequest, RerankResponse, RerankErrorResponse, HybridSearchResult,
     SnapshotResponse, ListSnapshotsResponse, SnapshotErrorResponse,
     RbacTokenResponse, ListRbacTokensResponse, RbacTokenErrorResponse,
     KeyValueResponse, ListKeysResponse, KeyValueErrorResponse
 )
+from .serializer import get_serializer
+from .cache import SearchCache, SingleFlight, request_key
+from .cluster import ClusterNode, ClusterTopology, ReadBalancer, DEFAULT_TOPOLOGY_REFRESH_INTERVAL
+from .hedging import HedgePolicy
+from .retry import RetryPolicy
+from .circuit import CircuitBreaker, CircuitOpenError, DEFAULT_PROBE_TIMEOUT, endpoint_of
+from .fusion import DEFAULT_RRF_K, reciprocal_rank_fusion, weighted_score_fusion, lookup
+from .diversity import DEFAULT_MMR_LAMBDA, DEFAULT_MMR_MAX_SCAN, similarity_matrix, maximal_marginal_relevance
+from .ingest import (
+    DEFAULT_BATCH_SIZE, DEFAULT_MAX_BATCH_BYTES, DEFAULT_FLUSH_INTERVAL, DEFAULT_CHECKPOINT_EVERY, BufferedVectorWriter,
+    CheckpointStore, FileCheckpointStore, KeyValueCheckpointStore, IngestionJob,
+    iter_vector_batches, aiter_vector_batches, aiter_chunks, validate_matrix, matrix_batch_rows, encode_matrix_batch
+)
 
 logger = logging.getLogger(__name__)
 
+# Connection pool and timeout defaults tuned for many concurrent requests to a few nodes.
+DEFAULT_MAX_CONNECTIONS = 200
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 100
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+DEFAULT_TIMEOUT = httpx.Timeout(connect=5.0, read=30.0, write=30.0, pool=10.0)
+# Searches are small and latency sensitive: fail fast instead of queueing behind slow requests.
+DEFAULT_SEARCH_TIMEOUT = httpx.Timeout(connect=2.0, read=10.0, write=10.0, pool=5.0)
+# Upserts carry large bodies and may wait for indexing on the server.
+DEFAULT_INGEST_TIMEOUT = httpx.Timeout(connect=5.0, read=120.0, write=120.0, pool=60.0)
+# Snapshot transfers stream large files; the server may also take a while to restore them.
+DEFAULT_SNAPSHOT_TIMEOUT = httpx.Timeout(connect=5.0, read=600.0, write=600.0, pool=60.0)
+DEFAULT_SNAPSHOT_CHUNK_SIZE = 1024 * 1024
+
+# POST endpoints that only read data and may be served by any node.
+_READ_ONLY_POST_SUFFIXES = ("/search", "/rerank")
+# Statuses after which a write is retried once if the cluster reports a different leader.
+_LEADER_ERROR_STATUSES = {421, 500, 502, 503, 504}
+# Statuses that count as a node failure for read load balancing.
+_NODE_ERROR_STATUSES = {500, 502, 503, 504}
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[Any]) -> TypeAdapter:
+    """
+    Cached TypeAdapter validating a JSON array of `model`.
+    """
+    return TypeAdapter(List[model])
+
+
+def _parse_model(model: Type[Any], content: bytes) -> Any:
+    """
+    Decode a JSON response body straight into `model`, or a list of `model` for JSON arrays.
+    pydantic-core parses and validates in one pass, without building intermediate Python dicts.
+    """
+    if content.lstrip()[:1] == b"[":
+        return _list_adapter(model).validate_json(content)
+    return model.model_validate_json(content)
+
+
 class KeyNotFoundError(Exception):
     """Custom exception to indicate that the specified key was not found."""
     pass
@@ -33,6 +100,57 @@ class SpaceExistsError(Exception):
     """Custom exception to indicate that the space already exists."""
     pass
 
+class SnapshotIntegrityError(Exception):
+    """Custom exception to indicate that a downloaded snapshot failed its size or checksum check."""
+    pass
+
+class VectorScanLimitError(Exception):
+    """Custom exception to indicate that search_mmr scanned `max_scan` vectors without finding every candidate."""
+    pass
+
+_CONTENT_RANGE_PATTERN = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+def _content_range_total(response: httpx.Response) -> Optional[int]:
+    """
+    Total size announced in the Content-Range header of a partial response, if any.
+    """
+    match = _CONTENT_RANGE_PATTERN.match(response.headers.get("Content-Range", ""))
+    if match and match.group(3) != "*":
+        return int(match.group(3))
+    return None
+
+def _content_range_bounds(response: httpx.Response) -> Optional[Tuple[int, int]]:
+    """
+    First and last byte position announced in the Content-Range header of a partial response, if any.
+    """
+    match = _CONTENT_RANGE_PATTERN.match(response.headers.get("Content-Range", ""))
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    return None
+
+def _file_digest(file_path: str, algorithm: str, chunk_size: int) -> str:
+    """
+    Hex digest of a file, read in chunks. Runs in an executor to keep disk I/O off the event loop.
+    """
+    digest = hashlib.new(algorithm)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _build_timeout(value: Any, default: httpx.Timeout) -> httpx.Timeout:
+    """
+    Build an httpx.Timeout from a config value: None keeps the default, a number applies to all
+    phases, and a dict overrides individual "connect", "read", "write" and "pool" timeouts.
+    """
+    if value is None:
+        return default
+    if isinstance(value, httpx.Timeout):
+        return value
+    if isinstance(value, dict):
+        return httpx.Timeout(**{**default.as_dict(), **value})
+    return httpx.Timeout(value)
+
 class ASimpleVectorsClient:
     """
     Python client for the ASimpleVectors API. Provides methods to interact with cluster, space, version, 
@@ -42,7 +160,47 @@ class ASimpleVectorsClient:
     :param port: The port number for the API (default: 21001).
     :param use_ssl: Boolean indicating whether to use HTTPS. Defaults to False for localhost.
     :param config: Optional configuration dictionary for additional settings.
+        - auth: httpx authentication applied to every request.
+        - serializer: "orjson", "json" or a JsonSerializer instance used for request bodies and
+          responses. Defaults to orjson when installed, otherwise the standard library json module.
+        - max_connections: Maximum number of concurrent connections in the pool (default: 200).
+        - max_keepalive_connections: Maximum number of idle connections kept alive (default: 100).
+        - keepalive_expiry: Seconds an idle connection is kept alive (default: 60).
+        - http2: Enable HTTP/2 (default: False). Requires `pip install asimplevectors[http2]`.
+        - timeout: Timeout for requests without a dedicated setting. A number, or a dict with
+          "connect", "read", "write" and "pool" seconds.
+        - search_timeout: Timeout for search and rerank requests, in the same format.
+        - ingest_timeout: Timeout for vector upsert requests, in the same format.
+        - snapshot_timeout: Timeout for snapshot uploads and downloads, in the same format.
+        - search_cache: Cache search and rerank results. True for defaults, a dict with
+          "max_entries" (default: 10000) and "ttl" seconds (default: 60), or a SearchCache instance.
+          Entries of a space are dropped whenever this client writes to it.
+        - vector_cache: Cache the candidate vectors fetched by search_mmr, in the same format as
+          `search_cache` (default: True). False disables it.
+        - coalesce_reads: Share one in-flight request between concurrent identical calls of search,
+          rerank, get_space, get_key_value and get_default_version (default: False). All callers
+          receive the same parsed result objects.
+        - topology_refresh_interval: Seconds between cluster topology refreshes when `nodes` is set
+          (default: 30).
+        - load_balance_reads: Spread search, rerank, get_vectors_by_version and get_key_value over
+          all healthy cluster nodes when `nodes` is set. True for defaults, or a dict of ReadBalancer
+          options ("ewma_alpha", "failure_threshold", "ejection_time", "slow_factor", "slow_min_delta").
+        - hedge_reads: Send a duplicate of a search or rerank request that has not answered within a
+          latency percentile of recent requests, and use the first answer. True for defaults, a dict of
+          HedgePolicy options ("percentile", "min_delay", "max_delay", "min_samples", "max_hedges",
+          "window"), or a HedgePolicy instance. With `load_balance_reads` the duplicate goes to another node.
+        - retry: Retry failed requests with exponential backoff and jitter. A dict of RetryPolicy options
+          ("max_attempts", "backoff_base", "backoff_max", "retry_statuses", ...), a RetryPolicy instance,
+          or True for 3 attempts (default: disabled). Writes that are not idempotent are only retried
+          when the connection could not be established; retries are limited by a retry budget.
+        - circuit_breaker: Fail fast with CircuitOpenError while an endpoint (scheme, host and port) is
+          failing, instead of waiting for timeouts. True for defaults, or a dict of CircuitBreaker options
+          ("failure_threshold", "error_rate_threshold", "window", "min_requests", "reset_timeout") and
+          "probe_timeout". Once `reset_timeout` has passed, the endpoint is probed with `/cluster/metrics`.
     :param token: Optional Bearer token for authorization.
+    :param nodes: Optional "host:port" API addresses of other cluster nodes. Enables cluster-aware
+        mode: writes are routed to the leader discovered from `/cluster/metrics`, and the topology
+        is refreshed when a write fails.
     """
     def __init__(
         self,
@@ -50,7 +208,8 @@ class ASimpleVectorsClient:
         port: int = 21001,
         use_ssl: Optional[bool] = None,
         config: Optional[Dict[str, Any]] = None,
-        token: Optional[str] = None
+        token: Optional[str] = None,
+        nodes: Optional[List[str]] = None
     ):
         """
         Initializes the ASimpleVectorsClient with the given parameters.
@@ -64,17 +223,88 @@ class ASimpleVectorsClient:
         scheme = 'https' if use_ssl else 'http'
         self.base_url = f"{scheme}://{host}:{port}/api"
         self.cluster_url = f"{scheme}://{host}:{port}/cluster"
-        self.session = httpx.AsyncClient()
-
-        auth = config.get('auth', None)
-        if auth:
-            self.session.auth = auth
-
+        self.timeout = _build_timeout(config.get('timeout'), DEFAULT_TIMEOUT)
+        self.search_timeout = _build_timeout(config.get('search_timeout'), DEFAULT_SEARCH_TIMEOUT)
+        self.ingest_timeout = _build_timeout(config.get('ingest_timeout'), DEFAULT_INGEST_TIMEOUT)
+        self.snapshot_timeout = _build_timeout(config.get('snapshot_timeout'), DEFAULT_SNAPSHOT_TIMEOUT)
+        limits = httpx.Limits(
+            max_connections=config.get('max_connections', DEFAULT_MAX_CONNECTIONS),
+            max_keepalive_connections=config.get('max_keepalive_connections', DEFAULT_MAX_KEEPALIVE_CONNECTIONS),
+            keepalive_expiry=config.get('keepalive_expiry', DEFAULT_KEEPALIVE_EXPIRY)
+        )
+        self._session_options = {'limits': limits, 'timeout': self.timeout, 'http2': config.get('http2', False)}
+        self._auth = config.get('auth', None)
         # Set default headers
-        headers = {'Content-Type': 'application/json'}
+        self._headers = {'Content-Type': 'application/json'}
         if token:
-            headers['Authorization'] = f'Bearer {token}'
-        self.session.headers.update(headers)
+            self._headers['Authorization'] = f'Bearer {token}'
+        self.session = self._create_session()
+        self.serializer = get_serializer(config.get('serializer'))
+
+        search_cache = config.get('search_cache')
+        if search_cache is True:
+            search_cache = SearchCache()
+        elif isinstance(search_cache, dict):
+            search_cache = SearchCache(**search_cache)
+        self.search_cache: Optional[SearchCache] = search_cache if isinstance(search_cache, SearchCache) else None
+        vector_cache = config.get('vector_cache', True)
+        if vector_cache is True:
+            vector_cache = SearchCache()
+        elif isinstance(vector_cache, dict):
+            vector_cache = SearchCache(**vector_cache)
+        self.vector_cache: Optional[SearchCache] = vector_cache if isinstance(vector_cache, SearchCache) else None
+        self.single_flight: Optional[SingleFlight] = SingleFlight() if config.get('coalesce_reads') else None
+
+        self.topology: Optional[ClusterTopology] = None
+        self._topology_lock: Optional[asyncio.Lock] = None
+        if nodes:
+            self.topology = ClusterTopology(
+                [f"{host}:{port}"] + list(nodes), scheme,
+                refresh_interval=config.get('topology_refresh_interval', DEFAULT_TOPOLOGY_REFRESH_INTERVAL)
+            )
+
+        load_balance_reads = config.get('load_balance_reads')
+        self.read_balancer: Optional[ReadBalancer] = None
+        if load_balance_reads and self.topology is not None:
+            self.read_balancer = ReadBalancer(**load_balance_reads) if isinstance(load_balance_reads, dict) else ReadBalancer()
+
+        hedge_reads = config.get('hedge_reads')
+        if hedge_reads is True:
+            hedge_reads = HedgePolicy()
+        elif isinstance(hedge_reads, dict):
+            hedge_reads = HedgePolicy(**hedge_reads)
+        self.hedge_policy: Optional[HedgePolicy] = hedge_reads if isinstance(hedge_reads, HedgePolicy) else None
+
+        retry = config.get('retry')
+        if retry is True:
+            retry = RetryPolicy()
+        elif isinstance(retry, dict):
+            retry = RetryPolicy(**retry)
+        self.retry_policy: Optional[RetryPolicy] = retry if isinstance(retry, RetryPolicy) else None
+
+        circuit_breaker = config.get('circuit_breaker')
+        circuit_options = dict(circuit_breaker) if isinstance(circuit_breaker, dict) else {}
+        self._probe_timeout = circuit_options.pop('probe_timeout', DEFAULT_PROBE_TIMEOUT)
+        self._circuit_options: Optional[Dict[str, Any]] = circuit_options if circuit_breaker else None
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+    def _create_session(self) -> httpx.AsyncClient:
+        """
+        Create an httpx.AsyncClient with the configured pool, timeouts, authentication and headers.
+        """
+        session = httpx.AsyncClient(**self._session_options)
+        if self._auth:
+            session.auth = self._auth
+        session.headers.update(self._headers)
+        return session
+
+    def _node_session(self, node: ClusterNode) -> httpx.AsyncClient:
+        """
+        Connection pool dedicated to a cluster node, created on first use.
+        """
+        if node.session is None:
+            node.session = self._create_session()
+        return node.session
 
     def set_token(self, token: str):
         """
@@ -82,7 +312,12 @@ class ASimpleVectorsClient:
 
         :param token: The Bearer token to use for Authorization.
         """
+        self._headers['Authorization'] = f'Bearer {token}'
         self.session.headers['Authorization'] = f'Bearer {token}'
+        if self.topology is not None:
+            for node in self.topology.all_nodes():
+                if node.session is not None:
+                    node.session.headers['Authorization'] = f'Bearer {token}'
 
     async def make_request(
         self,
@@ -91,7 +326,11 @@ class ASimpleVectorsClient:
         data: Optional[Dict] = None,
         response_model: Type[Any] = None,
         error_model: Type[Any] = None,
-        params: Optional[Dict[str, Any]] = None
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        balance: bool = False,
+        hedge: Optional[str] = None
     ) -> Optional[Any]:
         """
         Make an HTTP request to the API and handle the response.
@@ -102,29 +341,30 @@ class ASimpleVectorsClient:
         :param response_model: Expected model for successful response.
         :param error_model: Expected model for error response.
         :param params: Optional query parameters for the request.
+        :param content: Optional pre-encoded JSON body, used instead of `data`.
+        :param timeout: Optional timeout overriding the client default.
+        :param balance: Read request that may be served by any healthy cluster node.
+        :param hedge: Operation name of an idempotent read that may be hedged.
         :return: Parsed response model or None if an error occurs.
         :raises ConnectionError: If the request fails to connect.
         :raises HTTPStatusError: If the server returns an HTTP error status.
         """
         try:
-            logger.debug(f"Making {method} request to {url} with data: {data}")
-            headers = {}
-            if data:
-                headers['Content-Type'] = 'application/json'
-
-            response = await self.session.request(method, url, json=data, headers=headers, params=params)
-            logger.debug(f"Received response: {response.status_code}, {response.text}")
-            response.raise_for_status()
-
-            response_json = response.json()
-            logger.debug(f"Response JSON: {response_json}")
+            response = await self._send(
+                method, url, data=data, params=params, content=content, timeout=timeout, balance=balance, hedge=hedge
+            )
+            if not response.content:
+                return None
 
             if response_model and response.status_code in {200, 201}:
                 # Handle list response appropriately
-                if isinstance(response_json, list):
-                    return [response_model(**item) for item in response_json]
-                return response_model(**response_json)
-            elif error_model:
+                return _parse_model(response_model, response.content)
+
+            response_json = self.serializer.loads(response.content)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Response JSON: {response_json}")
+
+            if error_model:
                 error = error_model(**response_json)
                 logger.error(f"Error response: {error.error}")
                 return None
@@ -133,6 +373,432 @@ class ASimpleVectorsClient:
             logger.error(f"Request failed: {e}")
             raise
 
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[Union[bytes, AsyncIterator[bytes]]] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        headers: Optional[Dict[str, str]] = None,
+        balance: bool = False,
+        hedge: Optional[str] = None,
+        stream: bool = False
+    ) -> httpx.Response:
+        """
+        Encode the payload with the configured serializer, send the request and raise on HTTP errors.
+
+        :param method: HTTP method (GET, POST, etc.).
+        :param url: API endpoint URL.
+        :param data: Request payload, encoded with the client serializer.
+        :param params: Optional query parameters for the request.
+        :param content: Optional pre-encoded body or async byte stream, used instead of `data`.
+        :param timeout: Optional timeout overriding the client default.
+        :param headers: Optional headers overriding the JSON content type.
+        :param balance: Read request that may be served by any healthy cluster node.
+        :param hedge: Operation name of an idempotent read that may be hedged.
+        :param stream: Return before reading the body; the caller must close the response.
+            Streamed requests are always sent to the configured host.
+        :return: The httpx response.
+        :raises HTTPStatusError: If the server returns an HTTP error status.
+        """
+        if content is None and data is not None:
+            content = self.serializer.dumps(data)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Making {method} request to {url} with data: {data if data is not None else content}")
+
+        request_headers = {}
+        if content is not None:
+            request_headers['Content-Type'] = 'application/json'
+        if headers:
+            request_headers.update(headers)
+
+        policy = self.retry_policy
+        if policy is None:
+            return await self._send_once(method, url, content, request_headers, params, timeout, balance, hedge, stream)
+        policy.budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                return await self._send_once(method, url, content, request_headers, params, timeout, balance, hedge, stream)
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                # Streamed bodies cannot be replayed.
+                if not (content is None or isinstance(content, bytes)) or not policy.should_retry(e, method, url, attempt):
+                    raise
+                delay = policy.backoff(attempt, e)
+                logger.warning(f"{method} {url} failed ({e}); retrying in {delay:.2f}s (attempt {attempt + 1}/{policy.max_attempts}).")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _send_once(
+        self,
+        method: str,
+        url: str,
+        content: Optional[Union[bytes, AsyncIterator[bytes]]],
+        request_headers: Dict[str, str],
+        params: Optional[Dict[str, Any]],
+        timeout: Optional[httpx.Timeout],
+        balance: bool,
+        hedge: Optional[str],
+        stream: bool = False
+    ) -> httpx.Response:
+        """
+        Send one attempt of a request, hedged, balanced over the cluster or routed to the leader.
+        """
+        if stream:
+            return await self._dispatch(method, url, content, request_headers, params, timeout, stream=True)
+        if hedge is not None and self.hedge_policy is not None:
+            return await self._send_hedged(hedge, method, url, content, request_headers, params, timeout, balance)
+        if balance and self.read_balancer is not None:
+            return await self._send_balanced(method, url, content, request_headers, params, timeout)
+
+        leader = None
+        if self.topology is not None and self._is_write(method, url):
+            leader = await self._get_leader()
+        try:
+            return await self._dispatch(
+                method, self._route_url(url, leader), content, request_headers, params, timeout,
+                session=self._node_session(leader) if leader is not None else None
+            )
+        except (httpx.ConnectError, CircuitOpenError, httpx.HTTPStatusError) as e:
+            if leader is None:
+                raise
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code not in _LEADER_ERROR_STATUSES:
+                raise
+            # Streamed bodies cannot be replayed.
+            new_leader = await self.refresh_topology(force=True)
+            if new_leader is None or new_leader is leader or not (content is None or isinstance(content, bytes)):
+                raise
+            logger.warning(f"Write to {leader.address} failed ({e}); retrying on new leader {new_leader.address}.")
+            return await self._dispatch(
+                method, self._route_url(url, new_leader), content, request_headers, params, timeout,
+                session=self._node_session(new_leader)
+            )
+
+    async def _send_balanced(
+        self,
+        method: str,
+        url: str,
+        content: Optional[bytes],
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]],
+        timeout: Optional[httpx.Timeout],
+        tried: Optional[List[ClusterNode]] = None
+    ) -> httpx.Response:
+        """
+        Send a read request to a node chosen by the read balancer, failing over once to another
+        node on connection errors, timeouts and server errors. Nodes in `tried` are avoided and the
+        chosen nodes are appended to it, so concurrent hedged attempts go to different nodes.
+        """
+        if self.topology.is_stale():
+            await self.refresh_topology()
+        nodes = list(self.topology.nodes.values())
+
+        if tried is None:
+            tried = []
+        attempts = 0
+        while True:
+            # Reuse a node (on another pooled connection) once every node has been tried.
+            node = self.read_balancer.pick(nodes, exclude=tried) or self.read_balancer.pick(nodes)
+            tried.append(node)
+            attempts += 1
+            node.outstanding += 1
+            started = time.monotonic()
+            try:
+                response = await self._dispatch(
+                    method, self._route_url(url, node), content, headers, params, timeout,
+                    session=self._node_session(node)
+                )
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if isinstance(e, httpx.HTTPStatusError) and e.response.status_code not in _NODE_ERROR_STATUSES:
+                    self.read_balancer.on_success(node, time.monotonic() - started, nodes)
+                    raise
+                self.read_balancer.on_failure(node)
+                if attempts > 1 or len(nodes) < 2:
+                    raise
+                logger.warning(f"Read from {node.address} failed ({e}); failing over to another node.")
+                continue
+            finally:
+                node.outstanding -= 1
+            self.read_balancer.on_success(node, time.monotonic() - started, nodes)
+            return response
+
+    async def _send_hedged(
+        self,
+        operation: str,
+        method: str,
+        url: str,
+        content: Optional[bytes],
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]],
+        timeout: Optional[httpx.Timeout],
+        balance: bool
+    ) -> httpx.Response:
+        """
+        Send an idempotent read and, if it has not answered within the hedge delay of the operation,
+        a duplicate to another node (or on another pooled connection). The first successful answer is
+        returned and the other attempts are cancelled.
+        """
+        policy = self.hedge_policy
+        tried: List[ClusterNode] = []
+
+        def attempt() -> Awaitable[httpx.Response]:
+            if balance and self.read_balancer is not None:
+                return self._send_balanced(method, url, content, headers, params, timeout, tried=tried)
+            return self._dispatch(method, url, content, headers, params, timeout)
+
+        first = asyncio.ensure_future(attempt())
+        started = {first: time.monotonic()}
+        pending = {first}
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                can_hedge = len(started) <= policy.max_hedges
+                done, pending = await asyncio.wait(
+                    pending, timeout=policy.delay(operation) if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        policy.latencies.record(operation, time.monotonic() - started[task])
+                        if task is not first:
+                            policy.hedges_won += 1
+                        return task.result()
+                    error = task.exception()
+                if not done:
+                    hedge = asyncio.ensure_future(attempt())
+                    started[hedge] = time.monotonic()
+                    pending.add(hedge)
+                    policy.hedges_sent += 1
+                elif not pending:
+                    raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _dispatch(
+        self,
+        method: str,
+        url: str,
+        content: Optional[Union[bytes, AsyncIterator[bytes]]],
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]],
+        timeout: Optional[httpx.Timeout],
+        session: Optional[httpx.AsyncClient] = None,
+        stream: bool = False
+    ) -> httpx.Response:
+        """
+        Send one HTTP request on the given session, or the default session, and raise on HTTP errors.
+        With `stream`, the body is not read and the caller must close the response.
+        """
+        breaker = self._circuit_breaker(url)
+        if breaker is not None:
+            await self._check_circuit(breaker, url, session)
+        session = session or self.session
+        try:
+            if stream:
+                request = session.build_request(
+                    method, url, content=content, headers=headers, params=params, timeout=timeout or self.timeout
+                )
+                response = await session.send(request, stream=True)
+            else:
+                response = await session.request(
+                    method, url, content=content, headers=headers, params=params, timeout=timeout or self.timeout
+                )
+        except httpx.TransportError:
+            if breaker is not None:
+                breaker.on_failure()
+            raise
+        if breaker is not None:
+            if response.status_code in _NODE_ERROR_STATUSES:
+                breaker.on_failure()
+            else:
+                breaker.on_success()
+        if stream:
+            if response.is_error:
+                await response.aclose()
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Received response: {response.status_code}, {response.text}")
+        response.raise_for_status()
+        return response
+
+    @asynccontextmanager
+    async def _stream(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[httpx.Timeout] = None
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Send a request whose body is read incrementally, with the retry policy and circuit breaker
+        of other requests, and close the response on exit.
+        """
+        response = await self._send(method, url, headers=headers, timeout=timeout, stream=True)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    def _circuit_breaker(self, url: str) -> Optional[CircuitBreaker]:
+        """
+        Circuit breaker of the endpoint of `url`, or None if circuit breaking is disabled.
+        """
+        if self._circuit_options is None:
+            return None
+        endpoint = endpoint_of(url)
+        breaker = self.circuit_breakers.get(endpoint)
+        if breaker is None:
+            breaker = self.circuit_breakers[endpoint] = CircuitBreaker(**self._circuit_options)
+        return breaker
+
+    async def _check_circuit(self, breaker: CircuitBreaker, url: str, session: Optional[httpx.AsyncClient]) -> None:
+        """
+        Raise CircuitOpenError unless the circuit allows a request. When the circuit is half-open,
+        one caller probes the endpoint with the cheap `/cluster/metrics` request and closes the
+        circuit if the endpoint answers without a server error.
+        """
+        if breaker.allow():
+            return
+        endpoint = endpoint_of(url)
+        if breaker.try_probe():
+            try:
+                response = await (session or self.session).get(f"{endpoint}/cluster/metrics", timeout=self._probe_timeout)
+                healthy = response.status_code not in _NODE_ERROR_STATUSES
+            except httpx.TransportError:
+                healthy = False
+            except BaseException:
+                breaker.on_failure()
+                raise
+            if healthy:
+                logger.info(f"Circuit for {endpoint} closed after a successful probe.")
+                breaker.on_success()
+                return
+            breaker.on_failure()
+        raise CircuitOpenError(f"Circuit for {endpoint} is open; not sending {url}.")
+
+    @staticmethod
+    def _is_write(method: str, url: str) -> bool:
+        """
+        Whether a request modifies cluster state and must be served by the leader.
+        """
+        return method.upper() != "GET" and not url.endswith(_READ_ONLY_POST_SUFFIXES)
+
+    def _route_url(self, url: str, node: Optional[ClusterNode]) -> str:
+        """
+        Rewrite a URL built from this client's base or cluster URL to target `node`.
+        """
+        if node is None:
+            return url
+        if url.startswith(self.base_url):
+            return node.base_url + url[len(self.base_url):]
+        if url.startswith(self.cluster_url):
+            return node.cluster_url + url[len(self.cluster_url):]
+        return url
+
+    async def _get_leader(self) -> Optional[ClusterNode]:
+        """
+        Current leader of the cluster, refreshing the topology if it is stale.
+        """
+        if self.topology.is_stale() or self.topology.leader is None:
+            return await self.refresh_topology()
+        return self.topology.leader
+
+    async def refresh_topology(self, force: bool = False) -> Optional[ClusterNode]:
+        """
+        Discovers the cluster members and leader from the `/cluster/metrics` endpoint, asking the last
+        known leader first, then the other known nodes and seeds. Only available in cluster-aware mode.
+
+        :param force: Refresh even if the topology is not stale.
+        :return: The leader node, or None if no node reports a leader.
+
+        Example:
+            client = ASimpleVectorsClient(host="10.0.0.1", nodes=["10.0.0.2:21001", "10.0.0.3:21001"])
+            leader = await client.refresh_topology()
+            print(f"Leader: {leader.address if leader else None}")
+        """
+        if self.topology is None:
+            raise ValueError("refresh_topology requires cluster-aware mode (pass `nodes` to the client).")
+        if self._topology_lock is None:
+            self._topology_lock = asyncio.Lock()
+
+        updated_at = self.topology.updated_at
+        async with self._topology_lock:
+            if updated_at != self.topology.updated_at and not self.topology.is_stale():
+                # Another coroutine refreshed while this one was waiting.
+                return self.topology.leader
+            if not force and not self.topology.is_stale() and self.topology.leader is not None:
+                return self.topology.leader
+
+            reached = False
+            for node in self.topology.candidates():
+                try:
+                    response = await self.session.get(f"{node.cluster_url}/metrics", timeout=self.search_timeout)
+                    response.raise_for_status()
+                    metrics = ClusterMetricsResponse.from_response(self.serializer.loads(response.content))
+                except Exception as e:
+                    logger.warning(f"Failed to fetch cluster metrics from {node.address}: {e}")
+                    continue
+                reached = True
+                self.topology.update(metrics)
+                if self.topology.leader is not None:
+                    break
+            if not reached:
+                # Keep the known nodes and wait a full interval before balanced reads retry discovery;
+                # writes still refresh immediately because no leader is known.
+                self.topology.updated_at = time.monotonic()
+            logger.debug(f"Cluster topology: nodes={list(self.topology.nodes)}, leader={self.topology.leader}")
+            return self.topology.leader
+
+    async def _cached_read(
+        self,
+        operation: str,
+        space_name: str,
+        version_id: Optional[int],
+        request: Optional[Dict],
+        fetch: Callable[[], Awaitable[Any]],
+        cache: bool = True
+    ) -> Any:
+        """
+        Serve a read request from the search cache if enabled, otherwise fetch it, sharing the
+        request with identical calls in flight when coalescing is enabled, and cache the result.
+        Results of requests that overlapped a write to the same space are not cached.
+        """
+        search_cache = self.search_cache if cache else None
+        if search_cache is None and self.single_flight is None:
+            return await fetch()
+
+        key = request_key(operation, space_name, version_id, request)
+        result = search_cache.get(key) if search_cache is not None else None
+        if result is None:
+            generation = search_cache.generation(space_name) if search_cache is not None else None
+            if self.single_flight is not None:
+                result = await self.single_flight.do(key, fetch)
+            else:
+                result = await fetch()
+            if result is None:
+                return None
+            if search_cache is not None:
+                search_cache.put(key, space_name, result, generation)
+        # Hand out a copy so callers cannot reorder the cached list.
+        return list(result) if isinstance(result, list) else result
+
+    def _invalidate_cache(self, space_name: Optional[str] = None) -> None:
+        """
+        Drop cached results of a space after a write, or of all spaces if no name is given.
+        """
+        for cache in (self.search_cache, self.vector_cache):
+            if cache is None:
+                continue
+            if space_name is None:
+                cache.clear()
+            else:
+                cache.invalidate_space(space_name)
+
     # cluster methods
     async def init_cluster(self) -> None:
         """
@@ -204,10 +870,8 @@ class ASimpleVectorsClient:
         """
         url = f"{self.cluster_url}/metrics"
         try:
-            # Make the request directly using session
-            response = await self.session.get(url)
-            response.raise_for_status()
-            response_json = response.json()
+            response = await self._send("GET", url)
+            response_json = self.serializer.loads(response.content)
 
             if "Ok" in response_json:
                 cluster_metrics = ClusterMetricsResponse.from_response(response_json)
@@ -255,6 +919,14 @@ class ASimpleVectorsClient:
         """
         Retrieves details of a specific space.
         """
+        return await self._cached_read(
+            "get_space", space_name, None, None, lambda: self._fetch_space(space_name), cache=False
+        )
+
+    async def _fetch_space(self, space_name: str) -> Optional[SpaceResponse]:
+        """
+        Requests and parses the details of a space for get_space.
+        """
         url = f"{self.base_url}/space/{space_name}"
         try:
             logger.info(f"Retrieving space: {space_name}")
@@ -298,7 +970,10 @@ class ASimpleVectorsClient:
             await client.update_space("example_space", updated_data)
         """
         url = f"{self.base_url}/space/{space_name}"
-        await self.make_request("POST", url, data=space_data)
+        try:
+            await self.make_request("POST", url, data=space_data)
+        finally:
+            self._invalidate_cache(space_name)
 
     async def delete_space(self, space_name: str) -> None:
         """
@@ -310,7 +985,10 @@ class ASimpleVectorsClient:
             await client.delete_space("example_space")
         """
         url = f"{self.base_url}/space/{space_name}"
-        await self.make_request("DELETE", url)
+        try:
+            await self.make_request("DELETE", url)
+        finally:
+            self._invalidate_cache(space_name)
 
     async def list_spaces(self) -> Optional[ListSpacesResponse]:
         """
@@ -344,7 +1022,10 @@ class ASimpleVectorsClient:
             await client.create_version("example_space", version_request)
         """
         url = f"{self.base_url}/space/{space_name}/version"
-        await self.make_request("POST", url, data=version_request)
+        try:
+            await self.make_request("POST", url, data=version_request)
+        finally:
+            self._invalidate_cache(space_name)
 
     async def list_versions(self, space_name: str, start: Optional[int] = 0, limit: Optional[int] = 100) -> Optional[ListVersionsResponse]:
         """
@@ -395,7 +1076,9 @@ class ASimpleVectorsClient:
                 print(f"Default version: {default_version.name}, ID: {default_version.id}")
         """
         url = f"{self.base_url}/space/{space_name}/version"
-        return await self.make_request("GET", url, response_model=VersionResponse, error_model=VersionErrorResponse)
+        return await self._cached_read("get_default_version", space_name, None, None, lambda: self.make_request(
+            "GET", url, response_model=VersionResponse, error_model=VersionErrorResponse
+        ), cache=False)
 
     async def delete_version(self, space_name: str, version_id: int) -> None:
         """
@@ -410,7 +1093,10 @@ class ASimpleVectorsClient:
             print("Version deleted successfully.")
         """
         url = f"{self.base_url}/space/{space_name}/version/{version_id}"
-        await self.make_request("DELETE", url)
+        try:
+            await self.make_request("DELETE", url)
+        finally:
+            self._invalidate_cache(space_name)
         print(f"Version {version_id} deleted successfully from space '{space_name}'.")
 
     # Vector Methods
@@ -440,22 +1126,524 @@ class ASimpleVectorsClient:
             }
             await client.upsert_vector("example_space", vector_request)
         """
+        await self._post_vectors(space_name, vector_request.get("vectors", []))
+        print(f"Vectors upserted successfully into space '{space_name}'.")
+
+    async def upsert_vectors_bulk(
+        self,
+        space_name: str,
+        vectors: Sequence[Dict],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        concurrency: int = 4
+    ) -> List[BulkUpsertResult]:
+        """
+        Upserts an arbitrarily large sequence of vectors by splitting it into batches bounded by
+        count and estimated payload size, keeping up to `concurrency` batches in flight.
+
+        A failed batch does not abort the others; its error is reported in the result list.
+
+        :param space_name: Name of the space where the vectors will be upserted.
+        :param vectors: Sequence of vector dictionaries, in the same format as `upsert_vector`.
+        :param batch_size: Maximum number of vectors per request.
+        :param max_batch_bytes: Maximum estimated JSON payload size per request in bytes.
+        :param concurrency: Maximum number of batches in flight at the same time.
+        :return: List of BulkUpsertResult objects, one per batch, in submission order.
+
+        Example:
+            vectors = [{"id": i, "data": embeddings[i]} for i in range(len(embeddings))]
+            results = await client.upsert_vectors_bulk("example_space", vectors, batch_size=500)
+            failed = [result for result in results if not result.success]
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive.")
+
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = []
+        for batch_index, (start, batch) in enumerate(iter_vector_batches(vectors, batch_size, max_batch_bytes)):
+            await semaphore.acquire()
+            tasks.append(asyncio.ensure_future(self._upsert_batch(
+                space_name, batch_index, start, len(batch), self._post_vectors(space_name, batch), semaphore
+            )))
+        results = await asyncio.gather(*tasks)
+
+        failed = sum(1 for result in results if not result.success)
+        logger.info(f"Bulk upsert into space '{space_name}' finished: {len(results)} batches, {failed} failed.")
+        return list(results)
+
+    async def upsert_matrix(
+        self,
+        space_name: str,
+        ids: Any,
+        matrix: Any,
+        metadata: Optional[Sequence[Any]] = None,
+        dimension: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        concurrency: int = 4
+    ) -> List[BulkUpsertResult]:
+        """
+        Upserts an (N, D) matrix of vectors with their ids, validating shape and dtype once and
+        encoding each batch directly from matrix slices instead of per-vector dictionaries.
+
+        :param space_name: Name of the space where the vectors will be upserted.
+        :param ids: Array-like of N integer vector ids.
+        :param matrix: Array-like of shape (N, D); converted to float32 only if needed.
+        :param metadata: Optional sequence of N metadata entries.
+        :param dimension: Dimension of the space. Looked up from the default vector index if omitted.
+        :param batch_size: Maximum number of vectors per request.
+        :param max_batch_bytes: Maximum estimated JSON payload size per request in bytes.
+        :param concurrency: Maximum number of batches in flight at the same time.
+        :return: List of BulkUpsertResult objects, one per batch, in submission order.
+        :raises ValueError: If the matrix, ids or metadata do not match each other or the space.
+
+        Example:
+            embeddings = model.encode(documents).astype(np.float32)
+            ids = np.arange(1, len(documents) + 1)
+            results = await client.upsert_matrix("example_space", ids, embeddings)
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive.")
+        if dimension is None:
+            dimension = await self._get_space_dimension(space_name)
+
+        ids, matrix = validate_matrix(ids, matrix, dimension)
+        if metadata is not None and len(metadata) != matrix.shape[0]:
+            raise ValueError(f"Metadata length {len(metadata)} does not match number of vectors {matrix.shape[0]}.")
+
+        rows = matrix_batch_rows(matrix.shape[1], batch_size, max_batch_bytes)
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = []
+        for batch_index, start in enumerate(range(0, matrix.shape[0], rows)):
+            end = min(start + rows, matrix.shape[0])
+            batch_metadata = metadata[start:end] if metadata is not None else None
+            await semaphore.acquire()
+            tasks.append(asyncio.ensure_future(self._upsert_batch(
+                space_name, batch_index, start, end - start,
+                self._post_matrix_batch(space_name, ids[start:end], matrix[start:end], batch_metadata),
+                semaphore
+            )))
+        results = await asyncio.gather(*tasks)
+
+        failed = sum(1 for result in results if not result.success)
+        logger.info(f"Matrix upsert into space '{space_name}' finished: {len(results)} batches, {failed} failed.")
+        return list(results)
+
+    def buffered_writer(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL,
+        max_buffered: Optional[int] = None,
+        concurrency: int = 4,
+        on_error: Optional[Callable[[str, List[Dict], Exception], Any]] = None
+    ) -> BufferedVectorWriter:
+        """
+        Creates a write-behind buffer that accepts single vectors and upserts them in batches in
+        the background. Close it with `aclose()` (or use it as an async context manager) to flush
+        the remaining vectors.
+
+        :param batch_size: Maximum number of vectors per request; a full space buffer is sent at once.
+        :param max_batch_bytes: Maximum estimated JSON payload size per request in bytes.
+        :param flush_interval: Maximum seconds a vector waits in the buffer, or None to flush only on size.
+        :param max_buffered: Maximum number of vectors buffered or in flight before `add` waits.
+        :param concurrency: Maximum number of batches in flight at the same time.
+        :param on_error: Optional function or coroutine function called with (space_name, vectors, error)
+            for every failed batch.
+        :return: BufferedVectorWriter bound to this client.
+
+        Example:
+            async with client.buffered_writer(batch_size=500, flush_interval=0.5) as writer:
+                async for event in events:
+                    await writer.add("example_space", {"id": event.id, "data": event.embedding})
+            print(f"{writer.vectors_written} written, {writer.vectors_failed} failed")
+        """
+        return BufferedVectorWriter(
+            self, batch_size=batch_size, max_batch_bytes=max_batch_bytes, flush_interval=flush_interval,
+            max_buffered=max_buffered, concurrency=concurrency, on_error=on_error
+        )
+
+    async def upsert_stream(
+        self,
+        space_name: str,
+        records: Union[Iterable[Any], AsyncIterable[Any]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        concurrency: int = 4
+    ) -> StreamUpsertResult:
+        """
+        Upserts vectors from a sync or async iterable of records without materialising it. Records
+        are batched as they are produced and at most `concurrency` batches are in flight, so memory
+        use does not depend on the size of the stream.
+
+        A record is a vector dictionary or a tuple (id, vector), (id, vector, metadata) or
+        (id, vector, metadata, doc). A failed batch does not abort the stream.
+
+        :param space_name: Name of the space where the vectors will be upserted.
+        :param records: Iterable, generator or async iterator of records.
+        :param batch_size: Maximum number of vectors per request.
+        :param max_batch_bytes: Maximum estimated JSON payload size per request in bytes.
+        :param concurrency: Maximum number of batches in flight at the same time.
+        :return: StreamUpsertResult with the number of vectors and batches sent and the failed batches.
+
+        Example:
+            async def records():
+                async for doc_id, text in read_corpus():
+                    yield doc_id, await embed(text), {"source": "corpus"}, text
+
+            result = await client.upsert_stream("example_space", records(), batch_size=500)
+            print(f"{result.count} vectors in {result.batch_count} batches, {result.failed_count} failed")
+        """
+        return await self._upsert_batch_stream(
+            space_name, aiter_vector_batches(records, batch_size, max_batch_bytes), concurrency
+        )
+
+    async def embed_and_upsert(
+        self,
+        space_name: str,
+        documents: Union[Iterable[Any], AsyncIterable[Any]],
+        embed: Callable[[List[str]], Any],
+        batch_size: int = 256,
+        encode_workers: int = 1,
+        upload_concurrency: int = 4,
+        executor: Optional[Executor] = None,
+        store_doc: bool = True,
+        tokenize: Optional[Callable[[str], List[str]]] = None
+    ) -> EmbedUpsertResult:
+        """
+        Embeds a stream of documents and upserts the vectors, overlapping model compute with network
+        I/O: batches are encoded in an executor while previously encoded batches upload. At most
+        `encode_workers` batches are encoded and `upload_concurrency` encoded batches wait for upload,
+        so a slow stage applies backpressure to the other.
+
+        :param space_name: Name of the space where the vectors will be upserted.
+        :param documents: Iterable or async iterable of (id, text) or (id, text, metadata) tuples.
+        :param embed: Function mapping a list of texts to an array-like of shape (len(texts), D).
+            It runs in `executor`; with a ProcessPoolExecutor it must be picklable.
+        :param batch_size: Number of documents per embedding call and upsert request.
+        :param encode_workers: Maximum number of batches encoded at the same time.
+        :param upload_concurrency: Maximum number of upsert requests in flight at the same time.
+        :param executor: Optional executor for `embed`. Defaults to a thread pool with `encode_workers` threads.
+        :param store_doc: Send the text as the "doc" of each vector.
+        :param tokenize: Optional function producing the "doc_tokens" of a text, for rerank.
+        :return: EmbedUpsertResult with counts, failed batches and per-stage throughput.
+        :raises ValueError: If `embed` returns the wrong number of rows.
+
+        Example:
+            model = SentenceTransformer("all-MiniLM-L6-v2")
+            result = await client.embed_and_upsert(
+                "example_space", enumerate(texts, start=1),
+                embed=lambda batch: model.encode(batch, convert_to_numpy=True),
+                tokenize=lambda text: text.lower().split()
+            )
+            print(f"encode {result.encode.items_per_second:.0f}/s, upload {result.upload.items_per_second:.0f}/s")
+        """
+        if encode_workers <= 0:
+            raise ValueError("encode_workers must be positive.")
+
+        loop = asyncio.get_running_loop()
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=encode_workers)
+        encode_stats = PipelineStageStats()
+        upload_stats = PipelineStageStats()
+        # [first start, last finish] of each stage, for throughput over its wall-clock time.
+        spans: Dict[str, List[float]] = {}
+        encoded: asyncio.Queue = asyncio.Queue(maxsize=upload_concurrency)
+        encode_slots = asyncio.Semaphore(encode_workers)
+
+        def record_span(stage: str, started: float, finished: float) -> None:
+            span = spans.setdefault(stage, [started, finished])
+            span[0] = min(span[0], started)
+            span[1] = max(span[1], finished)
+
+        async def encode(start: int, chunk: List[Any]) -> None:
+            try:
+                texts = [record[1] for record in chunk]
+                started = time.monotonic()
+                embeddings = np.asarray(await loop.run_in_executor(executor, embed, texts), dtype=np.float32)
+                finished = time.monotonic()
+                encode_stats.busy_seconds += finished - started
+                record_span("encode", started, finished)
+                if embeddings.ndim != 2 or embeddings.shape[0] != len(texts):
+                    raise ValueError(f"embed returned shape {embeddings.shape} for {len(texts)} texts.")
+                encode_stats.items += len(texts)
+                encode_stats.batches += 1
+
+                vectors = []
+                for record, row in zip(chunk, embeddings):
+                    vector = {"id": record[0], "data": row}
+                    if len(record) > 2 and record[2] is not None:
+                        vector["metadata"] = record[2]
+                    if store_doc:
+                        vector["doc"] = record[1]
+                    if tokenize is not None:
+                        vector["doc_tokens"] = tokenize(record[1])
+                    vectors.append(vector)
+                await encoded.put((start, vectors))
+            finally:
+                encode_slots.release()
+
+        async def produce() -> None:
+            tasks = set()
+            errors: List[BaseException] = []
+
+            def done(task: "asyncio.Future[None]") -> None:
+                tasks.discard(task)
+                if not task.cancelled() and task.exception() is not None:
+                    errors.append(task.exception())
+
+            try:
+                # Batches are numbered by input position, since they may finish encoding out of order.
+                start = 0
+                async for chunk in aiter_chunks(documents, batch_size):
+                    await encode_slots.acquire()
+                    # Stop reading documents as soon as an encoding failed.
+                    if errors:
+                        encode_slots.release()
+                        break
+                    task = asyncio.ensure_future(encode(start, chunk))
+                    tasks.add(task)
+                    task.add_done_callback(done)
+                    start += len(chunk)
+                if tasks:
+                    await asyncio.gather(*list(tasks), return_exceptions=True)
+            finally:
+                for task in list(tasks):
+                    task.cancel()
+            if errors:
+                raise errors[0]
+
+        producer = asyncio.ensure_future(produce())
+
+        async def encoded_batches() -> AsyncIterator[Tuple[int, List[Dict]]]:
+            while not (producer.done() and encoded.empty()):
+                get = asyncio.ensure_future(encoded.get())
+                await asyncio.wait({get, producer}, return_when=asyncio.FIRST_COMPLETED)
+                if not get.done():
+                    get.cancel()
+                    continue
+                yield get.result()
+
+        async def timed_post(target_space: str, batch: List[Dict]) -> None:
+            started = time.monotonic()
+            try:
+                await self._post_vectors(target_space, batch)
+            finally:
+                finished = time.monotonic()
+                upload_stats.busy_seconds += finished - started
+                record_span("upload", started, finished)
+                upload_stats.items += len(batch)
+                upload_stats.batches += 1
+
+        started = time.monotonic()
+        try:
+            summary = await self._upsert_batch_stream(
+                space_name, encoded_batches(), upload_concurrency, post=timed_post
+            )
+            producer.result()
+        finally:
+            if not producer.done():
+                producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            if own_executor:
+                executor.shutdown(wait=False)
+
+        elapsed = time.monotonic() - started
+        for stage, stats in (("encode", encode_stats), ("upload", upload_stats)):
+            first_started, last_finished = spans.get(stage, (0.0, 0.0))
+            stats.wall_seconds = last_finished - first_started
+            stats.items_per_second = stats.items / stats.wall_seconds if stats.wall_seconds else 0.0
+        logger.info(
+            f"Embed and upsert into space '{space_name}': {summary.count} vectors in {elapsed:.1f}s, "
+            f"encode {encode_stats.items_per_second:.0f}/s, upload {upload_stats.items_per_second:.0f}/s."
+        )
+        return EmbedUpsertResult(
+            count=summary.count,
+            failed_count=summary.failed_count,
+            failed_batches=summary.failed_batches,
+            elapsed_seconds=elapsed,
+            items_per_second=summary.count / elapsed if elapsed else 0.0,
+            encode=encode_stats,
+            upload=upload_stats
+        )
+
+    def ingestion_job(
+        self,
+        space_name: str,
+        job_id: str,
+        checkpoint_dir: Optional[str] = None,
+        store: Optional[CheckpointStore] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        concurrency: int = 4,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY
+    ) -> IngestionJob:
+        """
+        Creates a resumable streaming upsert job. Progress is checkpointed in the key-value store of
+        the space, or in `checkpoint_dir` if given; running the job again with the same records
+        skips the batches that were already committed.
+
+        :param space_name: Name of the space where the vectors will be upserted.
+        :param job_id: Identifier of the job, used as the checkpoint key.
+        :param checkpoint_dir: Optional local directory for checkpoint files instead of the key-value store.
+        :param store: Optional custom CheckpointStore, overriding `checkpoint_dir`.
+        :param batch_size: Maximum number of vectors per request; must stay the same across runs.
+        :param max_batch_bytes: Maximum estimated JSON payload size per request; must stay the same across runs.
+        :param concurrency: Maximum number of batches in flight at the same time.
+        :param checkpoint_every: Number of committed batches between checkpoint writes.
+        :return: IngestionJob bound to this client.
+
+        Example:
+            job = client.ingestion_job("example_space", "corpus-2024-06")
+            result = await job.run(read_records())  # rerun after a crash to resume
+            print(f"{result.count} uploaded, {job.skipped_count} skipped, {result.failed_count} failed")
+        """
+        if store is None:
+            store = FileCheckpointStore(checkpoint_dir) if checkpoint_dir else KeyValueCheckpointStore(self, space_name)
+        return IngestionJob(
+            self, space_name, job_id, store, batch_size=batch_size, max_batch_bytes=max_batch_bytes,
+            concurrency=concurrency, checkpoint_every=checkpoint_every
+        )
+
+    async def _upsert_batch_stream(
+        self,
+        space_name: str,
+        batches: AsyncIterator[Tuple[int, List[Dict]]],
+        concurrency: int,
+        on_result: Optional[Callable[[BulkUpsertResult, List[Dict]], Awaitable[None]]] = None,
+        post: Optional[Callable[[str, List[Dict]], Awaitable[None]]] = None
+    ) -> StreamUpsertResult:
+        """
+        Uploads (start, batch) tuples with at most `concurrency` batches in flight, keeping only the
+        failed batch results. `on_result` is awaited after every batch; `post` replaces
+        `_post_vectors` for sending a batch.
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive.")
+
+        summary = StreamUpsertResult()
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = set()
+
+        async def upload(batch_index: int, start: int, batch: List[Dict]) -> None:
+            result = await self._upsert_batch(
+                space_name, batch_index, start, len(batch), (post or self._post_vectors)(space_name, batch), semaphore
+            )
+            summary.batch_count += 1
+            if result.success:
+                summary.count += result.count
+            else:
+                summary.failed_count += result.count
+                summary.failed_batches.append(result)
+            if on_result is not None:
+                await on_result(result, batch)
+
+        errors: List[BaseException] = []
+
+        def done(task: "asyncio.Future[None]") -> None:
+            tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                errors.append(task.exception())
+
+        try:
+            batch_index = 0
+            async for start, batch in batches:
+                await semaphore.acquire()
+                if errors:
+                    semaphore.release()
+                    break
+                task = asyncio.ensure_future(upload(batch_index, start, batch))
+                tasks.add(task)
+                task.add_done_callback(done)
+                batch_index += 1
+        finally:
+            if tasks:
+                await asyncio.gather(*list(tasks), return_exceptions=True)
+        if errors:
+            raise errors[0]
+
+        logger.info(
+            f"Stream upsert into space '{space_name}' finished: {summary.batch_count} batches, "
+            f"{len(summary.failed_batches)} failed."
+        )
+        return summary
+
+    async def _post_matrix_batch(
+        self,
+        space_name: str,
+        ids: np.ndarray,
+        block: np.ndarray,
+        metadata: Optional[Sequence[Any]]
+    ) -> None:
+        """
+        Encodes and sends one slice of a matrix upsert.
+        """
         url = f"{self.base_url}/space/{space_name}/vector"
+        try:
+            await self.make_request(
+                "POST", url, content=encode_matrix_batch(ids, block, self.serializer.dumps, metadata),
+                timeout=self.ingest_timeout
+            )
+        finally:
+            self._invalidate_cache(space_name)
 
-        # Validate and convert vector data
-        if "vectors" in vector_request:
-            for vector in vector_request["vectors"]:
-                if isinstance(vector["data"], np.ndarray):
-                    # Convert numpy array to list
-                    vector["data"] = vector["data"].tolist()
-                elif not isinstance(vector["data"], list):
-                    raise ValueError(
-                        f"Invalid vector data type: {type(vector['data'])}. Expected numpy array or list."
-                    )
+    async def _get_space_dimension(self, space_name: str) -> int:
+        """
+        Returns the dimension of the default vector index of a space.
 
-        # Make the API request
-        await self.make_request("POST", url, data=vector_request)
-        print(f"Vectors upserted successfully into space '{space_name}'.")
+        :raises ValueError: If the space or its vector index cannot be found.
+        """
+        space = await self.get_space(space_name)
+        if space is None or not space.version.vectorIndices:
+            raise ValueError(f"Cannot determine the dimension of space '{space_name}'.")
+        for vector_index in space.version.vectorIndices:
+            if vector_index.is_default:
+                return vector_index.dimension
+        return space.version.vectorIndices[0].dimension
+
+    async def _upsert_batch(
+        self,
+        space_name: str,
+        batch_index: int,
+        start: int,
+        count: int,
+        request: Awaitable[None],
+        semaphore: asyncio.Semaphore
+    ) -> BulkUpsertResult:
+        """
+        Awaits the upsert request of one batch and releases its concurrency slot.
+        """
+        try:
+            await request
+            return BulkUpsertResult(batch_index=batch_index, start=start, count=count, success=True)
+        except Exception as e:
+            logger.error(f"Batch {batch_index} of bulk upsert into space '{space_name}' failed: {e}")
+            return BulkUpsertResult(
+                batch_index=batch_index, start=start, count=count, success=False, error=str(e)
+            )
+        finally:
+            semaphore.release()
+
+    async def _post_vectors(self, space_name: str, vectors: Sequence[Dict]) -> None:
+        """
+        Validates vector data and sends a single upsert request.
+
+        :raises ValueError: If vector data is not a valid numpy array or list.
+        """
+        url = f"{self.base_url}/space/{space_name}/vector"
+
+        # numpy arrays are encoded by the serializer directly
+        for vector in vectors:
+            if not isinstance(vector["data"], (np.ndarray, list)):
+                raise ValueError(
+                    f"Invalid vector data type: {type(vector['data'])}. Expected numpy array or list."
+                )
+
+        try:
+            await self.make_request("POST", url, data={"vectors": vectors}, timeout=self.ingest_timeout)
+        finally:
+            self._invalidate_cache(space_name)
 
     async def get_vectors_by_version(
         self,
@@ -463,8 +1651,9 @@ class ASimpleVectorsClient:
         version_id: int,
         start: Optional[int] = None,
         limit: Optional[int] = None,
-        filter: Optional[str] = None
-    ) -> Optional[GetVectorsResponse]:
+        filter: Optional[str] = None,
+        columnar: bool = False
+    ) -> Optional[Union[GetVectorsResponse, VectorPage]]:
         """
         Retrieves vectors from a specific version of a space.
 
@@ -473,13 +1662,19 @@ class ASimpleVectorsClient:
         :param start: Optional start index for pagination.
         :param limit: Optional limit for the number of vectors to retrieve.
         :param filter: Optional filter for the query.  # Updated docstring
-        :return: GetVectorsResponse object containing vector details, or None if no vectors are found.
+        :param columnar: Return a VectorPage with (n,) int64 ids and an (n, d) float32 matrix instead
+            of a model per vector.
+        :return: GetVectorsResponse object containing vector details (VectorPage if `columnar` is set),
+            or None if no vectors are found.
 
         Example:
             vectors = await client.get_vectors_by_version("example_space", 1, start=0, limit=10, filter="label:example")
             if vectors and vectors.vectors:
                 for vector in vectors.vectors:
                     print(f"Vector ID: {vector.id}")
+
+            page = await client.get_vectors_by_version("example_space", 1, limit=10000, columnar=True)
+            print(page.ids.shape, page.vectors.shape)
         """
         url = f"{self.base_url}/space/{space_name}/version/{version_id}/vectors"
         params = {}
@@ -490,11 +1685,228 @@ class ASimpleVectorsClient:
         if filter is not None:
             params['filter'] = filter
 
-        response = await self.session.get(url, params=params)
-        response.raise_for_status()
-        response_json = response.json()
+        response = await self._send("GET", url, params=params, balance=True)
+        response_json = self.serializer.loads(response.content)
+        if columnar:
+            return VectorPage.from_response(response_json, start or 0)
         return GetVectorsResponse.from_response(response_json)
 
+    async def iter_vectors_by_version(
+        self,
+        space_name: str,
+        version_id: int,
+        page_size: int = 1000,
+        filter: Optional[str] = None,
+        prefetch: int = 2,
+        as_numpy: bool = False,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[Union[VectorDataResponse, VectorPage]]:
+        """
+        Iterates over all vectors of a version page by page, fetching up to `prefetch` pages ahead
+        while the caller processes the current one. If the server returns fewer rows than requested,
+        e.g. because it caps the page size, iteration continues right after the rows received and
+        later pages use the smaller size.
+
+        :param space_name: Name of the space to retrieve vectors from.
+        :param version_id: ID of the version to retrieve vectors for.
+        :param page_size: Number of vectors requested per page.
+        :param filter: Optional filter for the query.
+        :param prefetch: Number of pages requested ahead of the consumer.
+        :param as_numpy: Yield one VectorPage per page instead of individual VectorDataResponse rows.
+        :param limit: Optional maximum number of vectors read; no page past it is requested.
+        :return: Async iterator of VectorDataResponse rows, or VectorPage blocks if `as_numpy` is set.
+
+        Example:
+            async for page in client.iter_vectors_by_version("example_space", 1, page_size=5000, as_numpy=True):
+                print(page.ids.shape, page.vectors.shape)
+        """
+        if page_size <= 0:
+            raise ValueError("page_size must be positive.")
+        if prefetch < 0:
+            raise ValueError("prefetch must not be negative.")
+        if limit is not None and limit <= 0:
+            raise ValueError("limit must be positive.")
+
+        pending = deque()
+        start = 0
+        next_start = page_size
+
+        def page_limit(start: int) -> int:
+            return page_size if limit is None else min(page_size, limit - start)
+
+        def fetch(start: int) -> "asyncio.Future[Union[GetVectorsResponse, VectorPage]]":
+            return asyncio.ensure_future(self.get_vectors_by_version(
+                space_name, version_id, start=start, limit=page_limit(start), filter=filter, columnar=as_numpy
+            ))
+
+        try:
+            response = await self.get_vectors_by_version(
+                space_name, version_id, start=0, limit=page_limit(0), filter=filter, columnar=as_numpy
+            )
+            while True:
+                total_count = response.total_count if limit is None else min(response.total_count, limit)
+                rows = len(response.ids) if as_numpy else len(response.vectors)
+                if not rows:
+                    break
+                if rows < page_limit(start) and start + rows < total_count:
+                    # A short page: the prefetched pages leave a gap after it, so drop them and
+                    # continue after the rows received with pages of the size the server returned.
+                    tasks = [task for _, task in pending]
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    pending.clear()
+                    page_size = rows
+                    next_start = start + rows
+                while len(pending) < prefetch and next_start < total_count:
+                    pending.append((next_start, fetch(next_start)))
+                    next_start += page_size
+
+                if as_numpy:
+                    yield response
+                else:
+                    for vector in response.vectors:
+                        yield vector
+
+                if pending:
+                    start, task = pending.popleft()
+                    response = await task
+                elif next_start < total_count:
+                    start = next_start
+                    response = await fetch(next_start)
+                    next_start += page_size
+                else:
+                    break
+        finally:
+            tasks = [task for _, task in pending]
+            for task in tasks:
+                task.cancel()
+            # Wait for the cancelled pages so no task outlives the iterator.
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def export_version(
+        self,
+        space_name: str,
+        version_id: int,
+        path_prefix: str,
+        page_size: int = 5000,
+        concurrency: int = 8,
+        filter: Optional[str] = None
+    ) -> VersionExportResult:
+        """
+        Exports all vectors of a version to disk. The row range is split into `concurrency`
+        partitions that are fetched in parallel and written directly into preallocated
+        memory-mapped .npy files, so the export does not need to fit in memory.
+
+        Files written:
+            - {path_prefix}.ids.npy: (N,) int64 vector ids, -1 for rows the server did not return.
+            - {path_prefix}.vectors.npy: (N, D) float32 vectors.
+            - {path_prefix}.metadata.jsonl: one JSON metadata entry per row, null for rows the server
+              did not return, so line i belongs to row i.
+
+        Pages shorter than requested are continued after the rows received. If the server stops
+        returning rows before the end of a partition, the rest of it is left empty and the result
+        is not `complete`.
+
+        :param space_name: Name of the space to export vectors from.
+        :param version_id: ID of the version to export.
+        :param path_prefix: Path prefix of the output files.
+        :param page_size: Number of vectors requested per page.
+        :param concurrency: Number of partitions fetched in parallel.
+        :param filter: Optional filter for the query.
+        :return: VersionExportResult with the row counts, dimension and file paths.
+
+        Example:
+            result = await client.export_version("example_space", 1, "./export/example_v1")
+            vectors = np.load(result.vectors_path, mmap_mode="r")
+        """
+        if page_size <= 0:
+            raise ValueError("page_size must be positive.")
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive.")
+
+        ids_path = f"{path_prefix}.ids.npy"
+        vectors_path = f"{path_prefix}.vectors.npy"
+        metadata_path = f"{path_prefix}.metadata.jsonl"
+        directory = os.path.dirname(path_prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        first_page = await self.get_vectors_by_version(
+            space_name, version_id, start=0, limit=page_size, filter=filter, columnar=True
+        )
+        total_count = first_page.total_count
+        dimension = first_page.vectors.shape[1] if first_page.vectors.size else 0
+
+        ids = np.lib.format.open_memmap(ids_path, mode="w+", dtype=np.int64, shape=(total_count,))
+        ids[:] = -1
+        vectors = np.lib.format.open_memmap(vectors_path, mode="w+", dtype=np.float32, shape=(total_count, dimension))
+
+        partition_size = max(page_size, -(-total_count // concurrency))
+        partitions = [
+            (start, min(start + partition_size, total_count))
+            for start in range(0, total_count, partition_size)
+        ]
+        partition_paths = [f"{metadata_path}.{index}" for index in range(len(partitions))]
+
+        async def export_partition(index: int) -> int:
+            start, end = partitions[index]
+            written = 0
+            async with aiofiles.open(partition_paths[index], "wb") as metadata_file:
+                offset = start
+                while offset < end:
+                    limit = min(page_size, end - offset)
+                    if offset == 0:
+                        page = first_page
+                    else:
+                        page = await self.get_vectors_by_version(
+                            space_name, version_id, start=offset, limit=limit, filter=filter, columnar=True
+                        )
+                    rows = min(len(page.ids), limit)
+                    if not rows:
+                        logger.warning(
+                            f"Export of space '{space_name}' version {version_id} received no rows at offset "
+                            f"{offset}; {end - offset} rows are left empty."
+                        )
+                        # Keep the metadata lines aligned with the rows of the .npy files.
+                        await metadata_file.write(b"null\n" * (end - offset))
+                        break
+                    ids[offset:offset + rows] = page.ids[:rows]
+                    vectors[offset:offset + rows] = page.vectors[:rows]
+                    await metadata_file.write(
+                        b"".join(self.serializer.dumps(item) + b"\n" for item in page.metadata[:rows])
+                    )
+                    written += rows
+                    offset += rows
+            return written
+
+        try:
+            counts = await asyncio.gather(*(export_partition(index) for index in range(len(partitions))))
+            ids.flush()
+            vectors.flush()
+
+            def concatenate_metadata() -> None:
+                with open(metadata_path, "wb") as output:
+                    for partition_path in partition_paths:
+                        with open(partition_path, "rb") as partition:
+                            shutil.copyfileobj(partition, output)
+
+            await asyncio.get_running_loop().run_in_executor(None, concatenate_metadata)
+        finally:
+            del ids, vectors
+            for partition_path in partition_paths:
+                if os.path.exists(partition_path):
+                    os.remove(partition_path)
+
+        return VersionExportResult(
+            total_count=total_count,
+            count=sum(counts),
+            dimension=dimension,
+            ids_path=ids_path,
+            vectors_path=vectors_path,
+            metadata_path=metadata_path
+        )
+
     # Search Methods
     async def search_vector(self, space_name: str, search_request: Dict) -> Optional[SearchResponse]:
         """
@@ -515,7 +1927,10 @@ class ASimpleVectorsClient:
                     print(f"Distance: {result.distance}, Label: {result.label}")
         """
         url = f"{self.base_url}/space/{space_name}/search"
-        return await self.make_request("POST", url, data=search_request, response_model=SearchResponse, error_model=SearchErrorResponse)
+        return await self._cached_read("search", space_name, None, search_request, lambda: self.make_request(
+            "POST", url, data=search_request, response_model=SearchResponse, error_model=SearchErrorResponse,
+            timeout=self.search_timeout, balance=True, hedge="search"
+        ))
 
     async def search(self, space_name: str, search_request: Dict) -> Optional[SearchResponse]:
         """
@@ -544,7 +1959,10 @@ class ASimpleVectorsClient:
                     print(f"Distance: {result.distance}, Label: {result.label}")
         """
         url = f"{self.base_url}/space/{space_name}/version/{version_id}/search"
-        return await self.make_request("POST", url, data=search_request, response_model=SearchResponse, error_model=SearchErrorResponse)
+        return await self._cached_read("search", space_name, version_id, search_request, lambda: self.make_request(
+            "POST", url, data=search_request, response_model=SearchResponse, error_model=SearchErrorResponse,
+            timeout=self.search_timeout, balance=True, hedge="search_by_version"
+        ))
 
     async def search_by_version(self, space_name: str, version_id: int, search_request: Dict) -> Optional[SearchResponse]:
         """
@@ -552,6 +1970,333 @@ class ASimpleVectorsClient:
         """
         return await self.search_vector_by_version(space_name, version_id, search_request)
         
+    async def search_many(
+        self,
+        space_name: str,
+        queries: Any,
+        top_k: Union[int, Sequence[int]],
+        version_id: Optional[int] = None,
+        search_params: Optional[Dict] = None,
+        concurrency: int = 16
+    ) -> SearchBatchResponse:
+        """
+        Searches for the nearest neighbors of many query vectors, keeping up to `concurrency`
+        requests in flight on the shared session. Results keep the order of the queries.
+
+        :param space_name: Name of the space to perform the search in.
+        :param queries: Array-like of shape (Q, D) with one query vector per row.
+        :param top_k: Number of neighbors for all queries, or a sequence with one value per query.
+        :param version_id: Optional ID of the version to search in. Defaults to the default version.
+        :param search_params: Optional additional fields sent with every search request.
+        :param concurrency: Maximum number of search requests in flight at the same time.
+        :return: SearchBatchResponse with (Q, max(top_k)) `ids` and `distances` arrays.
+        :raises ValueError: If the queries or top_k values are malformed.
+
+        Example:
+            queries = model.encode(questions).astype(np.float32)
+            results = await client.search_many("example_space", queries, top_k=10)
+            for labels, distances in zip(results.ids, results.distances):
+                print(labels[labels >= 0], distances[labels >= 0])
+        """
+        queries = np.asarray(queries)
+        if queries.ndim != 2:
+            raise ValueError(f"Invalid queries shape: {queries.shape}. Expected a 2-D (Q, D) array.")
+        queries = np.ascontiguousarray(queries, dtype=np.float32)
+        num_queries = queries.shape[0]
+
+        if isinstance(top_k, (int, np.integer)):
+            top_ks = np.full(num_queries, int(top_k), dtype=np.int64)
+        else:
+            top_ks = np.asarray(top_k, dtype=np.int64)
+            if top_ks.shape != (num_queries,):
+                raise ValueError(f"Invalid top_k shape: {top_ks.shape}. Expected ({num_queries},).")
+        if num_queries and top_ks.min() <= 0:
+            raise ValueError("top_k must be positive.")
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive.")
+
+        k = int(top_ks.max()) if num_queries else 0
+        ids = np.full((num_queries, k), -1, dtype=np.int64)
+        distances = np.full((num_queries, k), np.inf, dtype=np.float32)
+
+        if version_id is None:
+            url = f"{self.base_url}/space/{space_name}/search"
+        else:
+            url = f"{self.base_url}/space/{space_name}/version/{version_id}/search"
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def search_one(index: int) -> None:
+            search_request = dict(search_params or {})
+            search_request["vector"] = queries[index]
+            search_request["top_k"] = int(top_ks[index])
+            async with semaphore:
+                results = await self.make_request(
+                    "POST", url, data=search_request, timeout=self.search_timeout, balance=True,
+                    hedge="search" if version_id is None else "search_by_version"
+                )
+            for position, result in enumerate((results or [])[:k]):
+                ids[index, position] = result["label"]
+                distances[index, position] = result["distance"]
+
+        await asyncio.gather(*(search_one(index) for index in range(num_queries)))
+        return SearchBatchResponse(ids=ids, distances=distances)
+
+    async def search_federated(
+        self,
+        targets: Sequence[Union[str, Tuple[str, Optional[int]], SearchTarget]],
+        search_request: Dict,
+        top_k: Optional[int] = None,
+        deadline: Optional[float] = None,
+        concurrency: int = 16
+    ) -> FederatedSearchResponse:
+        """
+        Searches several spaces or versions concurrently and merges their partial top-k lists
+        into one global top-k, best first. Each result is tagged with the space and version it
+        came from. Targets that fail are reported in `failed`; targets still pending when the
+        deadline passes are cancelled and reported in `timed_out`, and the best results
+        gathered until then are returned.
+
+        :param targets: Spaces to search: a space name, a (space_name, version_id) tuple, or a
+            SearchTarget, which also sets whether higher scores are better for that space.
+        :param search_request: Dictionary containing the search query, sent to every target.
+        :param top_k: Number of results requested from every target and returned after the merge.
+            Defaults to search_request["top_k"], or all results if neither is set.
+        :param deadline: Optional number of seconds after which pending searches are abandoned.
+        :param concurrency: Maximum number of search requests in flight at the same time.
+        :return: FederatedSearchResponse with the merged results and the timed out and failed targets.
+        :raises ValueError: If no targets are given or top_k or concurrency is not positive.
+
+        Example:
+            response = await client.search_federated(
+                ["tenant_a", "tenant_b", ("tenant_c", 3)],
+                {"vector": [0.1, 0.2, 0.3], "top_k": 10},
+                deadline=0.2
+            )
+            for result in response.results:
+                print(result.space_name, result.version_id, result.label, result.distance)
+            if not response.complete:
+                print(f"Partial results: {len(response.timed_out)} timed out, {len(response.failed)} failed")
+        """
+        targets = [self._search_target(target) for target in targets]
+        if not targets:
+            raise ValueError("At least one target is required.")
+        if top_k is None:
+            top_k = search_request.get("top_k")
+        else:
+            search_request = {**search_request, "top_k": top_k}
+        if top_k is not None and top_k <= 0:
+            raise ValueError("top_k must be positive.")
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive.")
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def search_one(target: SearchTarget) -> List[SearchResponse]:
+            async with semaphore:
+                if target.version_id is None:
+                    results = await self.search_vector(target.space_name, search_request)
+                else:
+                    results = await self.search_vector_by_version(target.space_name, target.version_id, search_request)
+            return results or []
+
+        tasks = [asyncio.ensure_future(search_one(target)) for target in targets]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=deadline)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        response = FederatedSearchResponse()
+        partials = []
+        for target, task in zip(targets, tasks):
+            if task not in done:
+                response.timed_out.append(target)
+            elif task.exception() is not None:
+                response.failed.append(SearchTargetError(target=target, error=str(task.exception())))
+            else:
+                sign = -1.0 if target.higher_is_better else 1.0
+                # Sort keys are "smaller is better" for every target, so lists of spaces with
+                # opposite metric directions can be merged.
+                partials.append(sorted(
+                    ((sign * result.distance, result.label, result.distance, target) for result in task.result()),
+                    key=lambda entry: entry[0]
+                ))
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning(f"Federated search returned after the deadline with {len(pending)} of {len(targets)} targets pending.")
+        if response.failed and len(response.failed) == len(targets):
+            raise tasks[0].exception()
+
+        merged = heapq.merge(*partials, key=lambda entry: entry[0])
+        response.results = [
+            FederatedSearchResult(space_name=target.space_name, version_id=target.version_id, label=label, distance=distance)
+            for _, label, distance, target in islice(merged, top_k)
+        ]
+        return response
+
+    @staticmethod
+    def _search_target(target: Union[str, Tuple[str, Optional[int]], SearchTarget]) -> SearchTarget:
+        """
+        Normalize a search target given as a space name, a (space_name, version_id) tuple or a SearchTarget.
+        """
+        if isinstance(target, SearchTarget):
+            return target
+        if isinstance(target, str):
+            return SearchTarget(space_name=target)
+        space_name, version_id = target
+        return SearchTarget(space_name=space_name, version_id=version_id)
+
+    async def search_mmr(
+        self,
+        space_name: str,
+        vector: Any,
+        top_k: int = 10,
+        fetch_k: Optional[int] = None,
+        lambda_mult: float = DEFAULT_MMR_LAMBDA,
+        metric: str = "cosine",
+        version_id: Optional[int] = None,
+        search_params: Optional[Dict] = None,
+        fetch_vectors: Optional[Callable[[np.ndarray], Awaitable[Any]]] = None,
+        page_size: int = 5000,
+        max_scan: Optional[int] = DEFAULT_MMR_MAX_SCAN
+    ) -> List[MMRSearchResult]:
+        """
+        Searches `fetch_k` candidates, re-scores them exactly against the query and selects
+        `top_k` of them with maximal marginal relevance, trading relevance to the query for
+        diversity among the selected results.
+
+        The server has no lookup of vectors by ID, so candidate vectors missing from the vector
+        cache are found by scanning the version page by page until all of them were seen, reading
+        at most `max_scan` vectors; only the candidates are cached. The scan costs O(version size)
+        in the worst case, so for large versions pass `fetch_vectors` to load the candidates from
+        another store instead.
+
+        :param space_name: Name of the space to search in.
+        :param vector: Query vector.
+        :param top_k: Number of results selected.
+        :param fetch_k: Number of candidates searched (default: 4 * top_k).
+        :param lambda_mult: Trade-off between relevance (1.0) and diversity (0.0).
+        :param metric: Similarity used for re-scoring and diversity: "cosine", "ip" or "l2".
+        :param version_id: Optional ID of the version to search in. Defaults to the default version.
+        :param search_params: Optional additional fields sent with the search request.
+        :param fetch_vectors: Optional coroutine function returning the (n, d) vectors of an (n,) array of IDs.
+        :param page_size: Number of vectors requested per page when scanning the version.
+        :param max_scan: Maximum number of vectors scanned for the candidates, or None for no limit.
+        :return: List of MMRSearchResult objects in selection order.
+        :raises ValueError: If the arguments are invalid or the candidate vectors do not match the query.
+        :raises VectorScanLimitError: If candidates are still missing after scanning `max_scan` vectors.
+
+        Example:
+            results = await client.search_mmr("example_space", query_vector, top_k=5, fetch_k=40, lambda_mult=0.7)
+            for result in results:
+                print(f"Label: {result.label}, Similarity: {result.similarity}, MMR: {result.score}")
+        """
+        if top_k <= 0:
+            raise ValueError("top_k must be positive.")
+        fetch_k = fetch_k if fetch_k is not None else 4 * top_k
+        if fetch_k < top_k:
+            raise ValueError("fetch_k must be at least top_k.")
+        if max_scan is not None and max_scan <= 0:
+            raise ValueError("max_scan must be positive.")
+        query = np.asarray(vector, dtype=np.float32)
+        if query.ndim != 1:
+            raise ValueError(f"Invalid query shape: {query.shape}. Expected a 1-D vector.")
+
+        search_request = {**(search_params or {}), "vector": query, "top_k": fetch_k}
+        if version_id is None:
+            candidates = await self.search_vector(space_name, search_request)
+        else:
+            candidates = await self.search_vector_by_version(space_name, version_id, search_request)
+        if not candidates:
+            return []
+        labels = np.fromiter((result.label for result in candidates), dtype=np.int64, count=len(candidates))
+        distances = np.fromiter((result.distance for result in candidates), dtype=np.float64, count=len(candidates))
+
+        if fetch_vectors is not None:
+            matrix = np.asarray(await fetch_vectors(labels), dtype=np.float32)
+            found = np.ones(len(labels), dtype=bool)
+        else:
+            matrix, found = await self._fetch_candidate_vectors(space_name, version_id, labels, page_size, max_scan)
+        if not found.all():
+            logger.warning(f"search_mmr found no vectors for {int((~found).sum())} candidates of space '{space_name}'.")
+            labels, distances, matrix = labels[found], distances[found], matrix[found]
+        if matrix.ndim != 2 or len(matrix) != len(labels) or (len(matrix) and matrix.shape[1] != len(query)):
+            raise ValueError(f"Invalid candidate vectors shape: {matrix.shape}. Expected ({len(labels)}, {len(query)}).")
+        if not len(labels):
+            return []
+
+        # One matrix product scores the query and all candidate pairs; the greedy selection is O(top_k * n).
+        similarities = similarity_matrix(np.vstack([query, matrix]), matrix, metric)
+        relevance, pairwise = similarities[0], similarities[1:]
+        selected, scores = maximal_marginal_relevance(relevance, pairwise, top_k, lambda_mult)
+        return [
+            MMRSearchResult(label=int(labels[index]), distance=float(distances[index]), similarity=float(relevance[index]), score=float(score))
+            for index, score in zip(selected, scores)
+        ]
+
+    async def _fetch_candidate_vectors(
+        self,
+        space_name: str,
+        version_id: Optional[int],
+        ids: np.ndarray,
+        page_size: int,
+        max_scan: Optional[int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectors of `ids` from the vector cache, scanning up to `max_scan` vectors of the version
+        for the missing ones. Returns the (n, d) matrix and a mask of the IDs that were found.
+        """
+        if version_id is None:
+            version = await self.get_default_version(space_name)
+            if version is None:
+                raise ValueError(f"Cannot determine the default version of space '{space_name}'.")
+            version_id = version.id
+
+        cache = self.vector_cache
+        rows: Dict[int, np.ndarray] = {}
+        if cache is not None:
+            for vector_id in ids.tolist():
+                row = cache.get(("vector", space_name, version_id, vector_id))
+                if row is not None:
+                    rows[vector_id] = row
+
+        missing = set(ids.tolist()) - rows.keys()
+        if missing:
+            generation = cache.generation(space_name) if cache is not None else None
+            total_count = 0
+            pages = self.iter_vectors_by_version(
+                space_name, version_id, page_size=page_size, as_numpy=True, limit=max_scan
+            )
+            try:
+                async for page in pages:
+                    total_count = page.total_count
+                    hits = np.isin(page.ids, np.fromiter(missing, dtype=np.int64, count=len(missing)))
+                    for position in np.flatnonzero(hits).tolist():
+                        vector_id = int(page.ids[position])
+                        # Copy the row so the cache does not keep the whole page alive.
+                        rows[vector_id] = page.vectors[position].copy()
+                        missing.discard(vector_id)
+                        if cache is not None:
+                            cache.put(("vector", space_name, version_id, vector_id), space_name, rows[vector_id], generation)
+                    if not missing:
+                        break
+            finally:
+                await pages.aclose()
+            if missing and max_scan is not None and total_count > max_scan:
+                raise VectorScanLimitError(
+                    f"{len(missing)} of {len(ids)} candidates were not among the first {max_scan} vectors of "
+                    f"space '{space_name}' version {version_id}; pass fetch_vectors or a larger max_scan."
+                )
+
+        found = np.fromiter((vector_id in rows for vector_id in ids.tolist()), dtype=bool, count=len(ids))
+        if not found.any():
+            return np.empty((len(ids), 0), dtype=np.float32), found
+        dimension = len(next(iter(rows.values())))
+        matrix = np.zeros((len(ids), dimension), dtype=np.float32)
+        for index in np.flatnonzero(found).tolist():
+            matrix[index] = rows[int(ids[index])]
+        return matrix, found
+
     async def rerank(self, space_name: str, rerank_request: Dict) -> Optional[List[RerankResponse]]:
         """
         Performs reranking on search results using BM25 for a given space.
@@ -571,12 +2316,15 @@ class ASimpleVectorsClient:
                     print(f"Vector ID: {result.vectorUniqueId}, Distance: {result.distance}, BM25 Score: {result.bm25Score}")
         """
         url = f"{self.base_url}/space/{space_name}/rerank"
-        return await self.make_request(
+        return await self._cached_read("rerank", space_name, None, rerank_request, lambda: self.make_request(
             method="POST",
             url=url,
             data=rerank_request,
-            response_model=RerankResponse
-        )
+            response_model=RerankResponse,
+            timeout=self.search_timeout,
+            balance=True,
+            hedge="rerank"
+        ))
 
     async def rerank_with_version(self, space_name: str, version_id: int, rerank_request: Dict) -> Optional[List[RerankResponse]]:
         """
@@ -598,13 +2346,121 @@ class ASimpleVectorsClient:
                     print(f"Vector ID: {result.vectorUniqueId}, Distance: {result.distance}, BM25 Score: {result.bm25Score}")
         """
         url = f"{self.base_url}/space/{space_name}/version/{version_id}/rerank"
-        return await self.make_request(
+        return await self._cached_read("rerank", space_name, version_id, rerank_request, lambda: self.make_request(
             "POST", 
             url, 
             data=rerank_request, 
             response_model=RerankResponse,
-            error_model=RerankErrorResponse
-        )
+            error_model=RerankErrorResponse,
+            timeout=self.search_timeout,
+            balance=True,
+            hedge="rerank_by_version"
+        ))
+
+    async def hybrid_search(
+        self,
+        space_name: str,
+        vector: Any,
+        tokens: List[str],
+        top_k: int = 10,
+        version_id: Optional[int] = None,
+        method: str = "rrf",
+        dense_weight: float = 0.5,
+        rrf_k: float = DEFAULT_RRF_K,
+        candidates: Optional[int] = None,
+        search_params: Optional[Dict] = None,
+        higher_is_better: bool = False
+    ) -> List[HybridSearchResult]:
+        """
+        Runs a dense search and a BM25 rerank of the same query concurrently and fuses both
+        rankings into one list, best first.
+
+        Methods:
+            - "rrf": reciprocal-rank fusion, dense_weight / (rrf_k + dense rank) plus
+              (1 - dense_weight) / (rrf_k + BM25 rank). Robust to the different score scales.
+            - "weighted": dense_weight times the min-max normalized dense score plus
+              (1 - dense_weight) times the min-max normalized BM25 score.
+
+        :param space_name: Name of the space to search in.
+        :param vector: Query vector.
+        :param tokens: Query tokens for BM25 scoring.
+        :param top_k: Number of fused results returned.
+        :param version_id: Optional ID of the version to search in. Defaults to the default version.
+        :param method: Fusion method, "rrf" or "weighted".
+        :param dense_weight: Weight of the dense ranking in [0, 1]; BM25 gets 1 - dense_weight.
+        :param rrf_k: Rank offset of reciprocal-rank fusion.
+        :param candidates: Number of results requested from each side (default: 2 * top_k).
+        :param search_params: Optional additional fields sent with both requests.
+        :param higher_is_better: True if the space scores similarity instead of distance, so that
+            higher dense "distance" values rank first.
+        :return: List of HybridSearchResult objects sorted by fused score.
+        :raises ValueError: If the method, weights or sizes are invalid.
+
+        Example:
+            results = await client.hybrid_search(
+                "example_space", [0.25, 0.45, 0.75, 0.85], ["test", "vectors"], top_k=10
+            )
+            for result in results:
+                print(f"Vector ID: {result.id}, Score: {result.score}, Distance: {result.distance}, BM25: {result.bm25Score}")
+        """
+        if method not in ("rrf", "weighted"):
+            raise ValueError(f"Invalid fusion method: {method}. Expected 'rrf' or 'weighted'.")
+        if not 0 <= dense_weight <= 1:
+            raise ValueError("dense_weight must be in [0, 1].")
+        if top_k <= 0:
+            raise ValueError("top_k must be positive.")
+        candidates = candidates if candidates is not None else 2 * top_k
+        if candidates < top_k:
+            raise ValueError("candidates must be at least top_k.")
+
+        search_request = {**(search_params or {}), "vector": vector, "top_k": candidates}
+        rerank_request = {**search_request, "tokens": tokens}
+        if version_id is None:
+            dense, sparse = await asyncio.gather(
+                self.search_vector(space_name, search_request),
+                self.rerank(space_name, rerank_request)
+            )
+        else:
+            dense, sparse = await asyncio.gather(
+                self.search_vector_by_version(space_name, version_id, search_request),
+                self.rerank_with_version(space_name, version_id, rerank_request)
+            )
+        dense, sparse = dense or [], sparse or []
+
+        dense_ids = np.fromiter((result.label for result in dense), dtype=np.int64, count=len(dense))
+        dense_distances = np.fromiter((result.distance for result in dense), dtype=np.float64, count=len(dense))
+        sparse_ids = np.fromiter((result.vectorUniqueId for result in sparse), dtype=np.int64, count=len(sparse))
+        sparse_distances = np.fromiter((result.distance for result in sparse), dtype=np.float64, count=len(sparse))
+        bm25_scores = np.fromiter((result.bm25Score for result in sparse), dtype=np.float64, count=len(sparse))
+
+        # Rank both sides by their own score, higher is better: dense by distance or similarity,
+        # sparse by BM25 score.
+        dense_scores = dense_distances if higher_is_better else -dense_distances
+        dense_order = np.argsort(-dense_scores, kind="stable")
+        dense_ids, dense_distances, dense_scores = dense_ids[dense_order], dense_distances[dense_order], dense_scores[dense_order]
+        sparse_order = np.argsort(-bm25_scores, kind="stable")
+        sparse_ids, sparse_distances, bm25_scores = sparse_ids[sparse_order], sparse_distances[sparse_order], bm25_scores[sparse_order]
+
+        weights = (dense_weight, 1.0 - dense_weight)
+        if method == "rrf":
+            ids, scores = reciprocal_rank_fusion((dense_ids, sparse_ids), weights, k=rrf_k)
+        else:
+            ids, scores = weighted_score_fusion((dense_ids, sparse_ids), (dense_scores, bm25_scores), weights)
+        ids, scores = ids[:top_k], scores[:top_k]
+
+        distances = lookup(dense_ids, dense_distances, ids)
+        missing = np.isnan(distances)
+        distances[missing] = lookup(sparse_ids, sparse_distances, ids[missing])
+        bm25 = lookup(sparse_ids, bm25_scores, ids)
+        return [
+            HybridSearchResult(
+                id=int(vector_id),
+                score=float(score),
+                distance=None if np.isnan(distance) else float(distance),
+                bm25Score=None if np.isnan(bm25_score) else float(bm25_score)
+            )
+            for vector_id, score, distance, bm25_score in zip(ids, scores, distances, bm25)
+        ]
 
     # Snapshot Methods
     async def create_snapshot(self, snapshot_request: Dict) -> None:
@@ -649,8 +2505,7 @@ class ASimpleVectorsClient:
         """
         url = f"{self.base_url}/snapshot/{snapshot_date}/delete"
         try:
-            response = await self.session.delete(url)
-            response.raise_for_status()
+            await self._send("DELETE", url)
             print(f"Snapshot with date {snapshot_date} deleted successfully.")
         except httpx.HTTPStatusError as e:
             print(f"HTTP Error while deleting snapshot: {str(e)}")
@@ -659,33 +2514,244 @@ class ASimpleVectorsClient:
             print(f"An error occurred while deleting snapshot: {e}")
             raise
 
-    async def download_snapshot(self, snapshot_date: str, download_folder: str) -> str:
+    async def download_snapshot(
+        self,
+        snapshot_date: str,
+        download_folder: str,
+        resume: bool = True,
+        parallel: int = 1,
+        chunk_size: int = DEFAULT_SNAPSHOT_CHUNK_SIZE,
+        expected_size: Optional[int] = None,
+        checksum: Optional[str] = None,
+        checksum_algorithm: str = "sha256",
+        progress: Optional[Callable[[int, Optional[int]], None]] = None
+    ) -> str:
         """
         Downloads a snapshot to the specified folder.
 
+        Data is written to a ".part" file off the event loop and renamed once complete. If the
+        server supports HTTP Range requests, an interrupted download resumes from the partial
+        file, and `parallel` > 1 fetches that many byte ranges concurrently. Servers without
+        Range support fall back to a single full download. Each request goes through the retry
+        policy and circuit breaker of the client; a transfer that breaks off mid-body is not
+        retried but resumes on the next call.
+
         :param snapshot_date: Date string extracted from the snapshot filename.
         :param download_folder: Folder path where the snapshot will be downloaded.
+        :param resume: Resume from a partial file left by a previous attempt.
+        :param parallel: Number of byte ranges fetched concurrently.
+        :param chunk_size: Number of bytes written to disk per chunk.
+        :param expected_size: Optional expected file size in bytes.
+        :param checksum: Optional expected hex digest of the file.
+        :param checksum_algorithm: hashlib algorithm of `checksum` (default: "sha256").
+        :param progress: Optional callback called with (bytes downloaded, total size or None).
         :return: Full path of the downloaded snapshot file.
+        :raises SnapshotIntegrityError: If the size or checksum of the downloaded file does not match.
         :raises Exception: For failures during snapshot download.
 
         Example:
             snapshot_path = await client.download_snapshot("202311161122", "./temp")
+            snapshot_path = await client.download_snapshot(
+                "202311161122", "./temp", parallel=4, checksum="9f86d08...", checksum_algorithm="sha256"
+            )
         """
+        if parallel <= 0:
+            raise ValueError("parallel must be positive.")
         url = f"{self.base_url}/snapshot/{snapshot_date}/download"
-        
+
         # Ensure the download folder exists
         os.makedirs(download_folder, exist_ok=True)
 
         file_path = os.path.join(download_folder, f"snapshot-{snapshot_date}.zip")
-        async with self.session.stream("GET", url) as response:
-            response.raise_for_status()
-            with open(file_path, "wb") as file:
-                async for chunk in response.aiter_bytes():
-                    file.write(chunk)
+        part_path = f"{file_path}.part"
+        state_path = f"{part_path}.json"
+        if not resume:
+            for path in (part_path, state_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        total_size = None
+        if parallel > 1 or os.path.exists(state_path):
+            total_size = await self._probe_range_support(url)
+        if total_size is not None:
+            await self._download_ranges(url, part_path, state_path, total_size, parallel, chunk_size, progress)
+        else:
+            if os.path.exists(state_path):
+                # Ranges are no longer supported; a partially filled file cannot be resumed.
+                os.remove(state_path)
+                os.remove(part_path)
+            total_size = await self._download_sequential(url, part_path, chunk_size, progress)
+
+        await self._verify_snapshot(part_path, total_size, expected_size, checksum, checksum_algorithm, chunk_size)
+        os.replace(part_path, file_path)
 
         print(f"Snapshot downloaded to {file_path}")
         return file_path
 
+    async def _probe_range_support(self, url: str) -> Optional[int]:
+        """
+        Requests the first byte of a file to check for Range support.
+
+        :return: Total file size if the server answers with a partial response, otherwise None.
+        """
+        async with self._stream("GET", url, headers={"Range": "bytes=0-0"}, timeout=self.snapshot_timeout) as response:
+            if response.status_code != 206:
+                return None
+            # An empty file has no byte ranges to split.
+            return _content_range_total(response) or None
+
+    async def _download_sequential(
+        self,
+        url: str,
+        part_path: str,
+        chunk_size: int,
+        progress: Optional[Callable[[int, Optional[int]], None]]
+    ) -> Optional[int]:
+        """
+        Streams a file into `part_path`, continuing after its current size when the server honours Range.
+
+        :return: Total file size if announced by the server, otherwise None.
+        """
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            async with self._stream("GET", url, headers=headers, timeout=self.snapshot_timeout) as response:
+                if response.status_code == 206:
+                    total_size = _content_range_total(response)
+                else:
+                    offset = 0
+                    content_length = response.headers.get("Content-Length")
+                    total_size = int(content_length) if content_length else None
+
+                downloaded = offset
+                async with aiofiles.open(part_path, "ab" if offset else "wb") as file:
+                    async for chunk in response.aiter_bytes(chunk_size):
+                        await file.write(chunk)
+                        downloaded += len(chunk)
+                        if progress:
+                            progress(downloaded, total_size)
+        except httpx.HTTPStatusError as e:
+            if offset and e.response.status_code == 416:
+                # The partial file already holds the whole snapshot.
+                return offset
+            raise
+        return total_size
+
+    async def _download_ranges(
+        self,
+        url: str,
+        part_path: str,
+        state_path: str,
+        total_size: int,
+        parallel: int,
+        chunk_size: int,
+        progress: Optional[Callable[[int, Optional[int]], None]]
+    ) -> None:
+        """
+        Fetches byte ranges concurrently into a preallocated `part_path`. Progress of every range is
+        kept in `state_path` so that an interrupted download resumes where each range stopped.
+        A partial response shorter than requested is continued with another request.
+
+        :raises SnapshotIntegrityError: If a range could not be completed; the state is kept for resuming.
+        """
+        ranges = None
+        if os.path.exists(state_path) and os.path.exists(part_path):
+            async with aiofiles.open(state_path, "r") as f:
+                state = json.loads(await f.read())
+            if state.get("size") == total_size:
+                ranges = state["ranges"]
+        if ranges is None:
+            range_size = -(-total_size // parallel)
+            ranges = [
+                [start, min(start + range_size, total_size) - 1, 0]
+                for start in range(0, total_size, range_size)
+            ]
+            async with aiofiles.open(part_path, "wb") as f:
+                await f.truncate(total_size)
+
+        downloaded = sum(done for _, _, done in ranges)
+
+        async def fetch_range(byte_range: List[int]) -> None:
+            nonlocal downloaded
+            start, end, _ = byte_range
+            while start + byte_range[2] <= end:
+                offset = start + byte_range[2]
+                headers = {"Range": f"bytes={offset}-{end}"}
+                async with self._stream("GET", url, headers=headers, timeout=self.snapshot_timeout) as response:
+                    if response.status_code != 206:
+                        raise httpx.HTTPError(f"Server ignored the Range request for bytes {offset}-{end}.")
+                    bounds = _content_range_bounds(response)
+                    if bounds is None or bounds[0] != offset or not offset <= bounds[1] <= end:
+                        raise httpx.HTTPError(
+                            f"Server answered the Range request for bytes {offset}-{end} with "
+                            f"Content-Range {response.headers.get('Content-Range')!r}."
+                        )
+                    received = 0
+                    async with aiofiles.open(part_path, "r+b") as file:
+                        await file.seek(offset)
+                        async for chunk in response.aiter_bytes(chunk_size):
+                            chunk = chunk[:bounds[1] + 1 - offset - received]
+                            await file.write(chunk)
+                            received += len(chunk)
+                            byte_range[2] += len(chunk)
+                            downloaded += len(chunk)
+                            if progress:
+                                progress(downloaded, total_size)
+                if not received:
+                    # No progress; the range is reported as incomplete below.
+                    return
+
+        tasks = [asyncio.ensure_future(fetch_range(byte_range)) for byte_range in ranges]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # Stop the other ranges before recording how far each one got.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if any(start + done <= end for start, end, done in ranges):
+                async with aiofiles.open(state_path, "w") as f:
+                    await f.write(json.dumps({"size": total_size, "ranges": ranges}))
+        # The file was preallocated, so only the ranges tell whether every byte arrived.
+        missing = sum(end + 1 - start - done for start, end, done in ranges)
+        if missing:
+            raise SnapshotIntegrityError(
+                f"Ranged download is missing {missing} of {total_size} bytes; call download_snapshot again to resume."
+            )
+        if os.path.exists(state_path):
+            os.remove(state_path)
+
+    async def _verify_snapshot(
+        self,
+        part_path: str,
+        total_size: Optional[int],
+        expected_size: Optional[int],
+        checksum: Optional[str],
+        checksum_algorithm: str,
+        chunk_size: int
+    ) -> None:
+        """
+        Checks the size and optional checksum of a downloaded file, removing it if it is corrupt.
+        A ranged download is preallocated to its full size, so its completeness is checked by
+        `_download_ranges` instead of by the size here.
+
+        :raises SnapshotIntegrityError: If the size or checksum does not match.
+        """
+        size = os.path.getsize(part_path)
+        for expected in (total_size, expected_size):
+            if expected is not None and size != expected:
+                os.remove(part_path)
+                raise SnapshotIntegrityError(f"Snapshot size {size} does not match expected size {expected}.")
+
+        if checksum:
+            loop = asyncio.get_running_loop()
+            digest = await loop.run_in_executor(None, _file_digest, part_path, checksum_algorithm, chunk_size)
+            if digest.lower() != checksum.lower():
+                os.remove(part_path)
+                raise SnapshotIntegrityError(
+                    f"Snapshot {checksum_algorithm} checksum {digest} does not match expected {checksum}."
+                )
+
     async def restore_snapshot(self, snapshot_date: str) -> None:
         """
         Restores a snapshot by its date.
@@ -697,45 +2763,73 @@ class ASimpleVectorsClient:
             await client.restore_snapshot("202311161122")
         """
         url = f"{self.base_url}/snapshot/{snapshot_date}/restore"
-        await self.make_request("POST", url, data={})
+        try:
+            await self.make_request("POST", url, data={})
+        finally:
+            self._invalidate_cache()
         print(f"Snapshot from date {snapshot_date} restored successfully.")
 
-    async def upload_restore_snapshot(self, file_path: str) -> None:
+    async def upload_restore_snapshot(
+        self,
+        file_path: str,
+        chunk_size: int = DEFAULT_SNAPSHOT_CHUNK_SIZE,
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> None:
         """
         Uploads a snapshot file and restores it on the server.
 
+        The file is streamed as a multipart body in chunks over the shared session, so memory
+        usage does not depend on the snapshot size.
+
         :param file_path: The full path to the snapshot file to upload.
+        :param chunk_size: Number of bytes read from the file per chunk.
+        :param progress: Optional callback called with (bytes sent, file size) after each chunk.
         :raises Exception: For failures during snapshot upload and restoration.
 
         Example:
-            await client.upload_restore_snapshot("./temp/snapshot-202311161122.zip")
+            await client.upload_restore_snapshot(
+                "./temp/snapshot-202311161122.zip",
+                progress=lambda sent, total: print(f"{sent * 100 // total}% uploaded")
+            )
         """
         url = f"{self.base_url}/snapshots/restore"
         print(f"Uploading file: {file_path}")
         print(f"POST URL: {url}")
 
         try:
-            # Prepare the multipart data using MultipartEncoder
-            async with aiofiles.open(file_path, 'rb') as f:
-                file_data = await f.read()
-
-            encoder = MultipartEncoder(
-                fields={
-                    "file": (file_path.split('/')[-1], file_data, "application/zip"),
-                }
+            file_name = os.path.basename(file_path).replace('"', '%22')
+            file_size = os.path.getsize(file_path)
+            boundary = uuid.uuid4().hex
+            preamble = (
+                f"--{boundary}\r\n"
+                f'Content-Disposition: form-data; name="file"; filename="{file_name}"\r\n'
+                f"Content-Type: application/zip\r\n\r\n"
+            ).encode("utf-8")
+            epilogue = f"\r\n--{boundary}--\r\n".encode("utf-8")
+
+            async def stream_body() -> AsyncIterator[bytes]:
+                yield preamble
+                sent = 0
+                async with aiofiles.open(file_path, 'rb') as f:
+                    while True:
+                        chunk = await f.read(chunk_size)
+                        if not chunk:
+                            break
+                        sent += len(chunk)
+                        yield chunk
+                        if progress:
+                            progress(sent, file_size)
+                yield epilogue
+
+            headers = {
+                "Content-Type": f"multipart/form-data; boundary={boundary}",
+                "Content-Length": str(len(preamble) + file_size + len(epilogue)),
+            }
+            response = await self._send(
+                "POST", url, content=stream_body(), headers=headers, timeout=self.snapshot_timeout
             )
-            headers = self.session.headers.copy()
-            headers["Content-Type"] = encoder.content_type
-
-            # Use httpx to send the request
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url,
-                    headers=headers,
-                    content=encoder.to_string(),  # Serialize the multipart data
-                )
-                response.raise_for_status()
-                print(f"Snapshot restored successfully: {response.json()}")
+            print(f"Snapshot restored successfully: {response.text}")
+            self._invalidate_cache()
 
         except httpx.HTTPStatusError as e:
             print(f"HTTP Error: {str(e)}")
@@ -802,8 +2896,7 @@ class ASimpleVectorsClient:
         """
         url = f"{self.base_url}/security/tokens/{token}"
         try:
-            response = await self.session.delete(url)
-            response.raise_for_status()
+            await self._send("DELETE", url)
         except httpx.HTTPStatusError as e:
             print(f"HTTP Error while deleting RBAC token: {str(e)}")
             raise e
@@ -835,8 +2928,7 @@ class ASimpleVectorsClient:
         """
         url = f"{self.base_url}/security/tokens/{token}"
         try:
-            response = await self.session.put(url, json=rbac_request)
-            response.raise_for_status()
+            await self._send("PUT", url, data=rbac_request)
         except httpx.HTTPStatusError as e:
             print(f"HTTP Error while updating RBAC token: {str(e)}")
             raise e
@@ -892,15 +2984,18 @@ class ASimpleVectorsClient:
                 print(f"Failed to retrieve key-value pair: {e}")
         """
         url = f"{self.base_url}/space/{space_name}/key/{key}"
-        try:
-            response = await self.session.get(url)
-            response.raise_for_status()
-            return response.text
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code in {400, 404}:
-                raise KeyNotFoundError(f"Key '{key}' not found in space '{space_name}'.") from e
-            else:
-                raise
+
+        async def fetch() -> str:
+            try:
+                response = await self._send("GET", url, balance=True)
+                return response.text
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code in {400, 404}:
+                    raise KeyNotFoundError(f"Key '{key}' not found in space '{space_name}'.") from e
+                else:
+                    raise
+
+        return await self._cached_read("get_key_value", space_name, None, {"key": key}, fetch, cache=False)
 
     async def list_keys(self, space_name: str, start: Optional[int] = 0, limit: Optional[int] = 100) -> Optional[ListKeysResponse]:
         """
@@ -945,8 +3040,7 @@ class ASimpleVectorsClient:
         """
         url = f"{self.base_url}/space/{space_name}/key/{key}"
         try:
-            response = await self.session.delete(url)
-            response.raise_for_status()
+            await self._send("DELETE", url)
             print(f"Key '{key}' deleted successfully.")
         except httpx.HTTPStatusError as e:
             if e.response.status_code in {400, 404}:
@@ -956,3 +3050,8 @@ class ASimpleVectorsClient:
 
     async def close(self) -> None:
         await self.session.aclose()
+        if self.topology is not None:
+            for node in self.topology.all_nodes():
+                if node.session is not None:
+                    await node.session.aclose()
+                    node.session = None
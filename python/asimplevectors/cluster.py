@@ -0,0 +1,202 @@
+"""
+Cluster topology tracking for the asimpleVectors Python client.
+"""
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from .models import ClusterMetricsResponse
+
+DEFAULT_TOPOLOGY_REFRESH_INTERVAL = 30.0
+DEFAULT_EWMA_ALPHA = 0.3
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_EJECTION_TIME = 10.0
+DEFAULT_SLOW_FACTOR = 4.0
+DEFAULT_SLOW_MIN_DELTA = 0.05
+
+
+class ClusterNode:
+    """
+    A node of the cluster, addressed by its API address ("host:port"), with the request
+    statistics used for load balancing.
+
+    :param address: The "host:port" API address of the node.
+    :param scheme: "http" or "https".
+    :param node_id: The raft node ID, if known.
+    """
+    def __init__(self, address: str, scheme: str, node_id: Optional[int] = None):
+        self.address = address
+        self.node_id = node_id
+        self.base_url = f"{scheme}://{address}/api"
+        self.cluster_url = f"{scheme}://{address}/cluster"
+        # Per-node connection pool, created by the client on first use.
+        self.session: Optional[Any] = None
+        self.ewma_latency: Optional[float] = None
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+    def is_available(self, now: Optional[float] = None) -> bool:
+        """
+        Whether the node is not currently ejected.
+        """
+        return self.ejected_until <= (time.monotonic() if now is None else now)
+
+    def __repr__(self) -> str:
+        return f"ClusterNode(address={self.address!r}, node_id={self.node_id})"
+
+
+class ClusterTopology:
+    """
+    Known nodes and current leader of a cluster, built from seed addresses and refreshed from
+    the `/cluster/metrics` endpoint.
+
+    :param seeds: "host:port" API addresses used to discover the cluster.
+    :param scheme: "http" or "https".
+    :param refresh_interval: Seconds after which the topology is considered stale.
+    """
+    def __init__(self, seeds: List[str], scheme: str, refresh_interval: float = DEFAULT_TOPOLOGY_REFRESH_INTERVAL):
+        if not seeds:
+            raise ValueError("At least one seed node is required.")
+        self.scheme = scheme
+        self.refresh_interval = refresh_interval
+        self.nodes: Dict[str, ClusterNode] = {address: ClusterNode(address, scheme) for address in seeds}
+        self.seeds = list(self.nodes.values())
+        self.leader: Optional[ClusterNode] = None
+        self.updated_at: Optional[float] = None
+
+    def is_stale(self) -> bool:
+        """
+        Whether the topology was never discovered or is older than `refresh_interval`.
+        """
+        return self.updated_at is None or time.monotonic() - self.updated_at > self.refresh_interval
+
+    def candidates(self) -> List[ClusterNode]:
+        """
+        Nodes to ask for metrics, the last known leader first, then known members, then seeds.
+        """
+        ordered = [self.leader] if self.leader else []
+        ordered += [node for node in self.nodes.values() if node is not self.leader]
+        ordered += [node for node in self.seeds if node.address not in self.nodes]
+        return ordered
+
+    def all_nodes(self) -> List[ClusterNode]:
+        """
+        Current members plus seeds that are not members.
+        """
+        return list(self.nodes.values()) + [node for node in self.seeds if node.address not in self.nodes]
+
+    def update(self, metrics: ClusterMetricsResponse) -> None:
+        """
+        Replace members and leader from the metrics reported by any node of the cluster.
+        """
+        members = metrics.membership_config.membership.get("nodes") or {}
+        nodes: Dict[str, ClusterNode] = {}
+        for node_id, node_info in members.items():
+            address = node_info.get("api_addr") if isinstance(node_info, dict) else None
+            if not address:
+                continue
+            node = self.nodes.get(address) or ClusterNode(address, self.scheme)
+            node.node_id = int(node_id)
+            nodes[address] = node
+        if nodes:
+            self.nodes = nodes
+
+        self.leader = None
+        if metrics.current_leader is not None:
+            for node in self.nodes.values():
+                if node.node_id == metrics.current_leader:
+                    self.leader = node
+                    break
+        self.updated_at = time.monotonic()
+
+    def mark_stale(self) -> None:
+        """
+        Force a refresh before the next routed request.
+        """
+        self.updated_at = None
+
+
+class ReadBalancer:
+    """
+    Picks nodes for read requests with the "power of two choices" rule: of two random available
+    nodes, the one with the lower EWMA latency times outstanding requests wins. Nodes are ejected
+    for `ejection_time` seconds after `failure_threshold` consecutive failures, or when their
+    latency exceeds `slow_factor` times (and `slow_min_delta` seconds more than) the fastest node.
+
+    :param ewma_alpha: Weight of the newest latency sample in the moving average.
+    :param failure_threshold: Consecutive failures after which a node is ejected.
+    :param ejection_time: Seconds an ejected node is skipped.
+    :param slow_factor: Latency ratio to the fastest node above which a node is ejected.
+    :param slow_min_delta: Minimum latency difference in seconds for slow-node ejection.
+    """
+    def __init__(
+        self,
+        ewma_alpha: float = DEFAULT_EWMA_ALPHA,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        ejection_time: float = DEFAULT_EJECTION_TIME,
+        slow_factor: float = DEFAULT_SLOW_FACTOR,
+        slow_min_delta: float = DEFAULT_SLOW_MIN_DELTA
+    ):
+        self.ewma_alpha = ewma_alpha
+        self.failure_threshold = failure_threshold
+        self.ejection_time = ejection_time
+        self.slow_factor = slow_factor
+        self.slow_min_delta = slow_min_delta
+
+    @staticmethod
+    def _score(node: ClusterNode) -> float:
+        # Nodes without samples score 0 so that they are probed first.
+        return (node.ewma_latency or 0.0) * (node.outstanding + 1)
+
+    def pick(self, nodes: Iterable[ClusterNode], exclude: Iterable[ClusterNode] = ()) -> Optional[ClusterNode]:
+        """
+        Choose a node for a read request, skipping ejected and excluded nodes. If every node is
+        ejected, the one whose ejection ends first is used.
+        """
+        excluded = {id(node) for node in exclude}
+        candidates = [node for node in nodes if id(node) not in excluded]
+        if not candidates:
+            return None
+        now = time.monotonic()
+        available = [node for node in candidates if node.is_available(now)]
+        if not available:
+            return min(candidates, key=lambda node: node.ejected_until)
+        if len(available) == 1:
+            return available[0]
+        first, second = random.sample(available, 2)
+        return first if self._score(first) <= self._score(second) else second
+
+    def on_success(self, node: ClusterNode, latency: float, nodes: Iterable[ClusterNode]) -> None:
+        """
+        Record a successful request and eject the node if it is much slower than its peers.
+        """
+        node.consecutive_failures = 0
+        if node.ewma_latency is None:
+            node.ewma_latency = latency
+        else:
+            node.ewma_latency += self.ewma_alpha * (latency - node.ewma_latency)
+
+        now = time.monotonic()
+        peers = [
+            other.ewma_latency for other in nodes
+            if other is not node and other.ewma_latency is not None and other.is_available(now)
+        ]
+        if peers:
+            fastest = min(peers)
+            if node.ewma_latency > fastest * self.slow_factor and node.ewma_latency - fastest > self.slow_min_delta:
+                self._eject(node, now)
+
+    def on_failure(self, node: ClusterNode) -> None:
+        """
+        Record a failed request and eject the node after too many consecutive failures.
+        """
+        node.consecutive_failures += 1
+        if node.consecutive_failures >= self.failure_threshold:
+            self._eject(node, time.monotonic())
+
+    def _eject(self, node: ClusterNode, now: float) -> None:
+        node.ejected_until = now + self.ejection_time
+        node.consecutive_failures = 0
+        # Forget the latency history so the node is probed afresh when it comes back.
+        node.ewma_latency = None
@@ -0,0 +1,88 @@
+"""
+Exact re-scoring and maximal-marginal-relevance selection of search candidates for the
+asimpleVectors Python client.
+"""
+from typing import Tuple
+
+import numpy as np
+
+DEFAULT_MMR_LAMBDA = 0.5
+DEFAULT_MMR_MAX_SCAN = 100000
+SIMILARITY_METRICS = ("cosine", "ip", "l2")
+
+_EPSILON = 1e-12
+
+
+def similarity_matrix(queries: np.ndarray, vectors: np.ndarray, metric: str = "cosine") -> np.ndarray:
+    """
+    Pairwise similarities between the rows of two matrices, higher is more similar.
+
+    - "cosine": cosine similarity.
+    - "ip": inner product.
+    - "l2": negated Euclidean distance.
+
+    :param queries: (m, d) matrix.
+    :param vectors: (n, d) matrix.
+    :param metric: Similarity metric, one of SIMILARITY_METRICS.
+    :return: (m, n) float32 similarity matrix.
+    """
+    if metric not in SIMILARITY_METRICS:
+        raise ValueError(f"Invalid metric: {metric}. Expected one of {', '.join(SIMILARITY_METRICS)}.")
+    queries = np.asarray(queries, dtype=np.float32)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if queries.shape[1] != vectors.shape[1]:
+        raise ValueError(f"Dimension mismatch: {queries.shape[1]} != {vectors.shape[1]}.")
+    if metric == "cosine":
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), _EPSILON)
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), _EPSILON)
+        return queries @ vectors.T
+    if metric == "ip":
+        return queries @ vectors.T
+    # |q - v|^2 = |q|^2 + |v|^2 - 2 q.v, clipped against rounding below zero.
+    squared = (
+        np.einsum("ij,ij->i", queries, queries)[:, None]
+        + np.einsum("ij,ij->i", vectors, vectors)[None, :]
+        - 2.0 * (queries @ vectors.T)
+    )
+    return -np.sqrt(np.maximum(squared, 0.0))
+
+
+def maximal_marginal_relevance(
+    relevance: np.ndarray,
+    similarity: np.ndarray,
+    k: int,
+    lambda_mult: float = DEFAULT_MMR_LAMBDA
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Greedy maximal-marginal-relevance selection: each step picks the candidate maximizing
+    lambda_mult * relevance - (1 - lambda_mult) * (highest similarity to an already selected candidate).
+
+    :param relevance: (n,) similarity of each candidate to the query.
+    :param similarity: (n, n) similarity between the candidates.
+    :param k: Number of candidates to select.
+    :param lambda_mult: Trade-off between relevance (1.0) and diversity (0.0).
+    :return: Indices of the selected candidates in selection order, and their MMR scores.
+    """
+    if not 0 <= lambda_mult <= 1:
+        raise ValueError("lambda_mult must be in [0, 1].")
+    relevance = np.asarray(relevance, dtype=np.float64)
+    count = min(k, len(relevance))
+    selected = np.empty(count, dtype=np.int64)
+    scores = np.empty(count, dtype=np.float64)
+    if not count:
+        return selected, scores
+
+    redundancy = np.full(len(relevance), -np.inf)
+    available = np.ones(len(relevance), dtype=bool)
+    for step in range(count):
+        # The first pick has no redundancy term and is simply the most relevant candidate.
+        mmr = lambda_mult * relevance
+        if step:
+            mmr = mmr - (1.0 - lambda_mult) * redundancy
+        mmr[~available] = -np.inf
+        best = int(np.argmax(mmr))
+        selected[step] = best
+        scores[step] = mmr[best]
+        available[best] = False
+        redundancy = np.maximum(redundancy, similarity[best])
+    return selected, scores
@@ -0,0 +1,94 @@
+"""
+Rank fusion of dense and BM25 results for hybrid search with the asimpleVectors Python client.
+"""
+from typing import Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_RRF_K = 60.0
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[np.ndarray],
+    weights: Sequence[float],
+    k: float = DEFAULT_RRF_K
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fuse ranked id lists (best first) with weighted reciprocal-rank fusion: the score of an id
+    is the sum of weight / (k + rank) over the lists it appears in, with ranks starting at 1.
+
+    :param rankings: One int64 id array per ranking, best first.
+    :param weights: Weight of each ranking.
+    :param k: Rank offset damping the influence of the top ranks.
+    :return: Unique ids and their fused scores, best first.
+    """
+    if len(rankings) != len(weights):
+        raise ValueError("Expected one weight per ranking.")
+    contributions = [
+        np.full(len(ids), weight, dtype=np.float64) / (k + np.arange(1, len(ids) + 1))
+        for ids, weight in zip(rankings, weights)
+    ]
+    return _accumulate(rankings, contributions)
+
+
+def weighted_score_fusion(
+    rankings: Sequence[np.ndarray],
+    scores: Sequence[np.ndarray],
+    weights: Sequence[float]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fuse scored id lists with a weighted sum of min-max normalized scores. Scores must be
+    "higher is better"; an id missing from a list contributes 0 for it, and a list whose
+    scores are all equal contributes its full weight to each of its ids.
+
+    :param rankings: One int64 id array per list.
+    :param scores: Scores of the ids of each list.
+    :param weights: Weight of each list.
+    :return: Unique ids and their fused scores, best first.
+    """
+    if not len(rankings) == len(scores) == len(weights):
+        raise ValueError("Expected one score array and one weight per ranking.")
+    contributions = [
+        weight * min_max_normalize(np.asarray(list_scores, dtype=np.float64))
+        for list_scores, weight in zip(scores, weights)
+    ]
+    return _accumulate(rankings, contributions)
+
+
+def min_max_normalize(scores: np.ndarray) -> np.ndarray:
+    """
+    Scale scores to [0, 1]; constant scores map to 1.
+    """
+    if not len(scores):
+        return scores
+    low = scores.min()
+    span = scores.max() - low
+    if span <= 0:
+        return np.ones_like(scores)
+    return (scores - low) / span
+
+
+def _accumulate(rankings: Sequence[np.ndarray], contributions: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    ids = np.concatenate([np.asarray(ranking, dtype=np.int64) for ranking in rankings])
+    if not len(ids):
+        return ids, np.empty(0, dtype=np.float64)
+    unique_ids, inverse = np.unique(ids, return_inverse=True)
+    fused = np.bincount(inverse, weights=np.concatenate(contributions), minlength=len(unique_ids))
+    # Stable sort keeps ties in id order.
+    order = np.argsort(-fused, kind="stable")
+    return unique_ids[order], fused[order]
+
+
+def lookup(ids: np.ndarray, values: np.ndarray, query_ids: np.ndarray, fill: float = np.nan) -> np.ndarray:
+    """
+    Values of `query_ids` in the (ids, values) columns, `fill` where an id is missing.
+    """
+    result = np.full(len(query_ids), fill, dtype=np.float64)
+    if not len(ids) or not len(query_ids):
+        return result
+    order = np.argsort(ids, kind="stable")
+    sorted_ids = ids[order]
+    positions = np.minimum(np.searchsorted(sorted_ids, query_ids), len(sorted_ids) - 1)
+    found = sorted_ids[positions] == query_ids
+    result[found] = np.asarray(values, dtype=np.float64)[order[positions[found]]]
+    return result
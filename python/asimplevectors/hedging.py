@@ -0,0 +1,97 @@
+"""
+Request hedging for idempotent reads of the asimpleVectors Python client.
+"""
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import numpy as np
+
+DEFAULT_HEDGE_PERCENTILE = 95.0
+DEFAULT_HEDGE_MIN_DELAY = 0.005
+DEFAULT_HEDGE_MAX_DELAY = 1.0
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+DEFAULT_LATENCY_WINDOW = 1000
+
+
+class LatencyTracker:
+    """
+    Keeps the most recent request latencies per operation.
+
+    :param window: Number of samples kept per operation.
+    """
+    def __init__(self, window: int = DEFAULT_LATENCY_WINDOW):
+        if window <= 0:
+            raise ValueError("window must be positive.")
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, operation: str, latency: float) -> None:
+        """
+        Add a latency sample in seconds.
+        """
+        samples = self._samples.get(operation)
+        if samples is None:
+            samples = self._samples[operation] = deque(maxlen=self.window)
+        samples.append(latency)
+
+    def count(self, operation: str) -> int:
+        """
+        Number of samples currently kept for an operation.
+        """
+        return len(self._samples.get(operation, ()))
+
+    def percentile(self, operation: str, percentile: float) -> Optional[float]:
+        """
+        Latency percentile of an operation in seconds, or None without samples.
+        """
+        samples = self._samples.get(operation)
+        if not samples:
+            return None
+        return float(np.percentile(np.fromiter(samples, dtype=np.float64, count=len(samples)), percentile))
+
+
+class HedgePolicy:
+    """
+    Decides when a duplicate of a slow idempotent read is sent. The hedge delay is the
+    `percentile` of the recent latencies of the operation, clamped to [`min_delay`, `max_delay`];
+    until `min_samples` latencies are known, `max_delay` is used.
+
+    :param percentile: Latency percentile after which a hedge is sent.
+    :param min_delay: Lower bound of the hedge delay in seconds.
+    :param max_delay: Upper bound of the hedge delay in seconds.
+    :param min_samples: Samples needed before the percentile is trusted.
+    :param max_hedges: Maximum number of duplicates sent per request.
+    :param window: Number of latency samples kept per operation.
+    """
+    def __init__(
+        self,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        min_delay: float = DEFAULT_HEDGE_MIN_DELAY,
+        max_delay: float = DEFAULT_HEDGE_MAX_DELAY,
+        min_samples: int = DEFAULT_HEDGE_MIN_SAMPLES,
+        max_hedges: int = 1,
+        window: int = DEFAULT_LATENCY_WINDOW
+    ):
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100.")
+        if min_delay < 0 or max_delay < min_delay:
+            raise ValueError("Expected 0 <= min_delay <= max_delay.")
+        if max_hedges < 1:
+            raise ValueError("max_hedges must be at least 1.")
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.max_hedges = max_hedges
+        self.latencies = LatencyTracker(window)
+        self.hedges_sent = 0
+        self.hedges_won = 0
+
+    def delay(self, operation: str) -> float:
+        """
+        Seconds to wait for an attempt of `operation` before sending a hedge.
+        """
+        if self.latencies.count(operation) < self.min_samples:
+            return self.max_delay
+        delay = self.latencies.percentile(operation, self.percentile)
+        return min(max(delay, self.min_delay), self.max_delay)
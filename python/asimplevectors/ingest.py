@@ -0,0 +1,655 @@
+"""
+Ingestion helpers for the asimpleVectors Python client.
+"""
+import asyncio
+import bisect
+import inspect
+import json
+import logging
+import os
+import time
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+)
+
+import aiofiles
+import aiofiles.os
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_BATCH_BYTES = 8 * 1024 * 1024
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_CHECKPOINT_EVERY = 10
+DEFAULT_CHECKPOINT_KEY_PREFIX = "ingest-checkpoint-"
+
+# Upper bound of the JSON text for one float component ("-1.2345678901234567e-05,").
+_FLOAT_JSON_BYTES = 24
+# Fixed JSON overhead of one vector object (braces, keys, id).
+_VECTOR_OVERHEAD_BYTES = 48
+
+
+def estimate_vector_bytes(vector: Dict[str, Any]) -> int:
+    """
+    Cheaply estimate the serialized JSON size of one vector entry.
+
+    The estimate is intentionally pessimistic so that batches stay under the byte bound
+    without serializing every vector twice.
+
+    :param vector: Vector dictionary with "id", "data" and optional "metadata", "doc", "doc_tokens".
+    :return: Estimated size in bytes.
+    """
+    data = vector.get("data")
+    size = _VECTOR_OVERHEAD_BYTES
+    if isinstance(data, np.ndarray):
+        size += data.size * _FLOAT_JSON_BYTES
+    elif data is not None:
+        size += len(data) * _FLOAT_JSON_BYTES
+
+    metadata = vector.get("metadata")
+    if metadata is not None:
+        size += len(str(metadata))
+    doc = vector.get("doc")
+    if doc:
+        size += len(doc)
+    doc_tokens = vector.get("doc_tokens")
+    if doc_tokens:
+        size += sum(len(token) + 3 for token in doc_tokens)
+    return size
+
+
+def iter_vector_batches(
+    vectors: Iterable[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES
+) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Split vectors into batches bounded by count and by estimated payload size.
+
+    A single vector larger than `max_batch_bytes` is emitted as its own batch.
+
+    :param vectors: Iterable of vector dictionaries.
+    :param batch_size: Maximum number of vectors per batch.
+    :param max_batch_bytes: Maximum estimated JSON size of a batch in bytes.
+    :return: Iterator of (offset of the first vector, batch) tuples.
+    """
+    batcher = _VectorBatcher(batch_size, max_batch_bytes)
+    for vector in vectors:
+        ready = batcher.add(vector)
+        if ready is not None:
+            yield ready
+    last = batcher.finish()
+    if last is not None:
+        yield last
+
+
+async def aiter_vector_batches(
+    records: Union[Iterable[Any], AsyncIterable[Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES
+) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Asynchronous `iter_vector_batches` over a sync or async iterable of records, converting each
+    record with `record_to_vector`. Records are pulled lazily, so only the batch being built is
+    held in memory.
+
+    :param records: Iterable or async iterable of records.
+    :param batch_size: Maximum number of vectors per batch.
+    :param max_batch_bytes: Maximum estimated JSON size of a batch in bytes.
+    :return: Async iterator of (offset of the first vector, batch) tuples.
+    """
+    batcher = _VectorBatcher(batch_size, max_batch_bytes)
+    if hasattr(records, "__aiter__"):
+        async for record in records:
+            ready = batcher.add(record_to_vector(record))
+            if ready is not None:
+                yield ready
+    else:
+        for record in records:
+            ready = batcher.add(record_to_vector(record))
+            if ready is not None:
+                yield ready
+    last = batcher.finish()
+    if last is not None:
+        yield last
+
+
+async def aiter_chunks(items: Union[Iterable[Any], AsyncIterable[Any]], size: int) -> AsyncIterator[List[Any]]:
+    """
+    Group a sync or async iterable into lists of up to `size` items.
+    """
+    if size <= 0:
+        raise ValueError("size must be positive.")
+    chunk: List[Any] = []
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def record_to_vector(record: Any) -> Dict[str, Any]:
+    """
+    Convert an ingestion record to a vector dictionary. A record is either a vector dictionary
+    or a tuple (id, vector), (id, vector, metadata) or (id, vector, metadata, doc); None metadata
+    and doc are omitted.
+
+    :raises ValueError: If the record has an unsupported shape.
+    """
+    if isinstance(record, dict):
+        return record
+    if not isinstance(record, (tuple, list)) or not 2 <= len(record) <= 4:
+        raise ValueError(f"Invalid record: expected a dict or (id, vector[, metadata[, doc]]), got {type(record).__name__}.")
+    vector = {"id": record[0], "data": record[1]}
+    if len(record) > 2 and record[2] is not None:
+        vector["metadata"] = record[2]
+    if len(record) > 3 and record[3] is not None:
+        vector["doc"] = record[3]
+    return vector
+
+
+class _VectorBatcher:
+    """
+    Incremental batching shared by the sync and async batch iterators.
+    """
+    def __init__(self, batch_size: int, max_batch_bytes: int):
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive.")
+        if max_batch_bytes <= 0:
+            raise ValueError("max_batch_bytes must be positive.")
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.batch: List[Dict[str, Any]] = []
+        self.batch_bytes = 0
+        self.start = 0
+        self.offset = 0
+
+    def add(self, vector: Dict[str, Any]) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Add a vector and return the previous batch if the vector does not fit into it.
+        """
+        ready = None
+        vector_bytes = estimate_vector_bytes(vector)
+        if self.batch and (len(self.batch) >= self.batch_size or self.batch_bytes + vector_bytes > self.max_batch_bytes):
+            ready = (self.start, self.batch)
+            self.batch = []
+            self.batch_bytes = 0
+            self.start = self.offset
+        self.batch.append(vector)
+        self.batch_bytes += vector_bytes
+        self.offset += 1
+        return ready
+
+    def finish(self) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Return the last, partial batch.
+        """
+        if not self.batch:
+            return None
+        ready = (self.start, self.batch)
+        self.batch = []
+        return ready
+
+
+def validate_matrix(ids: Any, matrix: Any, dimension: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Validate an (N, D) vector matrix and its id array once for the whole upload.
+
+    The matrix is converted to C-contiguous float32 only if it is not already in that layout.
+
+    :param ids: Array-like of N integer vector ids.
+    :param matrix: Array-like of shape (N, D) with floating point values.
+    :param dimension: Expected dimension D of the target space, if known.
+    :return: Tuple of (int64 ids, float32 matrix).
+    :raises ValueError: If the shape, dtype or dimension do not match.
+    """
+    matrix = np.asarray(matrix)
+    if matrix.ndim != 2:
+        raise ValueError(f"Invalid matrix shape: {matrix.shape}. Expected a 2-D (N, D) array.")
+    if not np.issubdtype(matrix.dtype, np.floating):
+        raise ValueError(f"Invalid matrix dtype: {matrix.dtype}. Expected a floating point array.")
+    if dimension is not None and matrix.shape[1] != dimension:
+        raise ValueError(f"Matrix dimension {matrix.shape[1]} does not match space dimension {dimension}.")
+
+    ids = np.asarray(ids)
+    if ids.ndim != 1 or ids.shape[0] != matrix.shape[0]:
+        raise ValueError(f"Invalid ids shape: {ids.shape}. Expected ({matrix.shape[0]},).")
+    if not np.issubdtype(ids.dtype, np.integer):
+        raise ValueError(f"Invalid ids dtype: {ids.dtype}. Expected an integer array.")
+
+    return ids.astype(np.int64, copy=False), np.ascontiguousarray(matrix, dtype=np.float32)
+
+
+def matrix_batch_rows(dimension: int, batch_size: int, max_batch_bytes: int) -> int:
+    """
+    Number of matrix rows per request so that a batch respects both the count and byte bounds.
+    """
+    row_bytes = _VECTOR_OVERHEAD_BYTES + dimension * _FLOAT_JSON_BYTES
+    return max(1, min(batch_size, max_batch_bytes // row_bytes))
+
+
+def encode_matrix_batch(
+    ids: np.ndarray,
+    block: np.ndarray,
+    dumps: Callable[[Any], bytes],
+    metadata: Optional[Sequence[Any]] = None
+) -> bytes:
+    """
+    Encode a slice of an (N, D) matrix as an upsert request body.
+
+    Each vector references a row view of the matrix, so serializers with native NumPy support
+    write the floats without creating Python objects per component.
+
+    :param ids: int64 ids of the rows in the batch.
+    :param block: float32 rows of the batch.
+    :param dumps: Serializer function producing the JSON body.
+    :param metadata: Optional metadata entries of the rows in the batch.
+    :return: UTF-8 encoded JSON body.
+    """
+    if metadata is None:
+        vectors = [{"id": vector_id, "data": row} for vector_id, row in zip(ids.tolist(), block)]
+    else:
+        vectors = [
+            {"id": vector_id, "data": row, "metadata": item}
+            for vector_id, row, item in zip(ids.tolist(), block, metadata)
+        ]
+    return dumps({"vectors": vectors})
+
+
+class BufferedVectorWriter:
+    """
+    Write-behind buffer for vectors produced one at a time. Vectors are collected per space and
+    upserted in the background when a space buffer reaches `batch_size` vectors or
+    `max_batch_bytes`, when its oldest vector is `flush_interval` seconds old, or on `flush()`.
+    Obtain a writer with `ASimpleVectorsClient.buffered_writer()`.
+
+    `add` waits while `max_buffered` vectors are buffered or uploading, so producers are slowed
+    down to the upload rate. Failed batches are passed to `on_error(space_name, vectors, error)`,
+    a function or coroutine function; without it they are logged.
+
+    :param client: The ASimpleVectorsClient used for the upserts.
+    :param batch_size: Maximum number of vectors per request.
+    :param max_batch_bytes: Maximum estimated JSON payload size per request in bytes.
+    :param flush_interval: Maximum seconds a vector waits in the buffer, or None to flush only on size.
+    :param max_buffered: Maximum number of vectors buffered or in flight (default: batch_size * (concurrency + 1)).
+    :param concurrency: Maximum number of batches in flight at the same time.
+    :param on_error: Optional callback for failed batches.
+    """
+    def __init__(
+        self,
+        client: Any,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL,
+        max_buffered: Optional[int] = None,
+        concurrency: int = 4,
+        on_error: Optional[Callable[[str, List[Dict[str, Any]], Exception], Any]] = None
+    ):
+        if batch_size <= 0 or max_batch_bytes <= 0:
+            raise ValueError("batch_size and max_batch_bytes must be positive.")
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive.")
+        if max_buffered is None:
+            max_buffered = batch_size * (concurrency + 1)
+        if max_buffered <= 0:
+            raise ValueError("max_buffered must be positive.")
+        self.client = client
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.flush_interval = flush_interval
+        self.on_error = on_error
+        self.vectors_written = 0
+        self.batches_written = 0
+        self.vectors_failed = 0
+        self.batches_failed = 0
+        self._buffers: Dict[str, List[Dict[str, Any]]] = {}
+        self._buffer_bytes: Dict[str, int] = {}
+        self._buffer_started: Dict[str, float] = {}
+        self._slots = asyncio.Semaphore(max_buffered)
+        self._uploads = asyncio.Semaphore(concurrency)
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._timer: Optional["asyncio.Task[None]"] = None
+        self._buffer_added = asyncio.Event()
+        self._closed = False
+
+    async def __aenter__(self) -> "BufferedVectorWriter":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    @property
+    def buffered(self) -> int:
+        """
+        Number of vectors waiting in the buffers.
+        """
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    async def add(self, space_name: str, vector: Dict[str, Any]) -> None:
+        """
+        Add one vector to the buffer of a space, waiting while the writer is full.
+
+        :param space_name: Name of the space where the vector will be upserted.
+        :param vector: Vector dictionary, in the same format as `upsert_vector`.
+        :raises ValueError: If vector data is not a valid numpy array or list.
+        :raises RuntimeError: If the writer is closed.
+        """
+        if self._closed:
+            raise RuntimeError("BufferedVectorWriter is closed.")
+        if not isinstance(vector.get("data"), (np.ndarray, list)):
+            raise ValueError(f"Invalid vector data type: {type(vector.get('data'))}. Expected numpy array or list.")
+
+        await self._slots.acquire()
+        buffer = self._buffers.get(space_name)
+        if buffer is None:
+            buffer = self._buffers[space_name] = []
+            self._buffer_bytes[space_name] = 0
+            self._buffer_started[space_name] = time.monotonic()
+            self._buffer_added.set()
+        buffer.append(vector)
+        self._buffer_bytes[space_name] += estimate_vector_bytes(vector)
+
+        if self._timer is None and self.flush_interval is not None:
+            self._timer = asyncio.ensure_future(self._run_timer())
+        if len(buffer) >= self.batch_size or self._buffer_bytes[space_name] >= self.max_batch_bytes:
+            self._flush_space(space_name)
+
+    async def flush(self) -> None:
+        """
+        Send all buffered vectors and wait until every batch in flight has finished.
+        """
+        for space_name in list(self._buffers):
+            self._flush_space(space_name)
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks))
+
+    async def aclose(self) -> None:
+        """
+        Stop accepting vectors, flush the buffers and stop the background timer.
+        """
+        self._closed = True
+        if self._timer is not None:
+            self._timer.cancel()
+            await asyncio.gather(self._timer, return_exceptions=True)
+            self._timer = None
+        await self.flush()
+
+    def _flush_space(self, space_name: str) -> None:
+        batch = self._buffers.pop(space_name, None)
+        self._buffer_bytes.pop(space_name, None)
+        self._buffer_started.pop(space_name, None)
+        if batch:
+            task = asyncio.ensure_future(self._upload(space_name, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _upload(self, space_name: str, batch: List[Dict[str, Any]]) -> None:
+        try:
+            async with self._uploads:
+                await self.client._post_vectors(space_name, batch)
+            self.vectors_written += len(batch)
+            self.batches_written += 1
+        except Exception as e:
+            self.vectors_failed += len(batch)
+            self.batches_failed += 1
+            await self._report(space_name, batch, e)
+        finally:
+            for _ in batch:
+                self._slots.release()
+
+    async def _report(self, space_name: str, batch: List[Dict[str, Any]], error: Exception) -> None:
+        if self.on_error is None:
+            logger.error(f"Buffered upsert of {len(batch)} vectors into space '{space_name}' failed: {error}")
+            return
+        try:
+            result = self.on_error(space_name, batch, error)
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            logger.exception("Error callback of BufferedVectorWriter failed.")
+
+    async def _run_timer(self) -> None:
+        while True:
+            if not self._buffer_started:
+                self._buffer_added.clear()
+                await self._buffer_added.wait()
+            # Buffers started later are due later, so the oldest buffer sets the next wakeup.
+            delay = min(self._buffer_started.values()) + self.flush_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            now = time.monotonic()
+            for space_name, started in list(self._buffer_started.items()):
+                if now - started >= self.flush_interval:
+                    self._flush_space(space_name)
+
+
+class CheckpointStore:
+    """
+    Storage for the checkpoints of ingestion jobs. Subclasses implement `load`, `save` and `clear`.
+    """
+    async def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the saved state of a job, or None if the job has no checkpoint.
+        """
+        raise NotImplementedError
+
+    async def save(self, job_id: str, state: Dict[str, Any]) -> None:
+        """
+        Persist the state of a job.
+        """
+        raise NotImplementedError
+
+    async def clear(self, job_id: str) -> None:
+        """
+        Remove the checkpoint of a job.
+        """
+        raise NotImplementedError
+
+
+class FileCheckpointStore(CheckpointStore):
+    """
+    Stores checkpoints as `<job_id>.json` files in a local directory, replacing them atomically.
+
+    :param directory: Directory of the checkpoint files; created if missing.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    async def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            async with aiofiles.open(self._path(job_id), "r", encoding="utf-8") as file:
+                return json.loads(await file.read())
+        except FileNotFoundError:
+            return None
+
+    async def save(self, job_id: str, state: Dict[str, Any]) -> None:
+        await aiofiles.os.makedirs(self.directory, exist_ok=True)
+        path = self._path(job_id)
+        async with aiofiles.open(path + ".tmp", "w", encoding="utf-8") as file:
+            await file.write(json.dumps(state))
+        await aiofiles.os.replace(path + ".tmp", path)
+
+    async def clear(self, job_id: str) -> None:
+        try:
+            await aiofiles.os.remove(self._path(job_id))
+        except FileNotFoundError:
+            pass
+
+
+class KeyValueCheckpointStore(CheckpointStore):
+    """
+    Stores checkpoints in the key-value store of a space, under `<key_prefix><job_id>`.
+
+    :param client: The ASimpleVectorsClient used to access the key-value store.
+    :param space_name: Name of the space holding the checkpoints.
+    :param key_prefix: Prefix of the checkpoint keys.
+    """
+    def __init__(self, client: Any, space_name: str, key_prefix: str = DEFAULT_CHECKPOINT_KEY_PREFIX):
+        self.client = client
+        self.space_name = space_name
+        self.key_prefix = key_prefix
+
+    async def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        from .client import KeyNotFoundError
+
+        try:
+            value = await self.client.get_key_value(self.space_name, self.key_prefix + job_id)
+        except KeyNotFoundError:
+            return None
+        return json.loads(value) if value else None
+
+    async def save(self, job_id: str, state: Dict[str, Any]) -> None:
+        await self.client.put_key_value(self.space_name, self.key_prefix + job_id, state)
+
+    async def clear(self, job_id: str) -> None:
+        from .client import KeyNotFoundError
+
+        try:
+            await self.client.delete_key_value(self.space_name, self.key_prefix + job_id)
+        except KeyNotFoundError:
+            pass
+
+
+class IngestionJob:
+    """
+    Resumable streaming upsert. The record offsets of committed batches are checkpointed as
+    merged [start, end) ranges; when the job is run again with the same records, batches that
+    were committed before are skipped instead of uploaded. Batches that were in flight when a
+    run died are sent again, which is harmless because upserts are idempotent.
+
+    The records must be produced in the same order on every run, and `batch_size` and
+    `max_batch_bytes` must not change, so that batch boundaries are reproducible. Obtain a job
+    with `ASimpleVectorsClient.ingestion_job()`.
+
+    :param client: The ASimpleVectorsClient used for the upserts.
+    :param space_name: Name of the space where the vectors will be upserted.
+    :param job_id: Identifier of the job, used as the checkpoint key.
+    :param store: CheckpointStore for the job state.
+    :param batch_size: Maximum number of vectors per request.
+    :param max_batch_bytes: Maximum estimated JSON payload size per request in bytes.
+    :param concurrency: Maximum number of batches in flight at the same time.
+    :param checkpoint_every: Number of committed batches between checkpoint writes.
+    """
+    def __init__(
+        self,
+        client: Any,
+        space_name: str,
+        job_id: str,
+        store: CheckpointStore,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        concurrency: int = 4,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY
+    ):
+        if checkpoint_every <= 0:
+            raise ValueError("checkpoint_every must be positive.")
+        self.client = client
+        self.space_name = space_name
+        self.job_id = job_id
+        self.store = store
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.concurrency = concurrency
+        self.checkpoint_every = checkpoint_every
+        self.committed: List[List[int]] = []
+        self.skipped_count = 0
+        self._unsaved_batches = 0
+        self._save_lock = asyncio.Lock()
+
+    @property
+    def committed_count(self) -> int:
+        """
+        Number of records committed by this and previous runs.
+        """
+        return sum(end - start for start, end in self.committed)
+
+    async def run(self, records: Union[Iterable[Any], AsyncIterable[Any]]) -> Any:
+        """
+        Upsert the records that are not yet committed, checkpointing progress as batches finish.
+
+        :param records: Iterable or async iterable of records, see `record_to_vector`.
+        :return: StreamUpsertResult of this run; skipped batches are counted in `skipped_count`.
+        :raises ValueError: If the checkpoint was written with different batch bounds.
+        """
+        state = await self.store.load(self.job_id)
+        if state is not None:
+            if state.get("batch_size") != self.batch_size or state.get("max_batch_bytes") != self.max_batch_bytes:
+                raise ValueError(
+                    f"Checkpoint of job '{self.job_id}' was written with batch_size={state.get('batch_size')} "
+                    f"and max_batch_bytes={state.get('max_batch_bytes')}; resume with the same values."
+                )
+            self.committed = [list(committed_range) for committed_range in state.get("committed", [])]
+            logger.info(f"Resuming ingestion job '{self.job_id}' with {self.committed_count} committed records.")
+        self.skipped_count = 0
+
+        try:
+            result = await self.client._upsert_batch_stream(
+                self.space_name, self._pending_batches(records), self.concurrency, on_result=self._on_result
+            )
+        finally:
+            await self._save()
+        return result
+
+    async def reset(self) -> None:
+        """
+        Forget all progress so that the next run uploads every record again.
+        """
+        self.committed = []
+        await self.store.clear(self.job_id)
+
+    def is_committed(self, start: int, end: int) -> bool:
+        """
+        Whether records [start, end) were committed.
+        """
+        index = bisect.bisect_right(self.committed, [start, float("inf")]) - 1
+        return index >= 0 and self.committed[index][0] <= start and end <= self.committed[index][1]
+
+    async def _pending_batches(self, records: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        async for start, batch in aiter_vector_batches(records, self.batch_size, self.max_batch_bytes):
+            if self.is_committed(start, start + len(batch)):
+                self.skipped_count += len(batch)
+                continue
+            yield start, batch
+
+    async def _on_result(self, result: Any, batch: List[Dict[str, Any]]) -> None:
+        if not result.success:
+            return
+        self._add_committed(result.start, result.start + result.count)
+        self._unsaved_batches += 1
+        if self._unsaved_batches >= self.checkpoint_every:
+            await self._save()
+
+    def _add_committed(self, start: int, end: int) -> None:
+        low = bisect.bisect_left(self.committed, [start, start])
+        if low > 0 and self.committed[low - 1][1] >= start:
+            low -= 1
+        high = low
+        while high < len(self.committed) and self.committed[high][0] <= end:
+            start = min(start, self.committed[high][0])
+            end = max(end, self.committed[high][1])
+            high += 1
+        self.committed[low:high] = [[start, end]]
+
+    async def _save(self) -> None:
+        async with self._save_lock:
+            self._unsaved_batches = 0
+            await self.store.save(self.job_id, {
+                "job_id": self.job_id,
+                "batch_size": self.batch_size,
+                "max_batch_bytes": self.max_batch_bytes,
+                "committed": [list(committed_range) for committed_range in self.committed],
+                "updated_time_utc": int(time.time())
+            })
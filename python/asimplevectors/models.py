@@ -1,4 +1,5 @@
 from typing import List, Optional, Dict, Any
+import numpy as np
 from pydantic import BaseModel, Field, ConfigDict, root_validator
 
 # Unified Response Models
@@ -198,6 +199,80 @@ class GetVectorsResponse(BaseModel):
                 for vector in response_json["vectors"]
             ]
         return cls(**response_json)
+
+class VectorPage(BaseModel):
+    """
+    Columnar page of vectors: row i of `vectors` belongs to `ids[i]` and `metadata[i]`.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    start: int
+    total_count: int
+    ids: np.ndarray  # (n,) int64
+    vectors: np.ndarray  # (n, d) float32
+    metadata: List[Any]
+
+    @classmethod
+    def from_response(cls, response_json: dict, start: int = 0) -> "VectorPage":
+        """
+        Build a columnar page from the decoded get_vectors JSON. The floats are still decoded
+        as Python objects first, so this is not faster than GetVectorsResponse; the page keeps
+        one float32 matrix instead of a model and a list of floats per vector.
+        """
+        vectors = response_json.get("vectors") or []
+        ids = np.fromiter((vector["id"] for vector in vectors), dtype=np.int64, count=len(vectors))
+        if vectors:
+            matrix = np.array([vector["data"]["data"] for vector in vectors], dtype=np.float32)
+        else:
+            matrix = np.empty((0, 0), dtype=np.float32)
+        return cls(
+            start=start,
+            total_count=response_json.get("total_count", 0),
+            ids=ids,
+            vectors=matrix,
+            metadata=[vector.get("metadata") for vector in vectors]
+        )
+
+class BulkUpsertResult(BaseModel):
+    batch_index: int
+    start: int
+    count: int
+    success: bool
+    error: Optional[str] = None
+
+class StreamUpsertResult(BaseModel):
+    count: int = 0
+    batch_count: int = 0
+    failed_count: int = 0
+    failed_batches: List[BulkUpsertResult] = []
+
+class PipelineStageStats(BaseModel):
+    items: int = 0
+    batches: int = 0
+    busy_seconds: float = 0.0  # summed over the concurrent workers of the stage
+    wall_seconds: float = 0.0  # from the first batch started to the last batch finished
+    items_per_second: float = 0.0  # items / wall_seconds, the throughput of the whole stage
+
+class EmbedUpsertResult(BaseModel):
+    count: int = 0
+    failed_count: int = 0
+    failed_batches: List[BulkUpsertResult] = []
+    elapsed_seconds: float = 0.0
+    items_per_second: float = 0.0
+    encode: PipelineStageStats = PipelineStageStats()
+    upload: PipelineStageStats = PipelineStageStats()
+
+class VersionExportResult(BaseModel):
+    total_count: int
+    count: int  # rows received; the others have id -1 and null metadata
+    dimension: int
+    ids_path: str
+    vectors_path: str
+    metadata_path: str
+
+    @property
+    def complete(self) -> bool:
+        return self.count == self.total_count
         
 # Search DTOs
 class SearchRequest(BaseModel):
@@ -208,6 +283,46 @@ class SearchResponse(BaseModel):
     distance: float
     label: int
 
+class SearchBatchResponse(BaseModel):
+    """
+    Columnar results of a multi-query search. Row q holds the results of query q; rows with
+    fewer than k results are padded with -1 ids and infinite distances.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    ids: np.ndarray  # (Q, k) int64
+    distances: np.ndarray  # (Q, k) float32
+
+class MMRSearchResult(BaseModel):
+    label: int
+    distance: float  # distance reported by the server search
+    similarity: float  # exact similarity to the query under the requested metric
+    score: float  # marginal relevance at the time the result was selected
+
+class SearchTarget(BaseModel):
+    space_name: str
+    version_id: Optional[int] = None  # None searches the default version
+    higher_is_better: bool = False  # True if the space scores similarity instead of distance
+
+class FederatedSearchResult(BaseModel):
+    space_name: str
+    version_id: Optional[int] = None
+    label: int
+    distance: float
+
+class SearchTargetError(BaseModel):
+    target: SearchTarget
+    error: str
+
+class FederatedSearchResponse(BaseModel):
+    results: List[FederatedSearchResult] = []
+    timed_out: List[SearchTarget] = []  # targets still pending at the deadline
+    failed: List[SearchTargetError] = []
+
+    @property
+    def complete(self) -> bool:
+        return not self.timed_out and not self.failed
+
 # Rerank DTOs
 class RerankRequest(BaseModel):
     vector: List[float]
@@ -221,6 +336,12 @@ class RerankResponse(BaseModel):
 class RerankErrorResponse(BaseModel):
     error: str
 
+class HybridSearchResult(BaseModel):
+    id: int
+    score: float  # fused score, higher is better
+    distance: Optional[float] = None  # None if only the BM25 side returned the vector
+    bm25Score: Optional[float] = None  # None if only the dense side returned the vector
+
 # Snapshot DTOs
 class CreateSnapshotRequest(BaseModel):
     spacename: str
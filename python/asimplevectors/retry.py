@@ -0,0 +1,180 @@
+"""
+Retry policy for requests of the asimpleVectors Python client.
+"""
+import random
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Iterable, Optional, Pattern, Tuple, Type
+
+import httpx
+
+from .circuit import CircuitOpenError
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF_BASE = 0.1
+DEFAULT_BACKOFF_MAX = 5.0
+DEFAULT_MAX_RETRY_AFTER = 30.0
+DEFAULT_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+DEFAULT_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# POST endpoints that can be repeated safely: searches and reranks, vector upserts,
+# space updates and key-value writes.
+DEFAULT_IDEMPOTENT_POST_PATTERN = re.compile(
+    r"/space/[^/]+(/version/\d+)?/(search|rerank)$|/space/[^/]+/vector$|/space/[^/]+$|/space/[^/]+/key/[^/]+$"
+)
+# Failures that happen before the request reaches the server, so even writes can be retried.
+_NOT_SENT_EXCEPTIONS: Tuple[Type[Exception], ...] = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+DEFAULT_BUDGET_RATIO = 0.2
+DEFAULT_BUDGET_INITIAL_TOKENS = 10.0
+DEFAULT_BUDGET_MAX_TOKENS = 100.0
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of the requests, so that retries cannot
+    multiply the load on a cluster that is already failing. Every request deposits `ratio`
+    tokens and every retry spends one.
+
+    :param ratio: Tokens earned per request, i.e. the long-run share of requests that may be retried.
+    :param initial_tokens: Tokens available before any request was made.
+    :param max_tokens: Maximum number of saved tokens.
+    """
+    def __init__(
+        self,
+        ratio: float = DEFAULT_BUDGET_RATIO,
+        initial_tokens: float = DEFAULT_BUDGET_INITIAL_TOKENS,
+        max_tokens: float = DEFAULT_BUDGET_MAX_TOKENS
+    ):
+        if ratio < 0 or max_tokens < 0:
+            raise ValueError("ratio and max_tokens must not be negative.")
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = min(initial_tokens, max_tokens)
+        self.exhausted = 0
+
+    def deposit(self) -> None:
+        """
+        Record a request.
+        """
+        self.tokens = min(self.tokens + self.ratio, self.max_tokens)
+
+    def withdraw(self) -> bool:
+        """
+        Spend a token for a retry. Returns False if the budget is exhausted.
+        """
+        if self.tokens < 1:
+            self.exhausted += 1
+            return False
+        self.tokens -= 1
+        return True
+
+
+class RetryPolicy:
+    """
+    Decides which failed requests are retried and how long to wait in between.
+
+    Idempotent requests are retried on the transport errors and statuses listed here; other
+    requests only when the connection could not be established, so a write is never applied
+    twice. Delays grow exponentially with full jitter, and a `Retry-After` header sent by the
+    server is honoured up to `max_retry_after` seconds.
+
+    :param max_attempts: Maximum number of attempts per request, including the first one.
+    :param backoff_base: Delay in seconds before jitter for the first retry.
+    :param backoff_max: Upper bound of the backoff delay in seconds.
+    :param jitter: Randomize delays between zero and the backoff delay.
+    :param retry_statuses: HTTP statuses retried for idempotent requests.
+    :param retry_exceptions: Exception types retried for idempotent requests.
+    :param idempotent_methods: HTTP methods that are always idempotent.
+    :param idempotent_post_pattern: Regular expression matching URLs of idempotent POST endpoints.
+    :param max_retry_after: Upper bound in seconds for delays requested with `Retry-After`.
+    :param budget: RetryBudget shared by all requests of the client (default: a new RetryBudget).
+    """
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        jitter: bool = True,
+        retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+        retry_exceptions: Tuple[Type[Exception], ...] = (httpx.TransportError,),
+        idempotent_methods: Iterable[str] = DEFAULT_IDEMPOTENT_METHODS,
+        idempotent_post_pattern: Optional[Pattern] = DEFAULT_IDEMPOTENT_POST_PATTERN,
+        max_retry_after: float = DEFAULT_MAX_RETRY_AFTER,
+        budget: Optional[RetryBudget] = None
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_statuses: FrozenSet[int] = frozenset(retry_statuses)
+        self.retry_exceptions = retry_exceptions
+        self.idempotent_methods: FrozenSet[str] = frozenset(method.upper() for method in idempotent_methods)
+        self.idempotent_post_pattern = idempotent_post_pattern
+        self.max_retry_after = max_retry_after
+        self.budget = budget if budget is not None else RetryBudget()
+        self.retries = 0
+
+    def is_idempotent(self, method: str, url: str) -> bool:
+        """
+        Whether repeating the request has the same effect as sending it once.
+        """
+        method = method.upper()
+        if method in self.idempotent_methods:
+            return True
+        return (
+            method == "POST" and self.idempotent_post_pattern is not None
+            and self.idempotent_post_pattern.search(httpx.URL(url).path) is not None
+        )
+
+    def should_retry(self, error: Exception, method: str, url: str, attempt: int) -> bool:
+        """
+        Whether a request that failed with `error` on attempt number `attempt` is sent again.
+        Spends a budget token when the answer is yes.
+        """
+        # An open circuit fails fast on purpose; retrying would only spin until it closes.
+        if attempt >= self.max_attempts or isinstance(error, CircuitOpenError):
+            return False
+        if isinstance(error, _NOT_SENT_EXCEPTIONS):
+            retryable = True
+        elif not self.is_idempotent(method, url):
+            retryable = False
+        elif isinstance(error, httpx.HTTPStatusError):
+            retryable = error.response.status_code in self.retry_statuses
+        else:
+            retryable = isinstance(error, self.retry_exceptions)
+        if not retryable or not self.budget.withdraw():
+            return False
+        self.retries += 1
+        return True
+
+    def backoff(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """
+        Seconds to wait before retry number `attempt` (starting at 1).
+        """
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = _parse_retry_after(error.response.headers.get("Retry-After"))
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_retry_after))
+        return delay
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds from a `Retry-After` header given as delta-seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,114 @@
+"""
+JSON serializers used by the asimpleVectors Python client for request bodies and responses.
+"""
+import json
+import math
+from typing import Any, Optional, Union
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """
+    Fallback conversion for types the JSON backends do not handle natively.
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """
+    Whether a document contains a NaN or infinite float. NumPy arrays are checked with one
+    vectorized call instead of element by element.
+    """
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        for item in obj:
+            if isinstance(item, float):
+                if not math.isfinite(item):
+                    return True
+            elif isinstance(item, (dict, list, tuple, np.ndarray, np.floating)) and _has_non_finite(item):
+                return True
+        return False
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind == "O":
+            return _has_non_finite(obj.tolist())
+        return obj.dtype.kind in "fc" and not np.isfinite(obj).all()
+    if isinstance(obj, np.floating):
+        return not np.isfinite(obj)
+    return False
+
+
+class JsonSerializer:
+    """
+    Serializer based on the standard library `json` module. NumPy arrays and scalars are
+    converted on the fly. Output matches what httpx sends for `json=`: compact, UTF-8, and
+    NaN or infinite floats are rejected with a ValueError.
+    """
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(
+            obj, default=_default, separators=(",", ":"), ensure_ascii=False, allow_nan=False
+        ).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer(JsonSerializer):
+    """
+    Serializer based on `orjson`. Contiguous NumPy arrays are written natively without
+    converting them to Python lists, and float32 values are written in their shortest float32
+    form, which decodes to the same float32 as the longer form written by JsonSerializer.
+
+    Documents orjson cannot encode (e.g. integers beyond 64 bits) are encoded with the
+    standard library instead. orjson writes NaN and infinity as null, so documents are checked
+    for them before encoding and rejected with a ValueError like JsonSerializer does.
+    """
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed. Install it with `pip install asimplevectors[fast]`.")
+
+    def dumps(self, obj: Any) -> bytes:
+        if _has_non_finite(obj):
+            raise ValueError("Out of range float values are not JSON compliant")
+        try:
+            return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return super().dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+def get_serializer(serializer: Optional[Union[str, JsonSerializer]] = None) -> JsonSerializer:
+    """
+    Resolve a serializer from a name or instance.
+
+    :param serializer: "orjson", "json", a JsonSerializer instance, or None to pick orjson when installed.
+    :return: A JsonSerializer instance.
+    :raises ValueError: If the serializer name is unknown.
+    """
+    if isinstance(serializer, JsonSerializer):
+        return serializer
+    if serializer is None:
+        return OrjsonSerializer() if orjson is not None else JsonSerializer()
+    if serializer == OrjsonSerializer.name:
+        return OrjsonSerializer()
+    if serializer == JsonSerializer.name:
+        return JsonSerializer()
+    raise ValueError(f"Unknown serializer: {serializer}. Expected 'orjson' or 'json'.")
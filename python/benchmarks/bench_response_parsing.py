@@ -0,0 +1,99 @@
+"""
+Benchmark of response parsing strategies for asimpleVectors responses.
+
+Runs without a server on synthetic payloads shaped like the server responses:
+
+    PYTHONPATH=. python benchmarks/bench_response_parsing.py
+
+Compared strategies:
+- json + models: stdlib `json.loads`, then one pydantic model per item (the former make_request path).
+- orjson + models: `orjson.loads`, then one pydantic model per item.
+- direct: pydantic-core parses the JSON bytes straight into models (the make_request path).
+- columnar: vector pages converted into NumPy arrays (`get_vectors_by_version(..., columnar=True)`).
+  JSON decoding still creates the Python floats, so this matches orjson + models in time and
+  only changes how the page is held in memory.
+"""
+import json
+import random
+import timeit
+
+from asimplevectors.client import _parse_model
+from asimplevectors.models import GetVectorsResponse, ListSpacesResponse, RerankResponse, SearchResponse, VectorPage
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def search_payload(top_k: int) -> bytes:
+    return json.dumps([{"distance": random.random(), "label": i} for i in range(top_k)]).encode()
+
+
+def rerank_payload(top_k: int) -> bytes:
+    return json.dumps([
+        {"vectorUniqueId": i, "distance": random.random(), "bm25Score": random.random() * 10}
+        for i in range(top_k)
+    ]).encode()
+
+
+def spaces_payload(count: int) -> bytes:
+    return json.dumps({"values": [
+        {"name": f"space{i}", "id": i, "description": "", "created_time_utc": 0, "updated_time_utc": 0}
+        for i in range(count)
+    ]}).encode()
+
+
+def vectors_payload(count: int, dimension: int) -> bytes:
+    return json.dumps({
+        "vectors": [
+            {"id": i, "data": {"data": [random.random() for _ in range(dimension)]}, "metadata": {"n": i}}
+            for i in range(count)
+        ],
+        "total_count": count
+    }).encode()
+
+
+def parse_items(loads, model, content: bytes):
+    decoded = loads(content)
+    if isinstance(decoded, list):
+        return [model(**item) for item in decoded]
+    return model(**decoded)
+
+
+def measure(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1e3
+
+
+def report(name: str, timings) -> None:
+    baseline = timings[0][1]
+    cells = "   ".join(f"{label} {value:9.3f} ms ({baseline / value:4.1f}x)" for label, value in timings)
+    print(f"{name:<28} {cells}")
+
+
+def main() -> None:
+    random.seed(0)
+    cases = [
+        ("search (top_k=100)", SearchResponse, search_payload(100), 2000),
+        ("rerank (top_k=100)", RerankResponse, rerank_payload(100), 2000),
+        ("list_spaces (1000 spaces)", ListSpacesResponse, spaces_payload(1000), 200),
+    ]
+    for name, model, content, number in cases:
+        timings = [("json + models", measure(lambda: parse_items(json.loads, model, content), number))]
+        if orjson is not None:
+            timings.append(("orjson + models", measure(lambda: parse_items(orjson.loads, model, content), number)))
+        timings.append(("direct", measure(lambda: _parse_model(model, content), number)))
+        report(name, timings)
+
+    # Vector pages are dominated by JSON decoding, not by validation or the output layout.
+    content = vectors_payload(10000, 128)
+    timings = [("json + models", measure(lambda: GetVectorsResponse.from_response(json.loads(content)), 3))]
+    if orjson is not None:
+        timings.append(("orjson + models", measure(lambda: GetVectorsResponse.from_response(orjson.loads(content)), 3)))
+    loads = orjson.loads if orjson is not None else json.loads
+    timings.append(("columnar", measure(lambda: VectorPage.from_response(loads(content)), 3)))
+    report("get_vectors (10000 x 128)", timings)
+
+
+if __name__ == "__main__":
+    main()
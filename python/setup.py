@@ -17,9 +17,12 @@ setup(
         "requests>=2.25.1",
         "numpy>=1.21.0",
         "aiohttp>=3.8.5",
-        "aiofiles>=23.1.0",
-        "requests-toolbelt>=0.10.1"
+        "aiofiles>=23.1.0"
     ],
+    extras_require={
+        "fast": ["orjson>=3.6.0"],
+        "http2": ["httpx[http2]>=0.24.1"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
@@ -0,0 +1,136 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from asimplevectors.cache import SearchCache, SingleFlight, request_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class SearchCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("asimplevectors.cache.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_entries_expire_after_ttl(self):
+        cache = SearchCache(ttl=10)
+        cache.put("key", "space", [1])
+        self.clock.now += 9.9
+        self.assertEqual(cache.get("key"), [1])
+        self.clock.now += 0.2
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = SearchCache(max_entries=2)
+        cache.put("a", "space", 1)
+        cache.put("b", "space", 2)
+        cache.get("a")
+        cache.put("c", "space", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+
+    def test_invalidate_space_drops_only_that_space(self):
+        cache = SearchCache()
+        cache.put("a", "space1", 1)
+        cache.put("b", "space2", 2)
+        cache.invalidate_space("space1")
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_results_of_requests_overlapping_a_write_are_not_cached(self):
+        cache = SearchCache()
+        generation = cache.generation("space")
+        cache.invalidate_space("space")
+        cache.put("a", "space", 1, generation)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", "space", 1, cache.generation("space"))
+        self.assertEqual(cache.get("a"), 1)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            SearchCache(max_entries=0)
+
+
+class RequestKeyTest(unittest.TestCase):
+    def test_vectors_match_regardless_of_type(self):
+        as_list = request_key("search", "space", None, {"vector": [0.1, 0.2], "top_k": 5})
+        as_array = request_key("search", "space", None, {"top_k": 5, "vector": np.array([0.1, 0.2], dtype=np.float32)})
+        self.assertEqual(as_list, as_array)
+        hash(as_list)
+
+    def test_keys_differ_per_request(self):
+        base = request_key("search", "space", None, {"vector": [0.1, 0.2], "top_k": 5})
+        self.assertNotEqual(base, request_key("search", "space", None, {"vector": [0.1, 0.3], "top_k": 5}))
+        self.assertNotEqual(base, request_key("search", "space", None, {"vector": [0.1, 0.2], "top_k": 6}))
+        self.assertNotEqual(base, request_key("search", "space", 2, {"vector": [0.1, 0.2], "top_k": 5}))
+        self.assertNotEqual(base, request_key("rerank", "space", None, {"vector": [0.1, 0.2], "top_k": 5}))
+        self.assertNotEqual(base, request_key("search", "other", None, {"vector": [0.1, 0.2], "top_k": 5}))
+
+
+
+class SingleFlightTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_calls_share_one_fetch(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return object()
+
+        results = await asyncio.gather(*(single_flight.do("key", fetch) for _ in range(5)))
+        other = await single_flight.do("other", fetch)
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertIsNot(other, results[0])
+        self.assertEqual(len(single_flight), 0)
+
+    async def test_errors_reach_every_caller_and_are_not_kept(self):
+        single_flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(*(single_flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+        async def succeed():
+            return 1
+        self.assertEqual(await single_flight.do("key", succeed), 1)
+
+    async def test_cancelling_one_caller_keeps_the_shared_call(self):
+        single_flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(single_flight.do("key", fetch))
+        second = asyncio.ensure_future(single_flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        self.assertEqual(await second, "done")
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+
+
+if __name__ == "__main__":
+    unittest.main()
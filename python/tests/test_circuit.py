@@ -0,0 +1,99 @@
+import unittest
+from unittest import mock
+
+from asimplevectors.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, endpoint_of
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 100.0
+        patcher = mock.patch("asimplevectors.circuit.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_consecutive_failures_open_the_circuit(self):
+        breaker = CircuitBreaker(failure_threshold=3, min_requests=100)
+        breaker.on_failure()
+        breaker.on_failure()
+        breaker.on_success()
+        breaker.on_failure()
+        breaker.on_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertTrue(breaker.allow())
+        breaker.on_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.times_opened, 1)
+
+    def test_error_rate_opens_the_circuit(self):
+        breaker = CircuitBreaker(failure_threshold=100, error_rate_threshold=0.5, window=10, min_requests=10)
+        for _ in range(4):
+            breaker.on_success()
+            breaker.on_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.on_success()
+        breaker.on_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_half_open_probe_closes_on_success(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5)
+        breaker.on_failure()
+        self.now += 4.9
+        self.assertFalse(breaker.allow())
+        self.assertFalse(breaker.try_probe())
+        self.now += 0.2
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.try_probe())
+        # Only one probe at a time.
+        self.assertFalse(breaker.try_probe())
+        breaker.on_success()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.consecutive_failures, 0)
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5)
+        breaker.on_failure()
+        self.now += 5
+        breaker.allow()
+        self.assertTrue(breaker.try_probe())
+        breaker.on_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertEqual(breaker.times_opened, 2)
+        self.now += 4
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_late_outcomes_while_open_are_ignored(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5)
+        breaker.on_failure()
+        self.now += 3
+        # Requests sent before the circuit opened finish afterwards.
+        breaker.on_success()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow())
+        breaker.on_failure()
+        self.assertEqual(breaker.times_opened, 1)
+        self.now += 2
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.try_probe())
+        breaker.on_success()
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            CircuitBreaker(failure_threshold=0)
+        with self.assertRaises(ValueError):
+            CircuitBreaker(error_rate_threshold=0)
+
+
+class EndpointTest(unittest.TestCase):
+    def test_endpoint_of(self):
+        self.assertEqual(endpoint_of("http://node1:21001/api/space/docs/search"), "http://node1:21001")
+        self.assertEqual(endpoint_of("https://node1:21001"), "https://node1:21001")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import logging
 import asyncio
 import unittest
+import numpy as np
 from asimplevectors.client import ASimpleVectorsClient
 
 class RegressionTest(unittest.TestCase):
@@ -9,7 +10,8 @@ class RegressionTest(unittest.TestCase):
         """
         Set up the ASimpleVectorsClient with a live endpoint.
         """
-        cls.loop = asyncio.get_event_loop()
+        cls.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(cls.loop)
         cls.client = ASimpleVectorsClient(host="localhost", port=21001)
 
         # Configure logging
@@ -24,9 +26,10 @@ class RegressionTest(unittest.TestCase):
         """
         Close the ASimpleVectorsClient session after tests.
         """
-        # Run the `close` coroutine using the existing event loop
+        # Run the `close` coroutine on the class event loop
         cls.loop.run_until_complete(cls.client.close())
         cls.loop.close()
+        asyncio.set_event_loop(None)
 
     async def log(self, test_name, step, message):
         print(f"[{test_name} - Step {step}] {message}")
@@ -129,11 +132,71 @@ class RegressionTest(unittest.TestCase):
             self.assertIsNotNone(vectors)
             self.assertGreater(len(vectors.vectors), 0)
 
-            await self.log(test_name, 4, f"Deleting space: {space_request['name']}.")
+            await self.log(test_name, 4, "Iterating vectors by version.")
+            ids = [vector.id async for vector in self.client.iter_vectors_by_version("vector_test_space", 1, page_size=1)]
+            self.assertEqual(sorted(ids), [1, 2])
+
+            await self.log(test_name, 5, f"Deleting space: {space_request['name']}.")
             await self.client.delete_space("vector_test_space")
 
         self.loop.run_until_complete(test())
 
+    def test_bulk_upsert_operations(self):
+        """
+        Test chunked bulk upsert of vectors.
+        """
+        async def test():
+            test_name = "test_bulk_upsert_operations"
+            space_request = {"name": "bulk_test_space", "dimension": 3, "metric": "L2"}
+            vectors = [
+                {"id": i + 1, "data": [0.1 * i, 0.2 * i, 0.3 * i], "metadata": {"label": f"bulk_{i}"}}
+                for i in range(25)
+            ]
+
+            await self.log(test_name, 1, f"Creating space: {space_request['name']}.")
+            await self.client.create_space(space_request)
+
+            await self.log(test_name, 2, "Bulk upserting vectors.")
+            results = await self.client.upsert_vectors_bulk("bulk_test_space", vectors, batch_size=10, concurrency=2)
+            self.assertEqual(len(results), 3)
+            self.assertTrue(all(result.success for result in results))
+
+            await self.log(test_name, 3, "Retrieving vectors by version.")
+            response = await self.client.get_vectors_by_version("bulk_test_space", version_id=1, start=0, limit=100)
+            self.assertEqual(response.total_count, 25)
+
+            await self.log(test_name, 4, f"Deleting space: {space_request['name']}.")
+            await self.client.delete_space("bulk_test_space")
+
+        self.loop.run_until_complete(test())
+
+    def test_matrix_upsert_operations(self):
+        """
+        Test upserting vectors from a 2-D numpy matrix.
+        """
+        async def test():
+            test_name = "test_matrix_upsert_operations"
+            space_request = {"name": "matrix_test_space", "dimension": 3, "metric": "L2"}
+            matrix = np.random.rand(20, 3).astype(np.float32)
+            ids = np.arange(1, 21)
+
+            await self.log(test_name, 1, f"Creating space: {space_request['name']}.")
+            await self.client.create_space(space_request)
+
+            await self.log(test_name, 2, "Upserting matrix.")
+            results = await self.client.upsert_matrix("matrix_test_space", ids, matrix, batch_size=8)
+            self.assertEqual([result.count for result in results], [8, 8, 4])
+            self.assertTrue(all(result.success for result in results))
+
+            await self.log(test_name, 3, "Upserting matrix with a wrong dimension.")
+            with self.assertRaises(ValueError):
+                await self.client.upsert_matrix("matrix_test_space", ids, np.zeros((20, 4), dtype=np.float32))
+
+            await self.log(test_name, 4, f"Deleting space: {space_request['name']}.")
+            await self.client.delete_space("matrix_test_space")
+
+        self.loop.run_until_complete(test())
+
     def test_search_operations(self):
         """
         Test vector search functionality.
@@ -159,7 +222,13 @@ class RegressionTest(unittest.TestCase):
             results = await self.client.search("search_test_space", search_request)
             self.assertIsNotNone(results)
 
-            await self.log(test_name, 4, f"Deleting space: {space_request['name']}.")
+            await self.log(test_name, 4, "Performing multi-query vector search.")
+            queries = np.array([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], dtype=np.float32)
+            batch_results = await self.client.search_many("search_test_space", queries, top_k=1)
+            self.assertEqual(batch_results.ids.shape, (2, 1))
+            self.assertEqual(batch_results.ids[:, 0].tolist(), [1, 2])
+
+            await self.log(test_name, 5, f"Deleting space: {space_request['name']}.")
             await self.client.delete_space("search_test_space")
 
         self.loop.run_until_complete(test())
@@ -0,0 +1,1053 @@
+"""
+Client tests that run against an httpx.MockTransport instead of a live server.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+import unittest
+from typing import Optional
+
+import httpx
+import numpy as np
+import pydantic
+
+from asimplevectors.circuit import CircuitOpenError
+from asimplevectors.client import ASimpleVectorsClient, SnapshotIntegrityError, VectorScanLimitError
+from asimplevectors.ingest import FileCheckpointStore
+from asimplevectors.models import SearchResponse, SearchTarget, VersionResponse
+
+
+def mock_client(handler, nodes=None, **config) -> ASimpleVectorsClient:
+    """
+    Client whose sessions, including the per-node sessions of a cluster, are served by `handler`.
+    """
+    config.setdefault("retry", False)
+    client = ASimpleVectorsClient(host="localhost", config=config, nodes=nodes)
+    client._session_options["transport"] = httpx.MockTransport(handler)
+    client.session = client._create_session()
+    return client
+
+
+def json_body(request: httpx.Request):
+    return json.loads(request.content) if request.content else None
+
+
+class ConnectionPoolTest(unittest.IsolatedAsyncioTestCase):
+    def test_pool_limits_from_config(self):
+        client = ASimpleVectorsClient(
+            host="localhost", config={"max_connections": 16, "max_keepalive_connections": 4, "keepalive_expiry": 5}
+        )
+        limits = client._session_options["limits"]
+        self.assertEqual(limits.max_connections, 16)
+        self.assertEqual(limits.max_keepalive_connections, 4)
+        self.assertEqual(limits.keepalive_expiry, 5)
+        self.assertFalse(client._session_options["http2"])
+
+    async def test_operation_timeouts(self):
+        timeouts = {}
+
+        async def handler(request):
+            timeouts[request.url.path] = request.extensions["timeout"]
+            if request.url.path.endswith("/search"):
+                return httpx.Response(200, json=[])
+            return httpx.Response(200, json={"result": "success"})
+
+        client = mock_client(handler, search_timeout=1.5, ingest_timeout={"read": 300})
+        await client.search_vector("space", {"vector": [0.1, 0.2]})
+        await client.upsert_vector("space", {"vectors": [{"id": 1, "data": [0.1, 0.2]}]})
+        await client.close()
+
+        self.assertEqual(timeouts["/api/space/space/search"]["read"], 1.5)
+        self.assertEqual(timeouts["/api/space/space/vector"]["read"], 300)
+        self.assertEqual(timeouts["/api/space/space/vector"]["connect"], 5.0)
+
+
+
+class SnapshotUploadTest(unittest.IsolatedAsyncioTestCase):
+    async def test_upload_streams_multipart_body(self):
+        data = bytes(range(256)) * 40
+        received = {}
+
+        async def handler(request):
+            received["headers"] = request.headers
+            received["body"] = await request.aread()
+            return httpx.Response(200, text="restored")
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "snapshot-1.zip")
+            with open(file_path, "wb") as f:
+                f.write(data)
+            progress = []
+            client = mock_client(handler)
+            await client.upload_restore_snapshot(file_path, chunk_size=1000, progress=lambda sent, total: progress.append((sent, total)))
+            await client.close()
+
+        boundary = received["headers"]["Content-Type"].split("boundary=")[1]
+        body = received["body"]
+        self.assertEqual(int(received["headers"]["Content-Length"]), len(body))
+        self.assertTrue(body.startswith(f"--{boundary}\r\n".encode()))
+        self.assertIn(b'filename="snapshot-1.zip"', body)
+        self.assertTrue(body.endswith(f"\r\n--{boundary}--\r\n".encode()))
+        self.assertEqual(body.split(b"\r\n\r\n", 1)[1][:len(data)], data)
+        # One progress call per chunk, ending at the file size.
+        self.assertEqual(len(progress), 11)
+        self.assertEqual(progress[-1], (len(data), len(data)))
+
+
+
+class SnapshotServer:
+    """
+    Serves a snapshot file with optional Range support and can fail one range request once.
+    Partial responses carry at most `max_reply` bytes, and requests starting at `stall_from`
+    or later get empty partial responses.
+    """
+    def __init__(
+        self,
+        data: bytes,
+        ranges: bool = True,
+        fail_at: Optional[int] = None,
+        max_reply: Optional[int] = None,
+        stall_from: Optional[int] = None
+    ):
+        self.data = data
+        self.ranges = ranges
+        self.fail_at = fail_at
+        self.max_reply = max_reply
+        self.stall_from = stall_from
+        self.requested = []
+
+    async def __call__(self, request):
+        header = request.headers.get("Range")
+        self.requested.append(header)
+        if not header or not self.ranges:
+            return httpx.Response(200, content=self.data)
+        start, _, end = header[len("bytes="):].partition("-")
+        start = int(start)
+        end = int(end) if end else len(self.data) - 1
+        if start >= len(self.data):
+            return httpx.Response(416)
+        if self.fail_at is not None and start <= self.fail_at <= end:
+            self.fail_at = None
+            # Fail after the other ranges had time to complete.
+            await asyncio.sleep(0.2)
+            raise httpx.ReadError("connection reset")
+        if self.max_reply is not None:
+            end = min(end, start + self.max_reply - 1)
+        if self.stall_from is not None and start >= self.stall_from and start > 0:
+            return httpx.Response(206, content=b"", headers={"Content-Range": f"bytes {start}-{end}/{len(self.data)}"})
+        return httpx.Response(
+            206, content=self.data[start:end + 1],
+            headers={"Content-Range": f"bytes {start}-{end}/{len(self.data)}"}
+        )
+
+
+class SnapshotDownloadTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.data = np.random.default_rng(0).integers(0, 256, size=100000, dtype=np.uint8).tobytes()
+        self.checksum = hashlib.sha256(self.data).hexdigest()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    async def download(self, server, **kwargs):
+        client = mock_client(server)
+        try:
+            return await client.download_snapshot("20240101", self.directory.name, **kwargs)
+        finally:
+            await client.close()
+
+    async def test_parallel_ranges_with_checksum(self):
+        server = SnapshotServer(self.data)
+        path = await self.download(server, parallel=4, chunk_size=4096, checksum=self.checksum)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+        # One probe plus one request per range.
+        self.assertEqual(len(server.requested), 5)
+        self.assertEqual(os.listdir(self.directory.name), ["snapshot-20240101.zip"])
+
+    async def test_interrupted_ranges_resume(self):
+        server = SnapshotServer(self.data, fail_at=60000)
+        with self.assertRaises(httpx.ReadError):
+            await self.download(server, parallel=4, chunk_size=4096)
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, "snapshot-20240101.zip.part.json")))
+
+        server.requested.clear()
+        path = await self.download(server, parallel=4, chunk_size=4096, checksum=self.checksum)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+        # Only the range that failed is fetched again.
+        self.assertEqual(server.requested, ["bytes=0-0", "bytes=50000-74999"])
+
+    async def test_short_partial_responses_are_continued(self):
+        server = SnapshotServer(self.data, max_reply=10000)
+        path = await self.download(server, parallel=4, expected_size=len(self.data))
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+        # Each 25000 byte range takes three capped replies.
+        self.assertEqual(len(server.requested), 1 + 4 * 3)
+
+    async def test_incomplete_ranges_fail_and_resume(self):
+        server = SnapshotServer(self.data, max_reply=10000, stall_from=60000)
+        with self.assertRaises(SnapshotIntegrityError):
+            await self.download(server, parallel=4, expected_size=len(self.data))
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)), ["snapshot-20240101.zip.part", "snapshot-20240101.zip.part.json"]
+        )
+
+        server.stall_from = None
+        server.requested.clear()
+        path = await self.download(server, parallel=4, checksum=self.checksum)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertEqual(server.requested[:3], ["bytes=0-0", "bytes=60000-74999", "bytes=75000-99999"])
+
+    async def test_mismatched_content_range_is_rejected(self):
+        async def handler(request):
+            header = request.headers["Range"]
+            if header == "bytes=0-0":
+                return httpx.Response(206, content=self.data[:1], headers={"Content-Range": f"bytes 0-0/{len(self.data)}"})
+            # Always answers with the start of the file.
+            return httpx.Response(206, content=self.data[:100], headers={"Content-Range": f"bytes 0-99/{len(self.data)}"})
+
+        with self.assertRaises(httpx.HTTPError):
+            await self.download(handler, parallel=4)
+        self.assertNotIn("snapshot-20240101.zip", os.listdir(self.directory.name))
+
+    async def test_sequential_resume_from_partial_file(self):
+        with open(os.path.join(self.directory.name, "snapshot-20240101.zip.part"), "wb") as f:
+            f.write(self.data[:30000])
+        server = SnapshotServer(self.data)
+        path = await self.download(server, checksum=self.checksum)
+        self.assertEqual(server.requested, ["bytes=30000-"])
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+
+    async def test_server_without_range_support(self):
+        server = SnapshotServer(self.data, ranges=False)
+        path = await self.download(server, parallel=4, expected_size=len(self.data))
+        self.assertEqual(len(server.requested), 2)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+
+    async def test_checksum_mismatch(self):
+        with self.assertRaises(SnapshotIntegrityError):
+            await self.download(SnapshotServer(self.data), checksum="0" * 64)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+
+
+def vectors_handler(
+    total_count: int,
+    dimension: int = 4,
+    delay: float = 0.0,
+    requests: Optional[list] = None,
+    max_rows: Optional[int] = None
+):
+    """
+    Handler serving the get_vectors pages of a version with `total_count` vectors; vector i is filled with i.
+    Pages are capped at `max_rows` rows like a server with a maximum page size.
+    """
+    async def handler(request):
+        start = int(request.url.params.get("start", 0))
+        limit = int(request.url.params.get("limit", total_count))
+        if max_rows is not None:
+            limit = min(limit, max_rows)
+        if requests is not None:
+            requests.append(start)
+        if delay:
+            await asyncio.sleep(delay)
+        vectors = [
+            {"id": i, "data": {"data": [float(i)] * dimension}, "metadata": {"n": i}}
+            for i in range(start, min(start + limit, total_count))
+        ]
+        return httpx.Response(200, json={"vectors": vectors, "total_count": total_count})
+    return handler
+
+
+class VectorIteratorTest(unittest.IsolatedAsyncioTestCase):
+    async def test_iterates_all_rows_in_order(self):
+        client = mock_client(vectors_handler(250))
+        ids = [vector.id async for vector in client.iter_vectors_by_version("space", 1, page_size=40, prefetch=3)]
+        self.assertEqual(ids, list(range(250)))
+
+        pages = [page async for page in client.iter_vectors_by_version("space", 1, page_size=100, as_numpy=True)]
+        self.assertEqual([page.start for page in pages], [0, 100, 200])
+        np.testing.assert_array_equal(np.concatenate([page.ids for page in pages]), np.arange(250))
+        self.assertEqual(pages[2].vectors.shape, (50, 4))
+        await client.close()
+
+    async def test_short_pages_do_not_skip_rows(self):
+        client = mock_client(vectors_handler(250, max_rows=30))
+        ids = [vector.id async for vector in client.iter_vectors_by_version("space", 1, page_size=40, prefetch=3)]
+        self.assertEqual(ids, list(range(250)))
+
+        pages = [page async for page in client.iter_vectors_by_version("space", 1, page_size=100, as_numpy=True)]
+        np.testing.assert_array_equal(np.concatenate([page.ids for page in pages]), np.arange(250))
+        self.assertEqual([page.start for page in pages], list(range(0, 250, 30)))
+
+        pages = [page async for page in client.iter_vectors_by_version("space", 1, page_size=100, as_numpy=True, limit=70)]
+        np.testing.assert_array_equal(np.concatenate([page.ids for page in pages]), np.arange(70))
+        await client.close()
+
+    async def test_early_exit_cancels_prefetched_pages(self):
+        requests = []
+        client = mock_client(vectors_handler(1000, delay=0.05, requests=requests))
+        iterator = client.iter_vectors_by_version("space", 1, page_size=100, prefetch=3)
+        async for vector in iterator:
+            if vector.id == 5:
+                # Let the prefetched requests reach the server before leaving.
+                await asyncio.sleep(0.01)
+                break
+        await iterator.aclose()
+
+        others = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        self.assertEqual(others, [])
+        self.assertEqual(requests, [0, 100, 200, 300])
+        await client.close()
+
+
+
+class ExportVersionTest(unittest.IsolatedAsyncioTestCase):
+    async def test_export_to_npy_files(self):
+        requests = []
+        client = mock_client(vectors_handler(250, dimension=3, requests=requests))
+        with tempfile.TemporaryDirectory() as directory:
+            result = await client.export_version("space", 1, os.path.join(directory, "out", "v1"), page_size=40, concurrency=3)
+            ids = np.load(result.ids_path)
+            vectors = np.load(result.vectors_path, mmap_mode="r")
+            with open(result.metadata_path) as f:
+                metadata = [json.loads(line) for line in f]
+            self.assertEqual(sorted(os.listdir(os.path.join(directory, "out"))), ["v1.ids.npy", "v1.metadata.jsonl", "v1.vectors.npy"])
+            np.testing.assert_array_equal(ids, np.arange(250))
+            self.assertEqual(vectors.dtype, np.float32)
+            np.testing.assert_array_equal(vectors[:, 0], np.arange(250, dtype=np.float32))
+            del vectors
+        await client.close()
+
+        self.assertEqual((result.total_count, result.count, result.dimension), (250, 250, 3))
+        self.assertEqual(metadata, [{"n": i} for i in range(250)])
+        # The first page is reused by the first partition; every other row is fetched exactly once.
+        self.assertEqual(len(requests), len(set(requests)))
+        self.assertTrue(result.complete)
+
+    async def export(self, handler, **kwargs):
+        client = mock_client(handler)
+        with tempfile.TemporaryDirectory() as directory:
+            result = await client.export_version("space", 1, os.path.join(directory, "v1"), **kwargs)
+            ids = np.load(result.ids_path)
+            vectors = np.load(result.vectors_path)
+            with open(result.metadata_path) as f:
+                metadata = [json.loads(line) for line in f]
+        await client.close()
+        return result, ids, vectors, metadata
+
+    async def test_short_pages_are_continued(self):
+        result, ids, vectors, metadata = await self.export(vectors_handler(250, max_rows=30), page_size=40, concurrency=3)
+        self.assertEqual((result.count, result.complete), (250, True))
+        np.testing.assert_array_equal(ids, np.arange(250))
+        np.testing.assert_array_equal(vectors[:, 0], np.arange(250, dtype=np.float32))
+        self.assertEqual(metadata, [{"n": i} for i in range(250)])
+
+    async def test_missing_rows_keep_the_files_aligned(self):
+        serve = vectors_handler(250)
+
+        async def handler(request):
+            # Nothing comes back from offset 110 to the end of the first partition [0, 125).
+            if int(request.url.params.get("start", 0)) in range(101, 125):
+                return httpx.Response(200, json={"vectors": [], "total_count": 250})
+            return await serve(request)
+
+        result, ids, vectors, metadata = await self.export(handler, page_size=10, concurrency=2)
+        self.assertEqual((result.total_count, result.count, result.complete), (250, 235, False))
+        self.assertEqual(len(metadata), 250)
+        np.testing.assert_array_equal(ids[:110], np.arange(110))
+        self.assertTrue((ids[110:125] == -1).all())
+        self.assertEqual(metadata[110:125], [None] * 15)
+        np.testing.assert_array_equal(ids[125:], np.arange(125, 250))
+        self.assertEqual(metadata[125:], [{"n": i} for i in range(125, 250)])
+
+
+
+class SearchCacheClientTest(unittest.IsolatedAsyncioTestCase):
+    async def test_write_invalidates_cached_searches(self):
+        searches = []
+
+        async def handler(request):
+            if request.url.path.endswith("/search"):
+                searches.append(request.url.path)
+                return httpx.Response(200, json=[{"distance": 0.1, "label": len(searches)}])
+            return httpx.Response(200, json={"result": "success"})
+
+        client = mock_client(handler, search_cache=True)
+        request = {"vector": [0.1, 0.2], "top_k": 1}
+        first = await client.search_vector("space", request)
+        second = await client.search_vector("space", request)
+        other = await client.search_vector("other", request)
+        self.assertEqual([result.label for result in first + second], [1, 1])
+        self.assertEqual(len(searches), 2)
+
+        await client.upsert_vector("space", {"vectors": [{"id": 1, "data": [0.1, 0.2]}]})
+        third = await client.search_vector("space", request)
+        self.assertEqual(third[0].label, 3)
+        # The write only invalidated its own space.
+        self.assertEqual((await client.search_vector("other", request))[0].label, other[0].label)
+        self.assertEqual(len(searches), 3)
+        await client.close()
+
+
+    async def test_coalesced_identical_searches(self):
+        searches = []
+
+        async def handler(request):
+            searches.append(json_body(request))
+            await asyncio.sleep(0.02)
+            return httpx.Response(200, json=[{"distance": 0.1, "label": 1}])
+
+        client = mock_client(handler, coalesce_reads=True)
+        results = await asyncio.gather(*(client.search_vector("space", {"vector": [0.1, 0.2]}) for _ in range(5)))
+        await client.search_vector("space", {"vector": [0.3, 0.2]})
+        self.assertEqual(len(searches), 2)
+        self.assertEqual([result[0].label for result in results], [1] * 5)
+        await client.close()
+
+
+
+def metrics_payload(members, leader):
+    """
+    /cluster/metrics answer for `members` ({node_id: "host:port"}) with `leader` as current leader.
+    """
+    return {"Ok": {
+        "id": 1, "current_term": 1, "state": "Leader", "current_leader": leader,
+        "membership_config": {"membership": {"nodes": {
+            str(node_id): {"api_addr": address} for node_id, address in members.items()
+        }}}
+    }}
+
+
+class ClusterRoutingTest(unittest.IsolatedAsyncioTestCase):
+    members = {1: "localhost:21001", 2: "node2:21001", 3: "node3:21001"}
+
+    async def test_writes_go_to_the_leader(self):
+        requests = []
+
+        async def handler(request):
+            if request.url.path == "/cluster/metrics":
+                return httpx.Response(200, json=metrics_payload(self.members, leader=3))
+            requests.append((request.method, request.url.host, request.url.path))
+            if request.url.path.endswith("/search"):
+                return httpx.Response(200, json=[])
+            return httpx.Response(200, json={"result": "success"})
+
+        client = mock_client(handler, nodes=["node2:21001"])
+        await client.upsert_vector("space", {"vectors": [{"id": 1, "data": [0.1]}]})
+        await client.create_space({"name": "other", "dimension": 1})
+        await client.search_vector("space", {"vector": [0.1]})
+        await client.close()
+
+        self.assertEqual(requests, [
+            ("POST", "node3", "/api/space/space/vector"),
+            ("POST", "node3", "/api/space"),
+            # Reads without load balancing stay on the configured host.
+            ("POST", "localhost", "/api/space/space/search"),
+        ])
+
+    async def test_write_moves_to_the_new_leader(self):
+        leader = {"id": 2}
+        requests = []
+
+        async def handler(request):
+            if request.url.path == "/cluster/metrics":
+                return httpx.Response(200, json=metrics_payload(self.members, leader=leader["id"]))
+            requests.append(request.url.host)
+            if request.url.host == "node2":
+                # The old leader stepped down.
+                leader["id"] = 3
+                return httpx.Response(503)
+            return httpx.Response(200, json={"result": "success"})
+
+        client = mock_client(handler, nodes=["node2:21001"])
+        await client.upsert_vector("space", {"vectors": [{"id": 1, "data": [0.1]}]})
+        await client.close()
+        self.assertEqual(requests, ["node2", "node3"])
+        self.assertEqual(client.topology.leader.address, "node3:21001")
+
+
+    async def test_balanced_reads_skip_a_failing_node(self):
+        hosts = []
+
+        async def handler(request):
+            if request.url.path == "/cluster/metrics":
+                return httpx.Response(200, json=metrics_payload(self.members, leader=1))
+            hosts.append(request.url.host)
+            if request.url.host == "node2":
+                return httpx.Response(503)
+            return httpx.Response(200, json=[{"distance": 0.1, "label": 1}])
+
+        random.seed(0)
+        client = mock_client(handler, nodes=["node2:21001"], load_balance_reads={"failure_threshold": 1, "ejection_time": 60})
+        for _ in range(20):
+            results = await client.search_vector("space", {"vector": [0.1]})
+            self.assertEqual(results[0].label, 1)
+        await client.close()
+
+        # Reads are spread over the cluster; node2 fails once, is ejected and not used again.
+        self.assertEqual(hosts.count("node2"), 1)
+        self.assertGreater(hosts.count("localhost"), 0)
+        self.assertGreater(hosts.count("node3"), 0)
+
+
+
+class HedgedSearchTest(unittest.IsolatedAsyncioTestCase):
+    async def test_slow_search_is_hedged(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(len(calls))
+            if len(calls) == 1:
+                await asyncio.sleep(5)
+            return httpx.Response(200, json=[{"distance": 0.1, "label": len(calls)}])
+
+        client = mock_client(handler, hedge_reads={"max_delay": 0.02})
+        started = asyncio.get_running_loop().time()
+        results = await client.search_vector("space", {"vector": [0.1]})
+        elapsed = asyncio.get_running_loop().time() - started
+        await client.close()
+
+        self.assertEqual(results[0].label, 2)
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual((client.hedge_policy.hedges_sent, client.hedge_policy.hedges_won), (1, 1))
+
+    async def test_fast_search_is_not_hedged(self):
+        async def handler(request):
+            return httpx.Response(200, json=[{"distance": 0.1, "label": 1}])
+
+        client = mock_client(handler, hedge_reads={"max_delay": 0.5})
+        for _ in range(5):
+            await client.search_vector("space", {"vector": [0.1]})
+        await client.close()
+        self.assertEqual(client.hedge_policy.hedges_sent, 0)
+        self.assertEqual(client.hedge_policy.latencies.count("search"), 5)
+
+
+
+class RetryClientTest(unittest.IsolatedAsyncioTestCase):
+    async def test_retries_are_off_by_default(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(503)
+
+        client = ASimpleVectorsClient(host="localhost")
+        self.assertIsNone(client.retry_policy)
+        await client.close()
+
+        client = mock_client(handler, retry=None)
+        with self.assertRaises(httpx.HTTPStatusError):
+            await client.search_vector("space", {"vector": [0.1]})
+        await client.close()
+        self.assertEqual(len(calls), 1)
+
+    async def test_transient_errors_are_retried(self):
+        statuses = [503, 429, 200]
+
+        async def handler(request):
+            status = statuses.pop(0)
+            return httpx.Response(status, json=[{"distance": 0.1, "label": 1}] if status == 200 else None)
+
+        client = mock_client(handler, retry={"backoff_base": 0.001})
+        results = await client.search_vector("space", {"vector": [0.1]})
+        await client.close()
+        self.assertEqual(results[0].label, 1)
+        self.assertEqual(client.retry_policy.retries, 2)
+
+    async def test_writes_are_not_retried_after_sending(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.path)
+            raise httpx.ReadTimeout("slow", request=request)
+
+        client = mock_client(handler, retry={"backoff_base": 0.001})
+        with self.assertRaises(httpx.ReadTimeout):
+            await client.create_space({"name": "space", "dimension": 4})
+        await client.close()
+        self.assertEqual(calls, ["/api/space"])
+
+    async def test_snapshot_download_uses_retry_policy(self):
+        data = b"snapshot" * 1000
+        statuses = [503]
+
+        async def handler(request):
+            if statuses:
+                return httpx.Response(statuses.pop(0))
+            return httpx.Response(200, content=data)
+
+        client = mock_client(handler, retry={"backoff_base": 0.001})
+        with tempfile.TemporaryDirectory() as directory:
+            path = await client.download_snapshot("20240101", directory)
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), data)
+        await client.close()
+        self.assertEqual(client.retry_policy.retries, 1)
+
+
+
+class CircuitBreakerClientTest(unittest.IsolatedAsyncioTestCase):
+    async def test_open_circuit_fails_fast_until_the_probe_succeeds(self):
+        calls = []
+        healthy = {"value": False}
+
+        async def handler(request):
+            calls.append(request.url.path)
+            if not healthy["value"]:
+                return httpx.Response(503)
+            if request.url.path == "/cluster/metrics":
+                return httpx.Response(200, json={})
+            return httpx.Response(200, json=[{"distance": 0.1, "label": 1}])
+
+        client = mock_client(handler, circuit_breaker={"failure_threshold": 2, "reset_timeout": 0.05})
+        for _ in range(2):
+            with self.assertRaises(httpx.HTTPStatusError):
+                await client.search_vector("space", {"vector": [0.1]})
+        with self.assertRaises(CircuitOpenError):
+            await client.search_vector("space", {"vector": [0.1]})
+        with tempfile.TemporaryDirectory() as directory, self.assertRaises(CircuitOpenError):
+            await client.download_snapshot("20240101", directory)
+        self.assertEqual(len(calls), 2)
+
+        healthy["value"] = True
+        await asyncio.sleep(0.06)
+        results = await client.search_vector("space", {"vector": [0.1]})
+        await client.close()
+        self.assertEqual(results[0].label, 1)
+        self.assertEqual(calls[2:], ["/cluster/metrics", "/api/space/space/search"])
+
+
+
+class UpsertStreamTest(unittest.IsolatedAsyncioTestCase):
+    async def test_records_are_batched_lazily_and_failures_are_kept(self):
+        in_flight = {"now": 0, "max": 0}
+        bodies = []
+        produced = []
+
+        async def handler(request):
+            ids = [vector["id"] for vector in json_body(request)["vectors"]]
+            bodies.append(ids)
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            if 4 in ids:
+                return httpx.Response(500)
+            return httpx.Response(200, json={"result": "Success"})
+
+        async def records():
+            for i in range(30):
+                produced.append(i)
+                # Not yet sent: the batches submitted, one waiting for a slot and the current record.
+                self.assertLessEqual(len(produced) - sum(map(len, bodies)), (2 + 1) * 3 + 1)
+                yield i, np.full(4, i, dtype=np.float32), {"n": i}
+
+        client = mock_client(handler)
+        result = await client.upsert_stream("space", records(), batch_size=3, concurrency=2)
+        await client.close()
+
+        self.assertEqual(sorted(bodies), [list(range(start, start + 3)) for start in range(0, 30, 3)])
+        self.assertEqual(in_flight["max"], 2)
+        self.assertEqual((result.count, result.batch_count, result.failed_count), (27, 10, 3))
+        self.assertEqual([(batch.start, batch.count) for batch in result.failed_batches], [(3, 3)])
+
+    async def test_sync_iterables_and_dict_records(self):
+        received = []
+
+        async def handler(request):
+            received.extend(json_body(request)["vectors"])
+            return httpx.Response(200, json={"result": "Success"})
+
+        client = mock_client(handler)
+        records = iter([{"id": 1, "data": [0.5, 0.5]}, (2, [1.0, 0.0], None, "doc")])
+        result = await client.upsert_stream("space", records)
+        with self.assertRaises(ValueError):
+            await client.upsert_stream("space", [(1,)])
+        await client.close()
+
+        self.assertEqual(result.count, 2)
+        self.assertEqual(received, [{"id": 1, "data": [0.5, 0.5]}, {"id": 2, "data": [1.0, 0.0], "doc": "doc"}])
+
+
+
+class IngestionResumeTest(unittest.IsolatedAsyncioTestCase):
+    """
+    Stops an ingestion job partway and resumes it, checking which records are uploaded by each run.
+    """
+    def setUp(self):
+        self.uploaded = []
+        self.key_values = {}
+        self.rng = random.Random(0)
+
+    async def handler(self, request):
+        path = request.url.path
+        if "/key/" in path:
+            key = path.rsplit("/", 1)[1]
+            if request.method == "POST":
+                self.key_values[key] = request.content
+                return httpx.Response(200, json={"result": "Success"})
+            if key not in self.key_values:
+                return httpx.Response(404)
+            if request.method == "DELETE":
+                del self.key_values[key]
+                return httpx.Response(200, json={"result": "Success"})
+            return httpx.Response(200, content=self.key_values[key])
+        await asyncio.sleep(self.rng.random() * 0.005)
+        ids = [vector["id"] for vector in json_body(request)["vectors"]]
+        self.uploaded.append(ids)
+        return httpx.Response(200, json={"result": "Success"})
+
+    def uploaded_ids(self):
+        return [vector_id for ids in self.uploaded for vector_id in ids]
+
+    @staticmethod
+    async def records(count, crash_at=None, on_crash=None):
+        for i in range(count):
+            if i == crash_at:
+                if on_crash is not None:
+                    on_crash()
+                raise RuntimeError("crash")
+            yield i, [float(i), 0.0]
+
+    async def test_stopped_job_resumes_without_skips_or_duplicates(self):
+        with tempfile.TemporaryDirectory() as directory:
+            client = mock_client(self.handler)
+            job = client.ingestion_job("space", "job", checkpoint_dir=directory, batch_size=2, concurrency=3)
+            with self.assertRaises(RuntimeError):
+                await job.run(self.records(100, crash_at=51))
+            first_run = self.uploaded_ids()
+            # 25 batches finished; the 5 after the last periodic checkpoint are saved when the run stops.
+            self.assertEqual(sorted(first_run), list(range(50)))
+
+            job = client.ingestion_job("space", "job", checkpoint_dir=directory, batch_size=2, concurrency=3)
+            result = await job.run(self.records(100))
+            await client.close()
+
+        self.assertEqual(job.skipped_count, 50)
+        self.assertEqual((result.count, result.failed_count), (50, 0))
+        self.assertEqual(sorted(self.uploaded_ids()), list(range(100)))
+        self.assertEqual(job.committed, [[0, 100]])
+
+    async def test_killed_job_resends_only_batches_after_the_last_checkpoint(self):
+        class KilledStore(FileCheckpointStore):
+            killed = False
+
+            async def save(self, job_id, state):
+                # A killed process writes nothing after the crash.
+                if not self.killed:
+                    await super().save(job_id, state)
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = KilledStore(directory)
+            client = mock_client(self.handler)
+            job = client.ingestion_job("space", "job", store=store, batch_size=2, concurrency=1)
+
+            def kill():
+                store.killed = True
+
+            with self.assertRaises(RuntimeError):
+                await job.run(self.records(100, crash_at=31, on_crash=kill))
+            first_run = self.uploaded_ids()
+            self.assertEqual(first_run, list(range(30)))
+
+            job = client.ingestion_job("space", "job", checkpoint_dir=directory, batch_size=2, concurrency=1)
+            await job.run(self.records(100))
+            await client.close()
+
+        # Only the 10 batches checkpointed before the crash are skipped; the 5 that finished later are sent again.
+        self.assertEqual(job.skipped_count, 20)
+        self.assertEqual(self.uploaded_ids()[len(first_run):], list(range(20, 100)))
+
+    async def test_key_value_store_keeps_failed_batches_pending(self):
+        async def handler(request):
+            if request.method == "POST" and request.url.path.endswith("/vector"):
+                if 5 in [vector["id"] for vector in json_body(request)["vectors"]]:
+                    return httpx.Response(500)
+            return await self.handler(request)
+
+        client = mock_client(handler)
+        job = client.ingestion_job("space", "job", batch_size=4, checkpoint_every=1)
+        await job.reset()
+        result = await job.run(self.records(12))
+        self.assertEqual(result.failed_count, 4)
+        self.assertEqual(json.loads(self.key_values["ingest-checkpoint-job"])["committed"], [[0, 4], [8, 12]])
+
+        client._session_options["transport"] = httpx.MockTransport(self.handler)
+        client.session = client._create_session()
+        self.uploaded.clear()
+        job = client.ingestion_job("space", "job", batch_size=4)
+        result = await job.run(self.records(12))
+        self.assertEqual(self.uploaded, [[4, 5, 6, 7]])
+        self.assertEqual((result.count, job.skipped_count, job.committed), (4, 8, [[0, 12]]))
+
+        with self.assertRaises(ValueError):
+            await client.ingestion_job("space", "job", batch_size=8).run(self.records(12))
+        await job.reset()
+        await client.close()
+        self.assertEqual(self.key_values, {})
+
+
+
+class EmbedAndUpsertTest(unittest.IsolatedAsyncioTestCase):
+    @staticmethod
+    def embed(texts):
+        # The first batch is the slowest, so batches finish encoding out of input order.
+        time.sleep(0.05 if "doc 0" in texts else 0.0)
+        return np.array([[float(text.split()[1]), 1.0] for text in texts], dtype=np.float32)
+
+    async def test_batch_offsets_follow_the_input_order(self):
+        received = {}
+
+        async def handler(request):
+            vectors = json_body(request)["vectors"]
+            received.update({vector["id"]: vector for vector in vectors})
+            if vectors[0]["id"] in (0, 6):
+                return httpx.Response(500)
+            return httpx.Response(200, json={"result": "Success"})
+
+        client = mock_client(handler)
+        documents = [(i, f"doc {i}", {"n": i}) for i in range(10)]
+        result = await client.embed_and_upsert(
+            "space", documents, self.embed, batch_size=3, encode_workers=3, tokenize=str.split
+        )
+        await client.close()
+
+        self.assertEqual(sorted((batch.start, batch.count) for batch in result.failed_batches), [(0, 3), (6, 3)])
+        self.assertEqual((result.count, result.failed_count), (4, 6))
+        self.assertEqual(received[7], {"id": 7, "data": [7.0, 1.0], "metadata": {"n": 7}, "doc": "doc 7", "doc_tokens": ["doc", "7"]})
+        self.assertEqual((result.encode.items, result.encode.batches), (10, 4))
+
+    async def test_upload_throughput_uses_stage_wall_clock(self):
+        async def handler(request):
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"result": "Success"})
+
+        client = mock_client(handler)
+        documents = [(i, f"doc {i}") for i in range(16)]
+        result = await client.embed_and_upsert("space", documents, self.embed, batch_size=2, upload_concurrency=8)
+        await client.close()
+
+        upload = result.upload
+        self.assertEqual((upload.items, upload.batches), (16, 8))
+        # Eight concurrent uploads of 0.05s each overlap, so the stage is busy far longer than it runs.
+        self.assertGreater(upload.busy_seconds, 2 * upload.wall_seconds)
+        self.assertAlmostEqual(upload.items_per_second, 16 / upload.wall_seconds)
+        self.assertGreater(upload.items_per_second, 16 / upload.busy_seconds * 2)
+
+    async def test_embed_with_wrong_shape_fails(self):
+        async def handler(request):
+            return httpx.Response(200, json={"result": "Success"})
+
+        client = mock_client(handler)
+        with self.assertRaises(ValueError):
+            await client.embed_and_upsert("space", [(1, "doc 1"), (2, "doc 2")], lambda texts: np.zeros((1, 2)))
+        await client.close()
+
+
+
+class ResponseParsingTest(unittest.IsolatedAsyncioTestCase):
+    async def test_bodies_are_parsed_into_models(self):
+        version = {"id": 2, "name": "v2", "is_default": True, "created_time_utc": 1, "updated_time_utc": 2}
+        bodies = {
+            "/api/space/space/search": b' \n[{"distance": 0.25, "label": 7}, {"distance": 1, "label": "8"}]',
+            "/api/space/space/version/2": json.dumps(version).encode(),
+            "/api/space/space/version/3": json.dumps({**version, "id": "three"}).encode(),
+            "/api/space/space/version/4": b"",
+        }
+
+        async def handler(request):
+            return httpx.Response(200, content=bodies[request.url.path])
+
+        client = mock_client(handler)
+        results = await client.search_vector("space", {"vector": [0.1]})
+        self.assertEqual([(type(result), result.label, result.distance) for result in results], [
+            (SearchResponse, 7, 0.25), (SearchResponse, 8, 1.0)
+        ])
+
+        result = await client.get_version_by_id("space", 2)
+        self.assertIsInstance(result, VersionResponse)
+        self.assertEqual((result.id, result.name, result.description, result.tag), (2, "v2", None, None))
+        self.assertIsNone(await client.get_version_by_id("space", 4))
+        with self.assertRaises(pydantic.ValidationError):
+            await client.get_version_by_id("space", 3)
+        await client.close()
+
+    async def test_raw_json_without_a_model(self):
+        async def handler(request):
+            return httpx.Response(200, json={"result": "Success", "id": 3})
+
+        client = mock_client(handler)
+        self.assertEqual(await client.make_request("GET", f"{client.base_url}/space/space"), {"result": "Success", "id": 3})
+        await client.close()
+
+
+
+class FederatedSearchTest(unittest.IsolatedAsyncioTestCase):
+    async def test_partial_lists_are_merged_best_first(self):
+        requests = []
+        results = {
+            "/api/space/a/search": [(0.1, 1), (0.4, 2), (0.9, 3)],
+            "/api/space/b/version/2/search": [(0.2, 11), (0.3, 12)],
+            # A similarity space: higher scores are better.
+            "/api/space/c/search": [(0.95, 21), (0.7, 22)],
+        }
+
+        async def handler(request):
+            requests.append((request.url.path, json_body(request)["top_k"]))
+            return httpx.Response(200, json=[
+                {"distance": distance, "label": label} for distance, label in results[request.url.path]
+            ])
+
+        client = mock_client(handler)
+        response = await client.search_federated(
+            ["a", ("b", 2), SearchTarget(space_name="c", higher_is_better=True)], {"vector": [0.1], "top_k": 10}, top_k=4
+        )
+        await client.close()
+
+        self.assertTrue(response.complete)
+        self.assertEqual(sorted(requests), [(path, 4) for path in sorted(results)])
+        self.assertEqual(
+            [(result.space_name, result.version_id, result.label) for result in response.results],
+            [("c", None, 21), ("c", None, 22), ("a", None, 1), ("b", 2, 11)]
+        )
+
+    async def test_slow_and_failing_targets_are_reported(self):
+        async def handler(request):
+            space_name = request.url.path.split("/")[3]
+            if space_name == "slow":
+                await asyncio.sleep(1)
+            if space_name == "broken":
+                return httpx.Response(500)
+            return httpx.Response(200, json=[{"distance": 0.5, "label": 1}])
+
+        client = mock_client(handler)
+        started = time.monotonic()
+        response = await client.search_federated(["fast", "slow", "broken"], {"vector": [0.1], "top_k": 5}, deadline=0.1)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertFalse(response.complete)
+        self.assertEqual([result.space_name for result in response.results], ["fast"])
+        self.assertEqual([target.space_name for target in response.timed_out], ["slow"])
+        self.assertEqual([error.target.space_name for error in response.failed], ["broken"])
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            await client.search_federated(["broken"], {"vector": [0.1]})
+        with self.assertRaises(ValueError):
+            await client.search_federated([], {"vector": [0.1]})
+        await client.close()
+
+
+
+class HybridSearchTest(unittest.IsolatedAsyncioTestCase):
+    def client(self, dense):
+        async def handler(request):
+            if request.url.path.endswith("/rerank"):
+                return httpx.Response(200, json=[
+                    {"vectorUniqueId": 4, "distance": 0.8, "bm25Score": 1.0},
+                    {"vectorUniqueId": 2, "distance": 0.3, "bm25Score": 3.0},
+                ])
+            return httpx.Response(200, json=[{"distance": distance, "label": label} for label, distance in dense])
+
+        return mock_client(handler)
+
+    async def test_l2_distances_rank_lowest_first(self):
+        client = self.client([(1, 0.2), (2, 1.5), (3, 0.9)])
+        results = await client.hybrid_search("space", [0.1], ["term"], top_k=4, dense_weight=0.5)
+        weighted = await client.hybrid_search("space", [0.1], ["term"], top_k=4, method="weighted", dense_weight=0.9)
+        await client.close()
+
+        # Dense ranks 1, 3, 2; BM25 ranks 2, 4.
+        self.assertEqual([result.id for result in results], [2, 1, 3, 4])
+        self.assertEqual([(result.distance, result.bm25Score) for result in results[:2]], [(1.5, 3.0), (0.2, None)])
+        self.assertEqual(results[3].distance, 0.8)
+        self.assertEqual([result.id for result in weighted], [1, 3, 2, 4])
+
+    async def test_cosine_similarities_rank_highest_first(self):
+        client = self.client([(1, 0.2), (2, 0.95), (3, 0.9)])
+        results = await client.hybrid_search("space", [0.1], ["term"], top_k=4, higher_is_better=True)
+        weighted = await client.hybrid_search(
+            "space", [0.1], ["term"], top_k=4, method="weighted", dense_weight=0.9, higher_is_better=True
+        )
+        await client.close()
+
+        # Dense ranks 2, 3, 1; BM25 ranks 2, 4.
+        self.assertEqual([result.id for result in results], [2, 3, 4, 1])
+        self.assertEqual([result.id for result in weighted], [2, 3, 1, 4])
+        self.assertAlmostEqual(weighted[0].score, 1.0)
+
+
+
+class SearchMMRTest(unittest.IsolatedAsyncioTestCase):
+    def client(self, labels, total_count=1000, **config):
+        self.page_requests = []
+        vectors = vectors_handler(total_count, requests=self.page_requests)
+
+        async def handler(request):
+            path = request.url.path
+            if path.endswith("/search"):
+                return httpx.Response(200, json=[{"distance": 0.1 * rank, "label": label} for rank, label in enumerate(labels)])
+            if path.endswith("/vectors"):
+                return await vectors(request)
+            return httpx.Response(200, json={
+                "id": 1, "name": "v1", "is_default": True, "created_time_utc": 0, "updated_time_utc": 0
+            })
+
+        return mock_client(handler, **config)
+
+    async def test_scan_stops_at_the_last_candidate_and_caches_only_candidates(self):
+        client = self.client([250, 5, 120])
+        results = await client.search_mmr("space", np.full(4, 120.0), top_k=2, fetch_k=3, metric="l2", page_size=100)
+        self.assertEqual([result.label for result in results], [120, 250])
+        self.assertEqual(results[0].similarity, 0.0)
+        # Pages 0-200 hold every candidate; the page prefetched after them is abandoned.
+        self.assertEqual(self.page_requests[:3], [0, 100, 200])
+        self.assertLessEqual(len(self.page_requests), 5)
+        self.assertEqual(len(client.vector_cache), 3)
+
+        self.page_requests.clear()
+        again = await client.search_mmr("space", np.full(4, 120.0), top_k=2, fetch_k=3, metric="l2", page_size=100)
+        await client.close()
+        self.assertEqual(self.page_requests, [])
+        self.assertEqual([result.label for result in again], [120, 250])
+
+    async def test_scan_beyond_max_scan_raises(self):
+        client = self.client([5, 900], vector_cache=False)
+        with self.assertRaises(VectorScanLimitError):
+            await client.search_mmr("space", np.ones(4), top_k=1, fetch_k=2, page_size=100, max_scan=250)
+        await client.close()
+        # Only the pages covering the first 250 vectors are requested.
+        self.assertEqual(sorted(self.page_requests), [0, 100, 200])
+
+    async def test_candidates_missing_from_a_small_version_are_dropped(self):
+        client = self.client([5, 900], total_count=300)
+        results = await client.search_mmr("space", np.ones(4), top_k=2, fetch_k=2, page_size=100, max_scan=None)
+        await client.close()
+        self.assertEqual([result.label for result in results], [5])
+        self.assertEqual(sorted(self.page_requests), [0, 100, 200])
+
+    async def test_fetch_vectors_skips_the_scan(self):
+        client = self.client([3, 7, 9])
+        fetched = []
+
+        async def fetch_vectors(ids):
+            fetched.append(ids.tolist())
+            return np.stack([np.full(4, float(vector_id)) for vector_id in ids])
+
+        results = await client.search_mmr("space", np.full(4, 8.0), top_k=3, metric="l2", fetch_vectors=fetch_vectors)
+        await client.close()
+        self.assertEqual(fetched, [[3, 7, 9]])
+        self.assertEqual(self.page_requests, [])
+        self.assertEqual([result.label for result in results][:1], [7])
+
+
+if __name__ == "__main__":
+    unittest.main()
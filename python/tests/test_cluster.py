@@ -0,0 +1,130 @@
+import random
+import unittest
+from unittest import mock
+
+from asimplevectors.cluster import ClusterNode, ClusterTopology, ReadBalancer
+from asimplevectors.models import ClusterMetricsResponse
+
+
+def cluster_metrics(members, leader=None) -> ClusterMetricsResponse:
+    """
+    Metrics as reported by /cluster/metrics for `members` ({node_id: api_addr}).
+    """
+    return ClusterMetricsResponse.from_response({"Ok": {
+        "id": 1,
+        "current_term": 3,
+        "state": "Leader",
+        "current_leader": leader,
+        "membership_config": {"membership": {"nodes": {
+            str(node_id): {"api_addr": address, "rpc_addr": address} for node_id, address in members.items()
+        }}}
+    }})
+
+
+class ClusterTopologyTest(unittest.TestCase):
+    def test_update_reads_members_and_leader(self):
+        topology = ClusterTopology(["node1:21001", "seed:21001"], "http")
+        seed_node = topology.nodes["node1:21001"]
+        self.assertTrue(topology.is_stale())
+
+        topology.update(cluster_metrics({1: "node1:21001", 2: "node2:21001", 3: "node3:21001"}, leader=2))
+        self.assertEqual(sorted(topology.nodes), ["node1:21001", "node2:21001", "node3:21001"])
+        # Known nodes keep their object, and with it their statistics and session.
+        self.assertIs(topology.nodes["node1:21001"], seed_node)
+        self.assertEqual(seed_node.node_id, 1)
+        self.assertEqual(topology.leader.address, "node2:21001")
+        self.assertEqual(topology.leader.base_url, "http://node2:21001/api")
+        self.assertFalse(topology.is_stale())
+
+        # The leader is asked first, seeds that are not members last.
+        self.assertEqual(
+            [node.address for node in topology.candidates()],
+            ["node2:21001", "node1:21001", "node3:21001", "seed:21001"]
+        )
+        self.assertEqual(len(topology.all_nodes()), 4)
+
+    def test_members_without_address_and_unknown_leader(self):
+        topology = ClusterTopology(["node1:21001"], "http")
+        metrics = cluster_metrics({1: "node1:21001"}, leader=7)
+        metrics.membership_config.membership["nodes"]["2"] = {}
+        topology.update(metrics)
+        self.assertEqual(list(topology.nodes), ["node1:21001"])
+        self.assertIsNone(topology.leader)
+
+    def test_empty_membership_keeps_known_nodes(self):
+        topology = ClusterTopology(["node1:21001", "node2:21001"], "http")
+        topology.update(cluster_metrics({}))
+        self.assertEqual(sorted(topology.nodes), ["node1:21001", "node2:21001"])
+        topology.mark_stale()
+        self.assertTrue(topology.is_stale())
+
+    def test_requires_seeds(self):
+        with self.assertRaises(ValueError):
+            ClusterTopology([], "http")
+
+
+class ReadBalancerTest(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        self.nodes = [ClusterNode(f"node{i}:21001", "http") for i in range(3)]
+
+    def test_power_of_two_choices_prefers_lower_load(self):
+        balancer = ReadBalancer()
+        fast, slow, busy = self.nodes
+        fast.ewma_latency, slow.ewma_latency, busy.ewma_latency = 0.01, 0.03, 0.01
+        busy.outstanding = 5
+
+        picks = [balancer.pick(self.nodes) for _ in range(300)]
+        # Every pair includes a better node than `busy` (score 0.06), and `fast` wins both of its pairs.
+        self.assertNotIn(busy, picks)
+        self.assertGreater(picks.count(fast), picks.count(slow))
+        self.assertAlmostEqual(picks.count(fast) / len(picks), 2 / 3, delta=0.1)
+
+    def test_nodes_without_samples_are_probed_first(self):
+        balancer = ReadBalancer()
+        self.nodes[0].ewma_latency = 0.01
+        self.nodes[1].ewma_latency = 0.01
+        picks = {balancer.pick(self.nodes).address for _ in range(100)}
+        self.assertIn("node2:21001", picks)
+        self.assertIs(balancer.pick(self.nodes[:2] + [self.nodes[2]], exclude=self.nodes[:2]), self.nodes[2])
+        self.assertIsNone(balancer.pick(self.nodes, exclude=self.nodes))
+
+    def test_ewma_update(self):
+        balancer = ReadBalancer(ewma_alpha=0.5, slow_factor=100)
+        node = self.nodes[0]
+        balancer.on_success(node, 0.1, self.nodes)
+        self.assertAlmostEqual(node.ewma_latency, 0.1)
+        balancer.on_success(node, 0.3, self.nodes)
+        self.assertAlmostEqual(node.ewma_latency, 0.2)
+
+    def test_failures_eject_a_node(self):
+        balancer = ReadBalancer(failure_threshold=2, ejection_time=10)
+        node = self.nodes[0]
+        with mock.patch("asimplevectors.cluster.time.monotonic", return_value=100.0):
+            balancer.on_failure(node)
+            self.assertTrue(node.is_available())
+            balancer.on_failure(node)
+            self.assertFalse(node.is_available())
+            picks = {balancer.pick(self.nodes) for _ in range(50)}
+        self.assertNotIn(node, picks)
+        self.assertTrue(node.is_available(now=110.0))
+
+    def test_slow_node_is_ejected(self):
+        balancer = ReadBalancer(slow_factor=4, slow_min_delta=0.05)
+        fast, slow = self.nodes[:2]
+        balancer.on_success(fast, 0.01, self.nodes)
+        balancer.on_success(slow, 0.04, self.nodes)
+        self.assertTrue(slow.is_available())
+        balancer.on_success(slow, 1.0, self.nodes)
+        self.assertFalse(slow.is_available())
+        self.assertIsNone(slow.ewma_latency)
+
+    def test_all_ejected_uses_the_first_to_return(self):
+        balancer = ReadBalancer()
+        for index, node in enumerate(self.nodes):
+            node.ejected_until = float("inf") if index != 1 else 1e18
+        self.assertIs(balancer.pick(self.nodes), self.nodes[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+
+from asimplevectors.diversity import maximal_marginal_relevance, similarity_matrix
+
+
+class SimilarityMatrixTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.queries = rng.normal(size=(3, 8)).astype(np.float32)
+        self.vectors = rng.normal(size=(5, 8)).astype(np.float32)
+
+    def test_metrics_match_direct_computation(self):
+        expected = {
+            "cosine": [[q @ v / np.linalg.norm(q) / np.linalg.norm(v) for v in self.vectors] for q in self.queries],
+            "ip": [[q @ v for v in self.vectors] for q in self.queries],
+            "l2": [[-np.linalg.norm(q - v) for v in self.vectors] for q in self.queries],
+        }
+        for metric, values in expected.items():
+            result = similarity_matrix(self.queries, self.vectors, metric)
+            self.assertEqual(result.shape, (3, 5))
+            np.testing.assert_allclose(result, values, rtol=1e-4, atol=1e-4, err_msg=metric)
+
+    def test_identical_vectors(self):
+        self.assertAlmostEqual(float(similarity_matrix(self.vectors, self.vectors, "cosine")[2, 2]), 1.0, places=5)
+        self.assertEqual(float(similarity_matrix(self.vectors, self.vectors, "l2")[2, 2]), 0.0)
+        zero = np.zeros((1, 8), dtype=np.float32)
+        self.assertEqual(float(similarity_matrix(zero, self.vectors, "cosine")[0, 0]), 0.0)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            similarity_matrix(self.queries, self.vectors, "hamming")
+        with self.assertRaises(ValueError):
+            similarity_matrix(self.queries, self.vectors[:, :4])
+
+
+class MaximalMarginalRelevanceTest(unittest.TestCase):
+    def setUp(self):
+        # Candidates 0 and 1 are near duplicates; 2 is less relevant but different.
+        self.relevance = np.array([0.9, 0.89, 0.6, 0.1])
+        self.similarity = np.array([
+            [1.0, 0.99, 0.1, 0.0],
+            [0.99, 1.0, 0.1, 0.0],
+            [0.1, 0.1, 1.0, 0.0],
+            [0.0, 0.0, 0.0, 1.0],
+        ])
+
+    def test_relevance_only(self):
+        selected, scores = maximal_marginal_relevance(self.relevance, self.similarity, 3, lambda_mult=1.0)
+        self.assertEqual(selected.tolist(), [0, 1, 2])
+        np.testing.assert_allclose(scores, [0.9, 0.89, 0.6])
+
+    def test_near_duplicates_are_skipped(self):
+        selected, scores = maximal_marginal_relevance(self.relevance, self.similarity, 3, lambda_mult=0.5)
+        self.assertEqual(selected.tolist(), [0, 2, 3])
+        np.testing.assert_allclose(scores, [0.45, 0.5 * 0.6 - 0.5 * 0.1, 0.05])
+
+    def test_k_larger_than_candidates(self):
+        selected, _ = maximal_marginal_relevance(self.relevance, self.similarity, 10)
+        self.assertEqual(sorted(selected.tolist()), [0, 1, 2, 3])
+        selected, scores = maximal_marginal_relevance(np.array([]), np.empty((0, 0)), 3)
+        self.assertEqual((len(selected), len(scores)), (0, 0))
+
+    def test_invalid_lambda(self):
+        with self.assertRaises(ValueError):
+            maximal_marginal_relevance(self.relevance, self.similarity, 2, lambda_mult=1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
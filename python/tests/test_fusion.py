@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+
+from asimplevectors.fusion import lookup, min_max_normalize, reciprocal_rank_fusion, weighted_score_fusion
+
+
+def ids(*values):
+    return np.array(values, dtype=np.int64)
+
+
+class ReciprocalRankFusionTest(unittest.TestCase):
+    def test_scores_sum_over_rankings(self):
+        fused_ids, scores = reciprocal_rank_fusion((ids(1, 2, 3), ids(3, 1)), (0.5, 0.5), k=60)
+        self.assertEqual(fused_ids.tolist(), [1, 3, 2])
+        np.testing.assert_allclose(scores, [0.5 / 61 + 0.5 / 62, 0.5 / 63 + 0.5 / 61, 0.5 / 62])
+
+    def test_weights_decide_between_rankings(self):
+        self.assertEqual(reciprocal_rank_fusion((ids(1, 2), ids(2, 1)), (0.8, 0.2))[0].tolist(), [1, 2])
+        self.assertEqual(reciprocal_rank_fusion((ids(1, 2), ids(2, 1)), (0.2, 0.8))[0].tolist(), [2, 1])
+
+    def test_ties_keep_id_order(self):
+        fused_ids, scores = reciprocal_rank_fusion((ids(5, 4), ids(4, 5)), (0.5, 0.5))
+        self.assertEqual(fused_ids.tolist(), [4, 5])
+        self.assertEqual(scores[0], scores[1])
+
+    def test_empty_and_invalid(self):
+        fused_ids, scores = reciprocal_rank_fusion((ids(), ids()), (0.5, 0.5))
+        self.assertEqual((len(fused_ids), len(scores)), (0, 0))
+        with self.assertRaises(ValueError):
+            reciprocal_rank_fusion((ids(1),), (0.5, 0.5))
+
+
+class WeightedScoreFusionTest(unittest.TestCase):
+    def test_normalized_scores_are_weighted(self):
+        fused_ids, scores = weighted_score_fusion(
+            (ids(1, 2, 3), ids(3, 4)),
+            (np.array([-0.1, -0.5, -0.9]), np.array([12.0, 2.0])),
+            (0.5, 0.5)
+        )
+        # Dense scores normalize to 1, 0.5, 0; BM25 scores to 1, 0.
+        self.assertEqual(fused_ids.tolist(), [1, 3, 2, 4])
+        np.testing.assert_allclose(scores, [0.5, 0.5, 0.25, 0.0])
+
+    def test_constant_scores_get_full_weight(self):
+        fused_ids, scores = weighted_score_fusion((ids(1, 2), ids(2)), (np.array([3.0, 3.0]), np.array([7.0])), (0.3, 0.7))
+        self.assertEqual(fused_ids.tolist(), [2, 1])
+        np.testing.assert_allclose(scores, [1.0, 0.3])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            weighted_score_fusion((ids(1),), (np.array([1.0]), np.array([1.0])), (1.0,))
+
+
+class HelpersTest(unittest.TestCase):
+    def test_min_max_normalize(self):
+        np.testing.assert_allclose(min_max_normalize(np.array([2.0, 4.0, 3.0])), [0.0, 1.0, 0.5])
+        np.testing.assert_allclose(min_max_normalize(np.array([5.0, 5.0])), [1.0, 1.0])
+        self.assertEqual(len(min_max_normalize(np.array([]))), 0)
+
+    def test_lookup(self):
+        values = lookup(ids(30, 10, 20), np.array([3.0, 1.0, 2.0]), ids(20, 40, 10, 5))
+        np.testing.assert_array_equal(values, [2.0, np.nan, 1.0, np.nan])
+        self.assertTrue(np.isnan(lookup(ids(), np.array([]), ids(1))).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+
+from asimplevectors.hedging import HedgePolicy, LatencyTracker
+
+
+class LatencyTrackerTest(unittest.TestCase):
+    def test_window_and_percentile(self):
+        tracker = LatencyTracker(window=100)
+        self.assertIsNone(tracker.percentile("search", 95))
+        for latency in np.arange(1, 201) / 1000:
+            tracker.record("search", float(latency))
+        # Only the last 100 samples (0.101 .. 0.200) are kept.
+        self.assertEqual(tracker.count("search"), 100)
+        self.assertEqual(tracker.count("rerank"), 0)
+        self.assertAlmostEqual(tracker.percentile("search", 50), 0.1505)
+        self.assertAlmostEqual(tracker.percentile("search", 100), 0.2)
+
+    def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            LatencyTracker(window=0)
+
+
+class HedgePolicyTest(unittest.TestCase):
+    def test_max_delay_until_enough_samples(self):
+        policy = HedgePolicy(min_samples=10, max_delay=0.5)
+        for _ in range(9):
+            policy.latencies.record("search", 0.01)
+        self.assertEqual(policy.delay("search"), 0.5)
+        policy.latencies.record("search", 0.01)
+        self.assertAlmostEqual(policy.delay("search"), 0.01)
+
+    def test_delay_is_clamped(self):
+        policy = HedgePolicy(percentile=90, min_delay=0.005, max_delay=0.2, min_samples=1)
+        policy.latencies.record("fast", 0.0001)
+        policy.latencies.record("slow", 3.0)
+        self.assertEqual(policy.delay("fast"), 0.005)
+        self.assertEqual(policy.delay("slow"), 0.2)
+
+    def test_percentile_of_recent_latencies(self):
+        policy = HedgePolicy(percentile=90, min_samples=10)
+        for latency in np.linspace(0.01, 0.1, 10):
+            policy.latencies.record("search", float(latency))
+        self.assertAlmostEqual(policy.delay("search"), 0.091)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            HedgePolicy(percentile=100)
+        with self.assertRaises(ValueError):
+            HedgePolicy(min_delay=0.5, max_delay=0.1)
+        with self.assertRaises(ValueError):
+            HedgePolicy(max_hedges=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import random
+import tempfile
+import time
+import unittest
+
+from asimplevectors.ingest import BufferedVectorWriter, FileCheckpointStore, IngestionJob
+
+
+class RecordingClient:
+    """
+    Stands in for ASimpleVectorsClient and records every upsert batch with the time it was sent.
+    """
+    def __init__(self):
+        self.batches = []
+
+    async def _post_vectors(self, space_name, vectors):
+        self.batches.append((time.monotonic(), space_name, [vector["id"] for vector in vectors]))
+
+
+def vector(vector_id):
+    return {"id": vector_id, "data": [0.0, 1.0]}
+
+
+class BufferedVectorWriterTest(unittest.IsolatedAsyncioTestCase):
+    async def test_flushes_by_size(self):
+        client = RecordingClient()
+        async with BufferedVectorWriter(client, batch_size=2, flush_interval=None) as writer:
+            for vector_id in range(5):
+                await writer.add("space", vector(vector_id))
+            await asyncio.sleep(0)
+            self.assertEqual([ids for _, _, ids in client.batches], [[0, 1], [2, 3]])
+            self.assertEqual(writer.buffered, 1)
+        self.assertEqual([ids for _, _, ids in client.batches], [[0, 1], [2, 3], [4]])
+        self.assertEqual((writer.vectors_written, writer.batches_written), (5, 3))
+
+    async def test_vectors_wait_at_most_one_flush_interval(self):
+        interval = 0.1
+        client = RecordingClient()
+        async with BufferedVectorWriter(client, flush_interval=interval) as writer:
+            first_added = time.monotonic()
+            await writer.add("space1", vector(1))
+            await asyncio.sleep(interval / 2)
+            second_added = time.monotonic()
+            await writer.add("space2", vector(2))
+            await asyncio.sleep(interval * 1.5)
+            # The timer has gone idle; a vector added now must not wait for a stale wakeup.
+            third_added = time.monotonic()
+            await writer.add("space1", vector(3))
+            await asyncio.sleep(interval * 1.5)
+
+        self.assertEqual([ids for _, _, ids in client.batches], [[1], [2], [3]])
+        for (sent, _, _), added in zip(client.batches, (first_added, second_added, third_added)):
+            self.assertGreaterEqual(sent - added, interval * 0.9)
+            self.assertLess(sent - added, interval * 1.4)
+
+
+
+class IngestionJobRangesTest(unittest.TestCase):
+    def job(self):
+        return IngestionJob(None, "space", "job", FileCheckpointStore("unused"))
+
+    def test_ranges_merge_in_any_completion_order(self):
+        for seed in range(20):
+            job = self.job()
+            starts = list(range(0, 100, 10))
+            random.Random(seed).shuffle(starts)
+            for start in starts[:-1]:
+                job._add_committed(start, start + 10)
+            missing = starts[-1]
+            expected = [[0, missing], [missing + 10, 100]]
+            self.assertEqual(job.committed, [committed for committed in expected if committed[0] < committed[1]])
+            job._add_committed(missing, missing + 10)
+            self.assertEqual(job.committed, [[0, 100]])
+            self.assertEqual(job.committed_count, 100)
+
+    def test_range_spanning_several_ranges(self):
+        job = self.job()
+        for start, end in ([10, 20], [30, 40], [50, 60], [80, 90]):
+            job._add_committed(start, end)
+        job._add_committed(15, 55)
+        self.assertEqual(job.committed, [[10, 60], [80, 90]])
+        job._add_committed(60, 80)
+        self.assertEqual(job.committed, [[10, 90]])
+
+    def test_is_committed(self):
+        job = self.job()
+        job._add_committed(0, 10)
+        job._add_committed(20, 30)
+        self.assertTrue(job.is_committed(0, 10))
+        self.assertTrue(job.is_committed(22, 25))
+        self.assertFalse(job.is_committed(5, 15))
+        self.assertFalse(job.is_committed(10, 20))
+        self.assertFalse(job.is_committed(30, 31))
+
+
+class FileCheckpointStoreTest(unittest.IsolatedAsyncioTestCase):
+    async def test_save_load_clear(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = FileCheckpointStore(os.path.join(directory, "checkpoints"))
+            self.assertIsNone(await store.load("job"))
+            await store.save("job", {"committed": [[0, 10]]})
+            await store.save("job", {"committed": [[0, 20]]})
+            self.assertEqual(await store.load("job"), {"committed": [[0, 20]]})
+            self.assertEqual(os.listdir(store.directory), ["job.json"])
+            await store.clear("job")
+            await store.clear("job")
+            self.assertIsNone(await store.load("job"))
+
+
+if __name__ == "__main__":
+    unittest.main()
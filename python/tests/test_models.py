@@ -0,0 +1,35 @@
+import unittest
+
+import numpy as np
+
+from asimplevectors.models import GetVectorsResponse, VectorPage
+
+
+def vectors_json(count, dimension=3):
+    return {
+        "vectors": [
+            {"id": i + 10, "data": {"data": [float(i)] * dimension}, "metadata": {"n": i}} for i in range(count)
+        ],
+        "total_count": 100
+    }
+
+
+class VectorPageTest(unittest.TestCase):
+    def test_from_response_matches_the_model_path(self):
+        response_json = vectors_json(4)
+        page = VectorPage.from_response(response_json, start=20)
+        rows = GetVectorsResponse.from_response(vectors_json(4)).vectors
+
+        self.assertEqual((page.start, page.total_count), (20, 100))
+        self.assertEqual((page.ids.dtype, page.vectors.dtype, page.vectors.shape), (np.int64, np.float32, (4, 3)))
+        self.assertEqual(page.ids.tolist(), [row.id for row in rows])
+        np.testing.assert_array_equal(page.vectors, np.array([row.data for row in rows], dtype=np.float32))
+        self.assertEqual(page.metadata, [row.metadata for row in rows])
+
+    def test_empty_page(self):
+        page = VectorPage.from_response({"vectors": [], "total_count": 0})
+        self.assertEqual((page.ids.shape, page.vectors.shape, page.metadata), ((0,), (0, 0), []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from email.utils import formatdate
+from unittest import mock
+
+import httpx
+
+from asimplevectors.circuit import CircuitOpenError
+from asimplevectors.retry import RetryBudget, RetryPolicy, _parse_retry_after
+
+SEARCH_URL = "http://localhost:21001/api/space/docs/search"
+CREATE_SPACE_URL = "http://localhost:21001/api/space"
+
+
+def status_error(status: int, headers=None) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", SEARCH_URL)
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(f"status {status}", request=request, response=response)
+
+
+class RetryBudgetTest(unittest.TestCase):
+    def test_withdraw_spends_tokens_until_exhausted(self):
+        budget = RetryBudget(ratio=0.5, initial_tokens=2, max_tokens=3)
+        self.assertTrue(budget.withdraw())
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        self.assertEqual(budget.exhausted, 1)
+        budget.deposit()
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+
+    def test_tokens_are_capped(self):
+        budget = RetryBudget(ratio=1, initial_tokens=50, max_tokens=3)
+        self.assertEqual(budget.tokens, 3)
+        for _ in range(10):
+            budget.deposit()
+        self.assertEqual(budget.tokens, 3)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            RetryBudget(ratio=-1)
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_idempotent_requests(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.is_idempotent("get", SEARCH_URL))
+        self.assertTrue(policy.is_idempotent("DELETE", "http://h:1/api/space/docs"))
+        self.assertTrue(policy.is_idempotent("POST", SEARCH_URL))
+        self.assertTrue(policy.is_idempotent("POST", "http://h:1/api/space/docs/version/3/rerank"))
+        self.assertTrue(policy.is_idempotent("POST", "http://h:1/api/space/docs/vector"))
+        self.assertTrue(policy.is_idempotent("POST", "http://h:1/api/space/docs/key/k1"))
+        self.assertFalse(policy.is_idempotent("POST", CREATE_SPACE_URL))
+        self.assertFalse(policy.is_idempotent("POST", "http://h:1/api/space/docs/version"))
+        self.assertFalse(policy.is_idempotent("POST", "http://h:1/api/snapshot"))
+
+    def test_should_retry(self):
+        policy = RetryPolicy(max_attempts=3)
+        self.assertTrue(policy.should_retry(status_error(503), "GET", SEARCH_URL, 1))
+        self.assertTrue(policy.should_retry(status_error(429), "POST", SEARCH_URL, 2))
+        self.assertFalse(policy.should_retry(status_error(503), "GET", SEARCH_URL, 3))
+        self.assertFalse(policy.should_retry(status_error(500), "GET", SEARCH_URL, 1))
+        self.assertFalse(policy.should_retry(status_error(404), "GET", SEARCH_URL, 1))
+        self.assertTrue(policy.should_retry(httpx.ReadTimeout("slow"), "GET", SEARCH_URL, 1))
+        self.assertFalse(policy.should_retry(CircuitOpenError("open"), "GET", SEARCH_URL, 1))
+        self.assertEqual(policy.retries, 3)
+
+    def test_writes_are_only_retried_when_not_sent(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.should_retry(httpx.ConnectError("refused"), "POST", CREATE_SPACE_URL, 1))
+        self.assertTrue(policy.should_retry(httpx.PoolTimeout("pool"), "POST", CREATE_SPACE_URL, 1))
+        self.assertFalse(policy.should_retry(httpx.ReadTimeout("slow"), "POST", CREATE_SPACE_URL, 1))
+        self.assertFalse(policy.should_retry(status_error(503), "POST", CREATE_SPACE_URL, 1))
+
+    def test_budget_limits_retries(self):
+        policy = RetryPolicy(max_attempts=10, budget=RetryBudget(ratio=0, initial_tokens=1))
+        self.assertTrue(policy.should_retry(status_error(503), "GET", SEARCH_URL, 1))
+        self.assertFalse(policy.should_retry(status_error(503), "GET", SEARCH_URL, 2))
+        self.assertEqual(policy.budget.exhausted, 1)
+
+    def test_exponential_backoff(self):
+        policy = RetryPolicy(backoff_base=0.1, backoff_max=0.5, jitter=False)
+        self.assertEqual([policy.backoff(attempt) for attempt in range(1, 6)], [0.1, 0.2, 0.4, 0.5, 0.5])
+
+    def test_jitter_stays_below_the_backoff(self):
+        policy = RetryPolicy(backoff_base=0.1)
+        with mock.patch("asimplevectors.retry.random.uniform", side_effect=lambda low, high: high / 2) as uniform:
+            self.assertEqual(policy.backoff(3), 0.2)
+        uniform.assert_called_once_with(0, 0.4)
+
+    def test_retry_after_is_honoured_and_capped(self):
+        policy = RetryPolicy(backoff_base=0.1, jitter=False, max_retry_after=10)
+        self.assertEqual(policy.backoff(1, status_error(503, {"Retry-After": "3"})), 3.0)
+        self.assertEqual(policy.backoff(1, status_error(503, {"Retry-After": "120"})), 10.0)
+        self.assertEqual(policy.backoff(1, status_error(503, {"Retry-After": "soon"})), 0.1)
+
+    def test_parse_retry_after(self):
+        self.assertIsNone(_parse_retry_after(None))
+        self.assertEqual(_parse_retry_after("2.5"), 2.5)
+        self.assertEqual(_parse_retry_after("-1"), 0.0)
+        with mock.patch("asimplevectors.retry.time.time", return_value=1_000_000_000.0):
+            self.assertAlmostEqual(_parse_retry_after(formatdate(1_000_000_030.0, usegmt=True)), 30.0)
+        self.assertIsNone(_parse_retry_after("not a date"))
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
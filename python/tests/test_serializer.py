@@ -0,0 +1,93 @@
+import json
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from asimplevectors.serializer import JsonSerializer, OrjsonSerializer, get_serializer, orjson
+
+
+@unittest.skipIf(orjson is None, "orjson is not installed")
+class SerializerCompatibilityTest(unittest.TestCase):
+    """
+    The orjson backend must send the same documents as the standard library backend.
+    """
+    def setUp(self):
+        self.json = JsonSerializer()
+        self.orjson = OrjsonSerializer()
+
+    def assertSameJson(self, obj):
+        self.assertEqual(self.orjson.dumps(obj), self.json.dumps(obj))
+
+    def test_default_serializer_is_orjson(self):
+        self.assertIsInstance(get_serializer(None), OrjsonSerializer)
+
+    def test_non_str_keys(self):
+        self.assertSameJson({"metadata": {1: "a", 2.5: "b", True: "c"}})
+        self.assertEqual(self.orjson.dumps({1: "a"}), b'{"1":"a"}')
+
+    def test_numpy_scalars(self):
+        self.assertSameJson({"id": np.int64(7), "label": np.int32(3), "score": np.float64(0.1), "ok": np.bool_(True)})
+
+    def test_numpy_arrays(self):
+        vector = np.array([0.5, 0.25, -1.0, 3.0], dtype=np.float32)
+        matrix = np.arange(12, dtype=np.float64).reshape(3, 4)
+        self.assertSameJson({"vector": vector, "matrix": matrix, "ids": np.arange(3, dtype=np.int64)})
+        # Non-contiguous arrays go through the fallback conversion.
+        self.assertSameJson({"column": matrix[:, 1]})
+
+    def test_float32_values_decode_to_the_same_float32(self):
+        vector = np.random.default_rng(0).normal(size=64).astype(np.float32)
+        from_json = np.array(json.loads(self.json.dumps(vector)), dtype=np.float32)
+        from_orjson = np.array(json.loads(self.orjson.dumps(vector)), dtype=np.float32)
+        np.testing.assert_array_equal(from_json, vector)
+        np.testing.assert_array_equal(from_orjson, vector)
+
+    def test_nan_and_infinity_are_rejected(self):
+        for value in (float("nan"), float("inf"), np.array([0.5, np.nan], dtype=np.float32)):
+            with self.assertRaises(ValueError):
+                self.json.dumps({"vector": value})
+            with self.assertRaises(ValueError):
+                self.orjson.dumps({"vector": value})
+
+    def test_null_and_unicode(self):
+        self.assertSameJson({"metadata": None, "doc": "naïve café", "tokens": ["null", "ü"]})
+
+    def test_null_values_stay_on_the_orjson_path(self):
+        matrix = np.ones((3, 4), dtype=np.float32)
+        body = {"vectors": [
+            {"id": i, "data": row, "metadata": None, "doc": "nullable"} for i, row in enumerate(matrix)
+        ]}
+        expected = self.json.dumps(body)
+        with mock.patch.object(JsonSerializer, "dumps", side_effect=AssertionError("stdlib fallback used")):
+            self.assertEqual(self.orjson.dumps(body), expected)
+
+    def test_nested_non_finite_values_are_found(self):
+        for value in (
+            [[1.0, float("-inf")]], ({"a": (np.float32("nan"),)},), np.array([1.0, None, float("nan")], dtype=object),
+            np.array([1 + 1j, complex("nan")])
+        ):
+            with self.assertRaises(ValueError):
+                self.orjson.dumps({"value": value})
+
+    def test_large_integers_fall_back(self):
+        self.assertSameJson({"id": 2 ** 70})
+
+    def test_unserializable_objects_raise_type_error(self):
+        with self.assertRaises(TypeError):
+            self.json.dumps({"value": object()})
+        with self.assertRaises(TypeError):
+            self.orjson.dumps({"value": object()})
+
+
+class GetSerializerTest(unittest.TestCase):
+    def test_names(self):
+        self.assertIsInstance(get_serializer("json"), JsonSerializer)
+        serializer = JsonSerializer()
+        self.assertIs(get_serializer(serializer), serializer)
+        with self.assertRaises(ValueError):
+            get_serializer("yaml")
+
+
+if __name__ == "__main__":
+    unittest.main()